@@ -0,0 +1,133 @@
+class Chunk:
+    """
+    A retrieval unit made of consecutive sentences of a chapter.
+    Attributes
+    ----------
+    chapter_name: str
+        The name of the chapter the chunk belongs to
+    text: str
+        The sentences of the chunk (paragraphs are separated by a blank line)
+    token_count: int
+        The number of (whitespace separated) tokens of the text
+    page_layouts: list
+        The PageLayout of every reader page the chunk spans (in order)
+    """
+
+    def __init__(self, chapter_name, units):
+        self.chapter_name = chapter_name
+        parts = []
+        for index, unit in enumerate(units):
+            if index > 0:
+                parts.append("\n\n" if unit.starts_paragraph else " ")
+            parts.append(unit.text)
+        self.text = "".join(parts)
+        self.token_count = sum(unit.token_count for unit in units)
+        self.page_layouts = []
+        for unit in units:
+            if (
+                not self.page_layouts
+                or self.page_layouts[-1].reader_page_number
+                != unit.page_layout.reader_page_number
+            ):
+                self.page_layouts.append(unit.page_layout)
+
+    def reader_page_numbers(self):
+        return [page_layout.reader_page_number for page_layout in self.page_layouts]
+
+
+class _Unit:
+    """A sentence (or a window of an overly long sentence) to be chunked"""
+
+    def __init__(self, text, token_count, page_layout, starts_paragraph):
+        self.text = text
+        self.token_count = token_count
+        self.page_layout = page_layout
+        self.starts_paragraph = starts_paragraph
+
+
+class Chunker:
+    """
+    Breaks chapters into chunks of at most max_tokens tokens, consecutive
+    chunks sharing (up to) overlap_tokens tokens. Chunks are made of whole
+    sentences (only sentences longer than max_tokens are cut) and, when the
+    current chunk is already filled above paragraph_fill (a ratio of
+    max_tokens), a new paragraph starts a new chunk. The chunks are generated
+    one at a time in order for the memory to remain flat whatever the size of
+    the corpus.
+    """
+
+    def __init__(self, max_tokens=256, overlap_tokens=32, paragraph_fill=0.75):
+        if overlap_tokens >= max_tokens:
+            raise ValueError("The overlap must be smaller than the chunk size")
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+        self.paragraph_fill = paragraph_fill
+
+    def __units(self, paragraph):
+        sentences = [
+            (sentence.sentence, sentence.page_layout)
+            for sentence in paragraph.sentences
+        ]
+        if not sentences:
+            sentences = [(paragraph.text.strip(), paragraph.page_layout)]
+        starts_paragraph = True
+        for text, page_layout in sentences:
+            words = text.split()
+            if not words:
+                continue
+            if len(words) <= self.max_tokens:
+                yield _Unit(" ".join(words), len(words), page_layout, starts_paragraph)
+            else:
+                # Overly long sentence: fall back to overlapping token windows
+                step = self.max_tokens - self.overlap_tokens
+                for start in range(0, len(words) - self.overlap_tokens, step):
+                    window = words[start : start + self.max_tokens]
+                    yield _Unit(
+                        " ".join(window),
+                        len(window),
+                        page_layout,
+                        starts_paragraph and start == 0,
+                    )
+            starts_paragraph = False
+
+    def __overlap(self, units):
+        # The trailing whole units that fit within the overlap budget
+        overlap = []
+        tokens = 0
+        for unit in reversed(units):
+            if tokens + unit.token_count > self.overlap_tokens:
+                break
+            overlap.insert(0, unit)
+            tokens += unit.token_count
+        return overlap, tokens
+
+    def chunk_chapter(self, chapter):
+        units = []
+        tokens = 0
+        fresh = 0  # Number of units not yet part of an emitted chunk
+        for paragraph in chapter.paragraphs:
+            for unit in self.__units(paragraph):
+                full = tokens + unit.token_count > self.max_tokens
+                paragraph_break = (
+                    unit.starts_paragraph
+                    and tokens >= self.paragraph_fill * self.max_tokens
+                )
+                if units and fresh and (full or paragraph_break):
+                    yield Chunk(chapter.name, units)
+                    units, tokens = self.__overlap(units)
+                    fresh = 0
+                    if tokens + unit.token_count > self.max_tokens:
+                        units, tokens = [], 0
+                units.append(unit)
+                tokens += unit.token_count
+                fresh += 1
+        if fresh:
+            yield Chunk(chapter.name, units)
+
+    def chunks(self, chapters):
+        """
+        Generate the chunks of the chapters (e.g. document.chapters or any
+        other iterable of chapters, possibly itself a generator).
+        """
+        for chapter in chapters:
+            yield from self.chunk_chapter(chapter)
@@ -0,0 +1,185 @@
+import re
+import sys
+import time
+
+# A sentence (and possibly a paragraph) ends with a terminal punctuation mark,
+# possibly followed by closing quotes or brackets
+_TERMINAL_PUNCTUATION = re.compile(r"[.!?…][\"'”’)\]]*$")
+# Within a page text, a newline followed by four whitespaces starts a new
+# paragraph (refer to Converter.break_chapter_into_paragraphs)
+_PARAGRAPH_MARKER = re.compile(r"[ ]*\n    ")
+_FIRST_LINE_INDENTATION = re.compile(r"(?:[ \t]*\n)*([ ]*)")
+
+
+def ends_with_terminal_punctuation(text):
+    return _TERMINAL_PUNCTUATION.search(text.rstrip()) is not None
+
+
+def leading_indentation(text):
+    """The number of whitespaces indenting the first non blank line"""
+    return len(_FIRST_LINE_INDENTATION.match(text).group(1))
+
+
+class ContinuationDecision:
+    """
+    Whether the last paragraph of a page finishes on the next text page.
+    Attributes
+    ----------
+    page_number, next_page_number: int
+        The page and the next text page (illustrations are skipped)
+    continued: bool
+        Whether the last paragraph of the page finishes on the next page
+    end_offset: int
+        When continued, the offset (within the next page text) where the
+        paragraph finishes
+    confidence: float
+        High when the signals (the indentation of the next page and the
+        punctuation ending the page) agree, lower otherwise
+    """
+
+    def __init__(
+        self, page_number, next_page_number, continued, end_offset, confidence
+    ):
+        self.page_number = page_number
+        self.next_page_number = next_page_number
+        self.continued = continued
+        self.end_offset = end_offset
+        self.confidence = confidence
+
+
+class ContinuationDetector:
+    """
+    Decides, out of the extracted texts only, whether the last paragraph of a
+    page finishes on the next text page and where:
+     - a next page whose first line is indented starts a new paragraph, while
+       a next page starting without indentation (or with a lowercase letter)
+       continues the paragraph of the previous page,
+     - a page ending without terminal punctuation ends mid-sentence (this
+       only lowers the confidence when contradicting the indentation),
+     - the continued paragraph finishes where the next page starts its first
+       indented paragraph. When the text before that point does not end with
+       terminal punctuation, the paragraph is cut after its last complete
+       sentence (as found by the segmenter).
+    """
+
+    def __init__(self, segmenter, indentation=4):
+        self.segmenter = segmenter
+        self.indentation = indentation
+        self.page_count = 0
+        self.elapsed = 0.0
+
+    def detect(
+        self, page_number, page_text, next_page_number, next_page_text, indentation
+    ):
+        start = time.perf_counter()
+        ends_sentence = ends_with_terminal_punctuation(page_text)
+        starts_paragraph = (indentation or 0) >= self.indentation
+        continued = bool(page_text.strip()) and (
+            not starts_paragraph or next_page_text.lstrip()[:1].islower()
+        )
+        end_offset = self.paragraph_end(next_page_text) if continued else None
+        confidence = 0.95 if continued != ends_sentence else 0.6
+        self.page_count += 1
+        self.elapsed += time.perf_counter() - start
+        return ContinuationDecision(
+            page_number, next_page_number, continued, end_offset, confidence
+        )
+
+    def paragraph_end(self, text):
+        """The offset where the paragraph starting the text finishes"""
+        marker = _PARAGRAPH_MARKER.search(text)
+        head = text[: marker.start()] if marker else text
+        head = head.rstrip()
+        if ends_with_terminal_punctuation(head):
+            return len(head)
+        for start, end in reversed(self.segmenter.span_tokenize(head)):
+            if ends_with_terminal_punctuation(head[start:end]):
+                return end
+        return len(head)
+
+
+class ContinuationReport:
+    """
+    Compares the detected continuations with the hand annotations (the
+    paragraph_fits_on_page flags and the first_paragraph_delimiter entries of
+    Structure.py).
+    """
+
+    def __init__(self, detector):
+        self.detector = detector
+        self.compared = 0
+        self.correct_decisions = 0
+        self.continued = 0
+        self.correct_offsets = 0
+        # (decision, expected continued, expected head, detected head)
+        self.mismatches = []
+
+    def add(self, decision, next_page_text, expected_continued, expected_offset):
+        self.compared += 1
+        if decision.continued != expected_continued:
+            self.mismatches.append((decision, expected_continued, None, None))
+            return
+        self.correct_decisions += 1
+        if not expected_continued:
+            return
+        self.continued += 1
+        expected_head = (
+            None
+            if expected_offset is None
+            else next_page_text[:expected_offset].rstrip()
+        )
+        detected_head = next_page_text[: decision.end_offset].rstrip()
+        if detected_head == expected_head:
+            self.correct_offsets += 1
+        else:
+            self.mismatches.append(
+                (decision, expected_continued, expected_head, detected_head)
+            )
+
+    def print_report(self, max_length=80, stream=sys.stderr):
+        print(
+            "Detected the continuation of ",
+            self.detector.page_count,
+            " pages in ",
+            round(self.detector.elapsed * 1000, 2),
+            " ms.",
+            file=stream,
+        )
+        print(
+            "   - decisions matching the hand annotations: ",
+            self.correct_decisions,
+            " / ",
+            self.compared,
+            file=stream,
+        )
+        print(
+            "   - paragraph ends matching the hand delimiters: ",
+            self.correct_offsets,
+            " / ",
+            self.continued,
+            file=stream,
+        )
+        for decision, expected_continued, expected_head, detected_head in (
+            self.mismatches
+        ):
+            if decision.continued != expected_continued:
+                print(
+                    "   - page number ",
+                    decision.page_number,
+                    ": detected ",
+                    "continued" if decision.continued else "not continued",
+                    " (confidence ",
+                    decision.confidence,
+                    ")",
+                    file=stream,
+                )
+            else:
+                print(
+                    "   - page number ",
+                    decision.next_page_number,
+                    ": paragraph end expected after ",
+                    repr((expected_head or "")[-max_length:]),
+                    " but detected after ",
+                    repr(detected_head[-max_length:]),
+                    file=stream,
+                )
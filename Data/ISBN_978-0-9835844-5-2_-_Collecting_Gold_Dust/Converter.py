@@ -1,35 +1,40 @@
-import sys
 import re
 import os
-import roman
-from pypdf import PdfReader
-from Model import Chapter, Paragraph
-import nltk
+import time
+import importlib
+from Model import Chapter, Paragraph, Sentence, PageLayout
+from Extraction import (
+    ThreadedExtractor,
+    WatchdogExtractor,
+    extract_page_text_with_mode,
+)
+from Delimiters import MultiPatternMatcher, DelimiterLocation
+import Structure
+from Segmentation import PunktSegmenter
+from Diagnostics import Diagnostics
+from HeaderInference import HeaderInferrer
+import Provenance
+from Continuations import (
+    ContinuationDetector,
+    ContinuationReport,
+    leading_indentation,
+)
 
-# Refer to
-# https://stackoverflow.com/questions/78862426/unable-to-use-nltk-functions
-nltk.download("punkt_tab")
 
+def _lower_roman(number):
+    # roman (as pypdf) is only imported when actually needed, for short lived
+    # invocations not to pay for it
+    import roman
 
-class PageLayout:
-    """
-    reader_page_number: str
-        The page number as it appears to a human reader on the printed (or
-        rendered by a pdf viewer) page. Note that, some pages might have roman
-        numbering, some pages an integerand some pages may have no numbering
-        at all (e.g. the cover or back-cover or some illustrative pages).
-    """
-
-    def __init__(self, reader_page_number):
-        self.reader_page_number = reader_page_number
-        self._reference_text = None
+    return roman.toRoman(number).lower()
 
-    @property
-    def reference_text(self):
-        return self._reference_text
 
-    def set_reference_text(self, value):
-        self._reference_text = value
+# The original pdf document of the book
+PDF_FILENAME = os.path.join(
+    os.path.dirname(__file__),
+    "original_data",
+    "2019_-_Sayadaw-U-Tejaniya-Collecting-Gold-Dust-Web-Book-1.pdf",
+)
 
 
 class ExtractedPage:
@@ -41,6 +46,32 @@ class ExtractedPage:
         The index of the page as it appears extracted by pydf::PdfReader()
     original_pdf_page: str
         the text as original extracted by the constructor caller
+    original_text: str
+        the layout mode text of the original pdf page. Unless it was provided
+        by the caller (e.g. out of a WatchdogExtractor) it is extracted on
+        first access. A text handed-off through shared memory is decoded on
+        first access too (refer to set_extraction_result)
+    extraction_mode: str
+        the mode of that extraction: "layout", or "indented" for the faster
+        plain mode extraction that restores the indentation out of the text
+        positions (refer to Extraction.extract_indented_text). Once extracted,
+        the mode that was finally used: "plain" when the indentation (that
+        starts the paragraphs) could not be restored
+    header_band_height: float
+        when not None, the height (in pdf units, from the top of the page) of
+        the band whose text is dropped (as the page header) while extracting
+        the original text
+    extraction_failed: bool
+        whether the extraction of the original text was given up
+    extraction_skipped: bool
+        whether this page is a (text less) placeholder for a page whose
+        content is not needed downstream
+    leading_indentation: int
+        the number of whitespaces indenting the first line of the page once
+        its header removed (an indented first line starts a new paragraph)
+    offset_map: Provenance.OffsetMap
+        when provenance is tracked, maps the offsets of text to the original
+        texts of the pages it comes from
     """
 
     def __init__(self, page_number, layout, original_page):
@@ -48,10 +79,82 @@ class ExtractedPage:
         self.page_layout = layout
         self.original_pdf_page = original_page
         self.text = None
+        self._original_text = None
+        # The extraction result whose (shared memory) text is yet to decode
+        self._extraction_result = None
+        self.extraction_failed = False
+        self.extraction_skipped = False
+        self.removed_header = None
+        self.header_band_height = None
+        self.extraction_mode = "layout"
+        # When the last paragraph of the page finishes on a later page, that
+        # later (extracted) page together with the length of the text that
+        # was taken from it (refer to reconstitute_pages_ending_sentence)
+        self.continuation_page = None
+        self.continuation_length = 0
+        self.leading_indentation = None
+        self.offset_map = None
+
+    @property
+    def original_text(self):
+        if self._original_text is None and self._extraction_result is not None:
+            extraction_result = self._extraction_result
+            self._extraction_result = None
+            self.set_original_text(
+                extraction_result.text,
+                extraction_result.removed_header,
+                extraction_result.extraction_mode,
+            )
+        if self._original_text is None:
+            self.set_original_text(
+                *extract_page_text_with_mode(
+                    self.original_pdf_page,
+                    self.extraction_mode,
+                    self.header_band_height,
+                )
+            )
+        return self._original_text
+
+    def set_original_text(self, value, removed_header=None, extraction_mode=None):
+        """
+        When removed_header is not None, the provided text is already cleaned
+        up of its header (that was dropped by geometry during extraction).
+        When provided, extraction_mode is the mode that produced the text.
+        """
+        self._original_text = value
+        if removed_header is not None:
+            self.set_removed_header(removed_header)
+        if extraction_mode is not None:
+            self.extraction_mode = extraction_mode
+
+    def set_extraction_result(self, extraction_result):
+        """
+        Keep the (successful) extraction result for its text to be decoded on
+        first access, e.g. out of the shared memory it was handed-off through.
+        """
+        self._extraction_result = extraction_result
+
+    def header_removed_by_geometry(self):
+        # Must be called after the original text was extracted
+        return self.removed_header is not None
+
+    def set_extraction_failed(self):
+        self._original_text = ""
+        self.extraction_failed = True
+
+    def set_extraction_skipped(self):
+        self._original_text = ""
+        self.extraction_skipped = True
+        self.removed_header = ""
+        self.text = ""
 
     def set_text(self, text_in):
         self.text = text_in
 
+    def set_continuation(self, continuation_page, continuation_length):
+        self.continuation_page = continuation_page
+        self.continuation_length = continuation_length
+
     def set_removed_header(self, removed_header):
         self.removed_header = removed_header
 
@@ -63,7 +166,7 @@ class ExtractedPage:
             + repr(self.page_layout.reader_page_number)
             + "\n"
             + "Original Text: "
-            + repr(self.original_pdf_page.extract_text(extraction_mode="layout"))
+            + repr(self.original_text)
             + "\n"
             + "Removed header: "
             + repr(self.removed_header)
@@ -107,656 +210,50 @@ class Converter:
     chapter, sub-chapter, paragraph...).
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        extraction_timeout=None,
+        extraction_workers=None,
+        skip_headless_illustrations=False,
+        header_band_height=None,
+        segmenter=None,
+        fail_soft=False,
+        infer_headers=False,
+        detect_continuations=False,
+        pdf_filename=None,
+        total_page_number=None,
+        pages_info=None,
+        extraction_mode="layout",
+        extraction_threads=None,
+        reader_pool=None,
+        shared_memory_extraction=False,
+        track_provenance=False,
+    ):
 
         # The original pdf document file name that this converter will act from
-        self.pdf_filename = os.path.join(
-            os.path.dirname(__file__),
-            "original_data",
-            "2019_-_Sayadaw-U-Tejaniya-Collecting-Gold-Dust-Web-Book-1.pdf",
-        )
+        # (another pdf following the same structural rules, e.g. a generated
+        # fixture, can be provided together with its number of pages and its
+        # structural information)
+        if pdf_filename is None:
+            pdf_filename = PDF_FILENAME
+        self.pdf_filename = pdf_filename
 
         # The original pdf document has a title. This title ends-up embedded in
         # some headers of the pages and must be extracted from the text.
         self.book_title = "COLLECTING GOLD DUST: Nurturing the Dhamma in Daily Living"
 
         # This number of pages is already known (will assert it later on)
-        self.total_page_number = 160
+        if total_page_number is None:
+            total_page_number = 160
+        self.total_page_number = total_page_number
 
         # The preamble section pages use roman numbering. This offsets the numbering
         # of the body pages
         self.page_numbering_offset = 16
 
         # The structural information constituted by the presence of chapters,
-        # illustrations, illumination, headers ... is quite often difficult
-        # to be automatically discovered. While waiting for better (and free)
-        # tools, the following is a manually extracted.
-        # Concerning the format:
-        # "type" is the {"chapter", "generic" "illustration"}
-        # A page_info of "chapter" type must have a "chapter_info" dictionary
-        self.pages_info = {
-            0: {
-                # Artificial/fake chapter that is not explicitly defined in the
-                # book. This is a technicality for the first pages not to be
-                # devoid of belonging chapter:
-                "type": "chapter",
-                "chapter_info": {
-                    "name": "",
-                    "illumination_delimiter": None,
-                },
-                "paragraph_fits_on_page": True,
-            },
-            1: {
-                "type": "generic",
-                "paragraph_fits_on_page": True,
-            },
-            2: {
-                "type": "illustration",
-            },
-            3: {
-                "type": "generic",
-                "paragraph_fits_on_page": True,
-            },
-            4: {
-                "type": "generic",
-                "paragraph_fits_on_page": True,
-            },
-            5: {
-                "type": "generic",
-                "paragraph_fits_on_page": True,
-            },
-            6: {
-                "type": "generic",
-                "paragraph_fits_on_page": True,
-            },
-            7: {
-                "type": "chapter",
-                "chapter_info": {
-                    "name": "Acknowledgements",
-                    "illumination_delimiter": "MBhaddanta",
-                },
-                "paragraph_fits_on_page": True,
-            },
-            9: {
-                "type": "chapter",
-                "chapter_info": {
-                    "name": "Dear Reader",
-                    "illumination_delimiter": "Iobservation",
-                },
-            },
-            10: {
-                "type": "generic",
-                # Notice that "practice." would be an erroneous delimiter:
-                "first_paragraph_delimiter": "flagging practice.",
-            },
-            11: {
-                "type": "generic",
-                "first_paragraph_delimiter": "view.",
-            },
-            12: {
-                "type": "generic",
-                "first_paragraph_delimiter": "daily life.",
-            },
-            13: {
-                "type": "generic",
-                "first_paragraph_delimiter": "info@wisdomstreams.org.",
-            },
-            14: {
-                "type": "generic",
-                "first_paragraph_delimiter": "Tuck Loon.",
-            },
-            15: {
-                "type": "chapter",
-                "chapter_info": {
-                    "name": "On Language",
-                    "illumination_delimiter": "Wwords",
-                },
-            },
-            16: {
-                "type": "generic",
-                "first_paragraph_delimiter": "wisdom.",
-            },
-            17: {
-                "type": "chapter",
-                "chapter_info": {"name": "Contents", "illumination_delimiter": None},
-                "paragraph_fits_on_page": True,
-            },
-            18: {
-                "type": "generic",
-                "paragraph_fits_on_page": True,
-            },
-            19: {
-                "type": "generic",
-                "paragraph_fits_on_page": True,
-            },
-            20: {
-                "type": "illustration",
-                # By default pages with illustrations (or illustration quotes)
-                # have no headers. The following line is thus implicit
-                # "header": None,
-            },
-            21: {
-                "type": "chapter",
-                "chapter_info": {
-                    "name": "A Note from the Teacher",
-                    "illumination_delimiter": "Ytime",
-                },
-            },
-            22: {
-                "type": "generic",
-                "first_paragraph_delimiter": "wisdom.",
-            },
-            23: {
-                "type": "generic",
-                # Everything shorter would be wrong
-                "first_paragraph_delimiter": "was that I was mindful.",
-            },
-            24: {
-                "type": "illustration",
-            },
-            25: {
-                "type": "generic",
-                "first_paragraph_delimiter": "discoveries.",
-            },
-            26: {
-                "type": "generic",
-                "first_paragraph_delimiter": "thing.",
-            },
-            27: {
-                "type": "generic",
-                "first_paragraph_delimiter": "do it.”",
-            },
-            28: {
-                "type": "generic",
-                "first_paragraph_delimiter": "center.",
-            },
-            29: {
-                "type": "generic",
-                "first_paragraph_delimiter": "depression.",
-            },
-            30: {
-                "type": "illustration",
-            },
-            31: {
-                "type": "generic",
-                "first_paragraph_delimiter": "resort.",
-            },
-            32: {
-                "type": "generic",
-                "first_paragraph_delimiter": "state.",
-            },
-            33: {
-                "type": "generic",
-                "first_paragraph_delimiter": "mind.",
-            },
-            34: {
-                "type": "generic",
-                "first_paragraph_delimiter": "emotions.",
-            },
-            35: {
-                "type": "generic",
-                "first_paragraph_delimiter": "disguise!",
-                # We don't have to look for paragraph continuation on the next
-                # page
-                "paragraph_fits_on_page": True,
-            },
-            36: {
-                "type": "illustration",
-            },
-            37: {
-                "type": "generic",
-                "paragraph_fits_on_page": True,
-            },
-            # 38: well nothing to express
-            39: {
-                "type": "generic",
-                "first_paragraph_delimiter": "time.",
-                "paragraph_fits_on_page": True,
-            },
-            # 40: zilch
-            41: {
-                "type": "generic",
-                "first_paragraph_delimiter": "himself.",
-                "paragraph_fits_on_page": True,
-            },
-            42: {
-                "type": "illustration",
-            },
-            43: {
-                "type": "chapter",
-                "chapter_info": {
-                    "name": "Mindfulness is a Lifestyle Change",
-                    "illumination_delimiter": "WTwo",
-                },
-            },
-            44: {
-                "type": "illustration",
-            },
-            45: {
-                "type": "generic",
-                "first_paragraph_delimiter": "mind.",
-                "paragraph_fits_on_page": True,
-            },
-            46: {
-                "type": "generic",
-                "paragraph_fits_on_page": True,
-            },
-            # 47: zilch
-            48: {
-                "type": "generic",
-                "first_paragraph_delimiter": "business.",
-                "paragraph_fits_on_page": True,
-            },
-            50: {
-                "type": "illustration",
-            },
-            51: {
-                "type": "generic",
-                "first_paragraph_delimiter": "suffering.",
-                "paragraph_fits_on_page": True,
-            },
-            # 52: zilch
-            53: {
-                "type": "generic",
-                "first_paragraph_delimiter": "day.",
-                "paragraph_fits_on_page": True,
-            },
-            # 54: nada
-            55: {
-                "type": "generic",
-                "first_paragraph_delimiter": "understanding.",
-            },
-            56: {
-                "type": "illustration",
-            },
-            57: {
-                "type": "generic",
-                "first_paragraph_delimiter": "habits.",
-            },
-            58: {
-                "type": "generic",
-                "first_paragraph_delimiter": "happen.",
-            },
-            59: {
-                "type": "generic",
-                "first_paragraph_delimiter": "effect.",
-            },
-            60: {
-                "type": "generic",
-                "first_paragraph_delimiter": "Understanding.",
-                "paragraph_fits_on_page": True,
-            },
-            # 61: nichts
-            62: {
-                "type": "illustration",
-            },
-            63: {
-                "type": "generic",
-                "first_paragraph_delimiter": "you.",
-                "paragraph_fits_on_page": True,
-            },
-            64: {
-                "type": "illustration",
-            },
-            65: {
-                "type": "chapter",
-                "chapter_info": {
-                    "name": "Take a Closer Look",
-                    "illumination_delimiter": "Man",
-                },
-            },
-            66: {
-                "type": "generic",
-                "first_paragraph_delimiter": "vedanā.",
-            },
-            67: {
-                "type": "generic",
-                "first_paragraph_delimiter": "experience.",
-                "paragraph_fits_on_page": True,
-            },
-            68: {
-                "type": "illustration",
-            },
-            # 69: this space intentionally left non void
-            70: {
-                "type": "generic",
-                "first_paragraph_delimiter": "effects.",
-                "paragraph_fits_on_page": True,
-            },
-            # 71: default is ok
-            72: {
-                "type": "generic",
-                "first_paragraph_delimiter": "further.",
-                "paragraph_fits_on_page": True,
-            },
-            73: {
-                "type": "generic",
-                "paragraph_fits_on_page": True,
-            },
-            74: {
-                "type": "illustration",
-            },
-            # 75: nothing
-            76: {
-                "type": "generic",
-                "first_paragraph_delimiter": "happening.",
-                "paragraph_fits_on_page": True,
-            },
-            77: {
-                "type": "illustration",
-                # By default illustrations have no header, unless ... they have
-                "header": True,
-            },
-            78: {
-                "type": "illustration",
-            },
-            79: {
-                "type": "chapter",
-                "chapter_info": {
-                    "name": "Reflect. Learn. Keep Going.",
-                    "illumination_delimiter": "Dnot",
-                },
-            },
-            80: {
-                "type": "generic",
-                "first_paragraph_delimiter": "through.",
-                "paragraph_fits_on_page": True,
-            },
-            # 81: nothing to say
-            82: {
-                "type": "illustration",
-            },
-            83: {
-                "type": "generic",
-                "first_paragraph_delimiter": "process.",
-            },
-            84: {
-                "type": "generic",
-                "first_paragraph_delimiter": "uncomfortable.",
-                "paragraph_fits_on_page": True,
-            },
-            # 85: nothing
-            86: {
-                "type": "generic",
-                "first_paragraph_delimiter": "practice.",
-            },
-            87: {
-                "type": "generic",
-                "first_paragraph_delimiter": "or another.",
-                "paragraph_fits_on_page": True,
-            },
-            88: {
-                "type": "illustration",
-            },
-            89: {
-                "type": "generic",
-                "paragraph_fits_on_page": True,
-            },
-            90: {
-                "type": "illustration",
-            },
-            91: {
-                "type": "chapter",
-                "chapter_info": {
-                    "name": "Day-to-Day",
-                    "illumination_delimiter": "Wchange",
-                },
-            },
-            92: {
-                "type": "generic",
-                "first_paragraph_delimiter": "term.",
-                "paragraph_fits_on_page": True,
-            },
-            # 93: nothing to say
-            94: {
-                "type": "illustration",
-            },
-            95: {
-                "type": "generic",
-                "first_paragraph_delimiter": "deepened.",
-            },
-            96: {
-                "type": "generic",
-                "first_paragraph_delimiter": "effect.",
-                "paragraph_fits_on_page": True,
-            },
-            # 97: default
-            98: {
-                "type": "generic",
-                "first_paragraph_delimiter": "people.",
-                "paragraph_fits_on_page": True,
-            },
-            99: {
-                "type": "generic",
-                "paragraph_fits_on_page": True,
-            },
-            100: {
-                "type": "illustration",
-            },
-            # 101: dalmatians
-            102: {
-                "type": "generic",
-                "first_paragraph_delimiter": "automatic.",
-                "paragraph_fits_on_page": True,
-            },
-            # 103: default works
-            104: {
-                "type": "generic",
-                "first_paragraph_delimiter": "time.",
-            },
-            105: {
-                "type": "generic",
-                "first_paragraph_delimiter": "well.",
-            },
-            106: {
-                "type": "illustration",
-            },
-            107: {
-                "type": "generic",
-                "first_paragraph_delimiter": ".",  # Notice the default case
-            },
-            108: {
-                "type": "generic",
-                "first_paragraph_delimiter": "steadier.",
-            },
-            109: {
-                "type": "generic",
-                "first_paragraph_delimiter": "silent?",
-            },
-            110: {
-                "type": "generic",
-                "first_paragraph_delimiter": "it.",
-            },
-            111: {
-                "type": "generic",
-                "first_paragraph_delimiter": "balanced.",
-                "paragraph_fits_on_page": True,
-            },
-            112: {
-                "type": "illustration",
-            },
-            # 113: nothing
-            114: {
-                "type": "generic",
-                "first_paragraph_delimiter": "understanding.",
-                "paragraph_fits_on_page": True,
-            },
-            # 115: nothing
-            116: {
-                "type": "generic",
-                "first_paragraph_delimiter": "violated.",
-            },
-            117: {
-                "type": "generic",
-                "first_paragraph_delimiter": "disappear.",
-                "paragraph_fits_on_page": True,
-            },
-            118: {
-                "type": "illustration",
-            },
-            119: {
-                "type": "generic",
-                "paragraph_fits_on_page": True,
-            },
-            # 120: nothing
-            121: {
-                "type": "generic",
-                "first_paragraph_delimiter": "people.",
-            },
-            122: {
-                "type": "generic",
-                "first_paragraph_delimiter": "deteriorate.",
-            },
-            123: {
-                "type": "generic",
-                "first_paragraph_delimiter": "way!",
-                "paragraph_fits_on_page": True,
-            },
-            124: {
-                "type": "illustration",
-            },
-            125: {
-                "type": "chapter",
-                "chapter_info": {
-                    "name": "A Lighter Approach",
-                    "illumination_delimiter": "Wawareness",
-                },
-                "paragraph_fits_on_page": True,
-            },
-            # 126: nothing
-            127: {
-                "type": "generic",
-                "first_paragraph_delimiter": "life.",
-            },
-            128: {
-                "type": "illustration",
-            },
-            129: {
-                "type": "generic",
-                "first_paragraph_delimiter": "habits.",
-            },
-            130: {
-                "type": "generic",
-                "first_paragraph_delimiter": "solutions.",
-            },
-            131: {
-                "type": "generic",
-                "first_paragraph_delimiter": "truth.",
-            },
-            132: {
-                "type": "generic",
-                "first_paragraph_delimiter": "lives.",
-                "paragraph_fits_on_page": True,
-            },
-            133: {
-                "type": "illustration",
-                # By default illustrations have no header, unless ... they have
-                "header": True,
-            },
-            134: {
-                "type": "illustration",
-            },
-            135: {
-                "type": "chapter",
-                "chapter_info": {
-                    "name": "Continuing the Work",
-                    "illumination_delimiter": "A remember",
-                },
-            },
-            136: {
-                "type": "generic",
-                "first_paragraph_delimiter": "moment.",
-                "paragraph_fits_on_page": True,
-            },
-            137: {
-                "type": "generic",
-                "first_paragraph_delimiter": "Thought.",
-                "paragraph_fits_on_page": True,
-            },
-            138: {
-                "type": "illustration",
-            },
-            # 139
-            140: {
-                "type": "generic",
-                "first_paragraph_delimiter": "perspective.",
-            },
-            141: {
-                "type": "generic",
-                "first_paragraph_delimiter": ".",  # End of first sentence
-            },
-            142: {
-                "type": "generic",
-                "first_paragraph_delimiter": "useful.",
-            },
-            143: {
-                "type": "generic",
-                "first_paragraph_delimiter": "operate.",
-                "paragraph_fits_on_page": True,
-            },
-            144: {
-                "type": "illustration",
-            },
-            145: {
-                "type": "chapter",
-                "chapter_info": {
-                    "name": "Appendix: Mindfulness in Brief",
-                    "illumination_delimiter": "Sour",
-                },
-            },
-            146: {
-                "type": "generic",
-                "first_paragraph_delimiter": "the mind.",
-            },
-            147: {
-                "type": "generic",
-                "first_paragraph_delimiter": "mind.",
-                "paragraph_fits_on_page": True,
-            },
-            148: {
-                "type": "generic",
-                "paragraph_fits_on_page": True,
-            },
-            149: {
-                "type": "generic",
-                "paragraph_fits_on_page": True,
-            },
-            150: {
-                "type": "illustration",
-            },
-            # 151
-            152: {
-                "type": "generic",
-                "first_paragraph_delimiter": ".",
-                "paragraph_fits_on_page": True,
-            },
-            153: {
-                "type": "generic",
-                "paragraph_fits_on_page": True,
-            },
-            154: {
-                "type": "generic",
-                "paragraph_fits_on_page": True,
-            },
-            # 155
-            156: {
-                "type": "illustration",
-            },
-            157: {
-                "type": "generic",
-                "first_paragraph_delimiter": "learn.",
-                "paragraph_fits_on_page": True,
-            },
-            158: {
-                "type": "chapter",
-                "chapter_info": {"name": "Dedication", "illumination_delimiter": None},
-                "paragraph_fits_on_page": True,
-            },
-            159: {
-                # This is the back cover of the book
-                "type": "illustration",
-            },
-        }
+        # illustrations, illumination, headers ... (refer to Structure.py)
+        self.pages_info = Structure.PAGES_INFO if pages_info is None else pages_info
 
         # Technical (optimisation) variable used to hold the correspondance
         # between a given page number and the chapter to which that page
@@ -765,25 +262,172 @@ class Converter:
         #  - the associated value holds the current chapter number for that key
         self.__chapter_page = {}
 
-        self.reader = PdfReader(self.pdf_filename)
-        if len(self.reader.pages) != self.total_page_number:
-            print("Erroneous number of pages:")
-            print(
-                "Was expecting",
-                self.total_page_number,
-                " but got ",
-                len(self.reader.pages),
+        # When an extraction timeout (in seconds) is provided, the pages text
+        # extraction is done ahead of time by isolated worker processes that
+        # are killed when exceeding that per page budget (refer to
+        # Extraction.WatchdogExtractor). Otherwise pages get extracted one
+        # after the other within this process.
+        self.extraction_timeout = extraction_timeout
+        self.extraction_workers = extraction_workers
+        self.extraction_report = None
+
+        # When set (together with an extraction timeout), the worker processes
+        # hand the extracted texts off through shared memory rather than
+        # pickling them (refer to SharedTexts.py). The chapters are processed
+        # (headers, newlines, continuations and paragraphs) one after the
+        # other: the texts of a chapter are decoded and its shared memory is
+        # released once broken into paragraphs. Header inference however
+        # decodes every page text before the first chapter gets processed.
+        self.shared_memory_extraction = shared_memory_extraction
+        self.__text_store = None
+
+        # When a number of extraction threads is provided (and no extraction
+        # timeout), the pages get extracted ahead of time by that many threads,
+        # each borrowing its own pypdf reader from the reader pool (refer to
+        # Extraction.ThreadedExtractor). Sharing a reader pool across the
+        # converters of a batch of books reuses the readers.
+        self.extraction_threads = extraction_threads
+        self.reader_pool = reader_pool
+
+        # The pages get extracted in pypdf's layout mode (whose whitespaces
+        # tell the paragraphs apart) unless the extraction mode is "indented":
+        # the much cheaper plain mode is then used, the indentation being
+        # restored out of the text positions (refer to
+        # Extraction.extract_indented_text). The pages where that proves
+        # inconsistent fall back to layout mode, as do the illuminated chapter
+        # beginning pages (whose illumination letter fix_illumination expects
+        # at its layout mode position). The "plain" extraction mode (the
+        # fallback of the WatchdogExtractor timeouts) restores the indentation
+        # in the same way but keeps the plain text of the inconsistent pages,
+        # whose paragraph starts are then lost (and reported).
+        self.extraction_mode = extraction_mode
+
+        # The text of headless illustration pages is never used for paragraph
+        # continuation (refer to __get_page_number_finishing_last_paragraph).
+        # When this flag is set, such pages are not extracted at all and only
+        # (empty) placeholder pages are kept for the page numbering to remain
+        # consistent. Note that the quotes of such illustrations then do not
+        # appear among the chapter paragraphs.
+        self.skip_headless_illustrations = skip_headless_illustrations
+
+        # When a header band height (in pdf units, measured from the top of
+        # the page) is provided, page headers are removed by geometry: the text
+        # rendered within that band is dropped while extracting the page (refer
+        # to Extraction.extract_layout_text_below_band). The per page header
+        # strings (as defined by __get_page_header) are then not used at all.
+        # Headless pages are extracted whole.
+        self.header_band_height = header_band_height
+
+        # When set, the page headers are not derived from the hand written
+        # rules of __get_page_header but inferred from the recurring first
+        # lines of the pages (refer to HeaderInference.py): headless pages keep
+        # their first line, and the headers inferred with a low confidence are
+        # stripped nonetheless but reported (as diagnostics). The inferred
+        # headers (InferredHeader instances keyed by page number) are kept
+        # for reporting purposes, the hand written rules only being compared
+        # with them.
+        self.infer_headers = infer_headers
+        self.header_inferrer = HeaderInferrer()
+        self.inferred_headers = None
+
+        # When set, whether the last paragraph of a page finishes on the next
+        # text page (and where) is detected out of the extracted texts (refer
+        # to Continuations.py) unless stated by the hand annotations (the
+        # paragraph_fits_on_page flags and first_paragraph_delimiter entries
+        # that act as overrides). The detections are compared with the hand
+        # annotations within the continuation report.
+        self.detect_continuations = detect_continuations
+        self.continuation_detector = None
+        self.continuation_report = None
+        # The ContinuationDecision of the pages, keyed by page number
+        self.__continuation_decisions = {}
+
+        # When set, the offsets of the page texts are mapped back to the
+        # original (layout mode) texts of the pages along every stage that
+        # rewrites them (refer to Provenance.py), for the paragraphs and
+        # sentences to know the exact character ranges they come from.
+        self.track_provenance = track_provenance
+
+        # The sentence segmenter (refer to Segmentation.py) that breaks the
+        # paragraphs into sentences. Defaults to nltk's Punkt.
+        if segmenter is None:
+            segmenter = PunktSegmenter()
+        self.segmenter = segmenter
+
+        # Cache of the original text of the pages. For this dictionary
+        #  - a key is the triple (page number, header band height, extraction
+        #    mode)
+        #  - the associated value is the triple (original text, header removed
+        #    by geometry or None, extraction mode finally used)
+        # It spares the (costly) pdf text extraction when the chapters get
+        # built again (e.g. after a reload of the structural information).
+        self.__original_texts = {}
+
+        # The problems encountered along the conversion (refer to
+        # Diagnostics.py). By default the first error exits. In fail-soft mode
+        # every problem is recorded, the conversion falls back to some sensible
+        # behaviour and carries on.
+        self.diagnostics = Diagnostics(fail_soft)
+
+        # The problems recorded by a build_chapters() call are forgotten by
+        # the next call (e.g. after a reload of the structural information)
+        self.__construction_diagnostic_count = 0
+
+        # The duration (in seconds) of each stage of the last build_chapters()
+        # call, keyed by stage name (in stage order)
+        self.stage_timings = {}
+
+        # The pypdf reader is only opened (and the pdf parsed) on first page
+        # access (refer to the reader property): tools that only need the
+        # structural information or the page numbering do not pay for it
+        self.__reader = None
+
+    @property
+    def reader(self):
+        if self.__reader is None:
+            self.__open_reader()
+        return self.__reader
+
+    def __open_reader(self):
+        from pypdf import PdfReader
+
+        self.__reader = PdfReader(self.pdf_filename)
+        if len(self.__reader.pages) != self.total_page_number:
+            self.diagnostics.error(
+                "page_count",
+                "Erroneous number of pages.",
+                expected=self.total_page_number,
+                found=len(self.__reader.pages),
+                fallback="converting the pages common to both numbers only",
             )
-            print("Exiting")
-            sys.exit()
+            self.total_page_number = min(
+                self.total_page_number, len(self.__reader.pages)
+            )
+        # A problem with the pdf itself is not forgotten by later builds
+        self.__construction_diagnostic_count = len(self.diagnostics.entries)
+
+    def reload_structure(self):
+        """
+        Reload the structural information (refer to Structure.py), e.g. after
+        it was edited, while keeping the reader and the already extracted
+        page texts.
+        """
+        importlib.reload(Structure)
+        self.pages_info = Structure.PAGES_INFO
+        self.__chapter_page = {}
 
     def __page_is_illustration(self, page_number):
         if not page_number in self.pages_info:
             return False
         if not "type" in self.pages_info[page_number]:
-            print("Page with no known type (page number ", page_number, ").")
-            print("Exiting")
-            sys.exit()
+            self.diagnostics.error(
+                "page_type",
+                "Page with no known type.",
+                page_number=page_number,
+                found=self.pages_info[page_number],
+                fallback="handled as a generic page",
+            )
+            return False
         if self.pages_info[page_number]["type"] == "illustration":
             return True
         return False
@@ -807,20 +451,18 @@ class Converter:
         next_page_number = page_number + 1
         while not self.__page_has_paragraph_delimiter(next_page_number):
             if not self.__page_is_illustration(next_page_number):
-                print(
-                    "Oddly enough we are on page number ",
-                    page_number,
-                    " and we are looking for the page holding the content of the end of the paragraph.",
+                self.diagnostics.error(
+                    "continuation_page",
+                    "Looking for the page holding the end of the last paragraph "
+                    "of page number " + str(page_number) + ", yet this page "
+                    "is not an illustration: maybe its first_paragraph_delimiter "
+                    "is not defined?",
+                    page_number=next_page_number,
+                    expected="first_paragraph_delimiter",
+                    found=self.pages_info.get(next_page_number),
+                    fallback="the paragraph is not continued",
                 )
-                print("Yet page number ", next_page_number, " is not an illustration.")
-                print("How could this be?")
-                print(
-                    "Maybe we forgot to define the first_paragraph_delimiter of page number ",
-                    next_page_number,
-                    "?",
-                )
-                print("Exiting.")
-                sys.exit()
+                return next_page_number
             next_page_number += 1
         return next_page_number
 
@@ -837,15 +479,21 @@ class Converter:
         started on the previous page and finishes on page with the page number page_number
         """
         if not self.__page_has_paragraph_delimiter(page_number):
-            print("How is it that were a looking for an unknown delimiter?")
-            print("Exiting")
-            sys.exit()
+            self.diagnostics.error(
+                "unknown_delimiter",
+                "Looking for an unknown paragraph delimiter.",
+                page_number=page_number,
+                expected="first_paragraph_delimiter",
+                found=self.pages_info.get(page_number),
+                fallback="using the default '.' delimiter",
+            )
+            return "."
         return self.pages_info[page_number]["first_paragraph_delimiter"]
 
     def __is_chapter_beginning_page(self, page_number):
         if not page_number in self.pages_info:
             return False
-        if self.pages_info[page_number]["type"] == "chapter":
+        if self.pages_info[page_number].get("type") == "chapter":
             return True
         return False
 
@@ -886,16 +534,19 @@ class Converter:
             return "Cover"
         # Deal with the first pages numbering that uses roman numeration
         if page_number >= 1 and page_number <= 17:
-            return roman.toRoman(page_number).lower()
+            return _lower_roman(page_number)
         # Just making sure
         original_reader_page = self.reader.pages[page_number]
         original_reader_page_number = self.reader.get_page_number(original_reader_page)
         if page_number != original_reader_page_number:
-            print("Python page number does not match pypdf::reader page number:")
-            print("   - Python page number: ", page_number)
-            print("   - pypdf::reader page number: ", original_reader_page_number)
-            print("Exiting.")
-            sys.exit()
+            self.diagnostics.error(
+                "reader_page_number",
+                "Python page number does not match pypdf::reader page number.",
+                page_number=page_number,
+                expected=page_number,
+                found=original_reader_page_number,
+                fallback="numbering from the python page number",
+            )
         return page_number - self.page_numbering_offset
 
     def fix_illumination(self, page_number, text_to_fix):
@@ -904,51 +555,63 @@ class Converter:
         The letter of the illumination ends mixed up within the text of the
         first sentence of the chapter. Fix that.
         """
+        return self.__fix_illumination(page_number, text_to_fix, None)[0]
+
+    def __sub(self, pattern, replacement, text, offset_map):
+        # re.sub() that maps the offsets of the result (when tracked)
+        if offset_map is None:
+            return re.sub(pattern, replacement, text), None
+        return Provenance.sub(pattern, replacement, text, offset_map)
+
+    def __fix_illumination(self, page_number, text_to_fix, offset_map):
+        # Return the fixed text together with its offset map
         if not self.__is_chapter_beginning_page(page_number):
-            print("Erroneous call to Converter::fix_illumination()")
-            print("  This does not seem to be a chapter starting page.")
-            print("  Exiting")
-            sys.exit()
+            self.diagnostics.error(
+                "illumination_page",
+                "Erroneous call to Converter::fix_illumination(): this does not "
+                "seem to be a chapter starting page.",
+                page_number=page_number,
+                fallback="text left as is",
+            )
+            return text_to_fix, offset_map
         delimiter = self.pages_info[page_number]["chapter_info"][
             "illumination_delimiter"
         ]
         if delimiter is None:
             # This chapter has no illumination to fix (probably because there
             # is no illumination at all). Return the original text:
-            return text_to_fix
+            return text_to_fix, offset_map
         # The illumination character that got embedded in the text happens to
         # to always be preceded by a return character. Looking for the delimiter
         # prefixed with a return character will make the result a little more
         # secure (yet not foolproof):
         delimiter_with_return = "[\n]" + delimiter
         if not re.search(delimiter_with_return, text_to_fix):
-            print(
-                "Delimiter ",
-                repr(delimiter),
-                "not found within illumination of chapter on page ",
-                page_number,
-                ".",
+            self.diagnostics.error(
+                "illumination_delimiter",
+                "Delimiter not found within illumination of chapter.",
+                page_number=page_number,
+                expected=delimiter,
+                found=text_to_fix,
+                fallback="illumination left unfixed",
             )
-            print(
-                "Chapter text that we were looking to fix: ",
-                repr(text_to_fix),
-            )
-            print("Exiting.")
-            sys.exit()
+            return text_to_fix, offset_map
         # The first thing to do is to remove the illumination character from
         # the text. We use this opportunity to replace the return character,
         # that prefixed the delimiter, with a whitespace:
         corrected_snippet = delimiter[1:]
-        text_to_fix = re.sub(
-            delimiter_with_return, " " + corrected_snippet, text_to_fix
+        text_to_fix, offset_map = self.__sub(
+            delimiter_with_return, " " + corrected_snippet, text_to_fix, offset_map
         )
         # The second thing to do is to reinsert the illumination character
         # within the text
+        if offset_map is not None:
+            offset_map = Provenance.prepend(delimiter[0], offset_map)
         text_to_fix = delimiter[0] + text_to_fix
         # The third fix consists in replacing the hand made spacing of the
         # first lines of the text (that would be overwritten by the illumination
         # drawing of the leading character) with a single white space:
-        return re.sub("\n      ", " ", text_to_fix)
+        return self.__sub("\n      ", " ", text_to_fix, offset_map)
 
     def __is_headless_page(self, page_number):
         # Only illustrations can be headless
@@ -963,9 +626,14 @@ class Converter:
     def __get_page_header(self, page_number):
 
         if page_number < 0 or page_number > self.total_page_number:
-            print("Page number is outside of book page numeration.")
-            print("Exiting")
-            sys.exit()
+            self.diagnostics.error(
+                "page_number",
+                "Page number is outside of book page numeration.",
+                page_number=page_number,
+                expected="0 to " + str(self.total_page_number),
+                fallback="no header",
+            )
+            return ""
 
         # Pages explicitly flagged as headless, well, are headless:
         if self.__is_headless_page(page_number):
@@ -983,12 +651,12 @@ class Converter:
             # Default value for a preamble header is to be empty
             return ""
         if page_number >= 10 and page_number < 15:
-            return roman.toRoman(page_number).lower()
+            return _lower_roman(page_number)
         if page_number == 16:
             # The following hardcoded value for page 16 is because that page
             # doesn't follow the above logical rule. The following fix for page
             # 16 _is_ correct ! It is the pdf that is erroneous.
-            return roman.toRoman(16).lower() + roman.toRoman(16).lower()
+            return _lower_roman(16) + _lower_roman(16)
         if page_number == 17:
             return ""
         if page_number >= 18 and page_number < 20:
@@ -1021,12 +689,154 @@ class Converter:
                 # chapter name
                 return self.__chapter_page_header(page_number)
 
-        print("Header for page number ", page_number, " is not defined")
-        print("Exiting")
-        sys.exit()
+        self.diagnostics.error(
+            "undefined_header",
+            "Header is not defined.",
+            page_number=page_number,
+            fallback="no header",
+        )
+        return ""
+
+    def __infer_page_headers(self, extracted_pages):
+        pages = [page for page in extracted_pages if not page.extraction_failed]
+        # The chapter names of the structure are known header fragments
+        chapter_names = [
+            self.__get_chapter_name(page_number)
+            for page_number in range(0, self.total_page_number)
+            if self.__is_chapter_beginning_page(page_number)
+        ]
+        self.inferred_headers = self.header_inferrer.infer(
+            {page.page_number: page.original_text for page in pages},
+            {page.page_number: page.page_layout.reader_page_number for page in pages},
+            chapter_names,
+        )
+
+    def __page_header(self, page_number):
+        if self.inferred_headers is None:
+            return self.__get_page_header(page_number)
+        # The hand written rules are only used by the comparison report
+        inferred = self.inferred_headers.get(page_number)
+        if inferred is None:
+            # A page left out of the inference (its extraction failed)
+            return ""
+        if inferred.confidence < self.header_inferrer.review_threshold:
+            self.diagnostics.warning(
+                "low_confidence_header",
+                "The inferred header (confidence "
+                + str(round(inferred.confidence, 2))
+                + ") is to be reviewed.",
+                page_number=page_number,
+                found=inferred.line,
+                fallback=(
+                    "first line kept (headless page)"
+                    if inferred.kind == "none"
+                    else "first line stripped (inferred header)"
+                ),
+            )
+        return inferred.header
+
+    def hand_written_page_headers(self, page_numbers):
+        """
+        Return the headers (regular expressions) of the pages as defined by the
+        hand written rules, keyed by page number.
+        """
+        return {
+            page_number: self.__get_page_header(page_number)
+            for page_number in page_numbers
+        }
+
+    def extract_original_texts(self):
+        """
+        Return a dictionary holding the extraction result (refer to
+        Extraction.ExtractionResult) of every page, keyed by page number, as
+        extracted under the watchdog. A result with a None text flags a page
+        whose extraction was given up. When no extraction timeout was
+        configured, the pages are extracted by threads when a number of
+        extraction threads was configured. Otherwise return an empty
+        dictionary: the pages then get extracted lazily (refer to
+        ExtractedPage.original_text).
+        """
+        if self.extraction_timeout is not None:
+            if self.shared_memory_extraction:
+                from SharedTexts import SharedTextStore
+
+                self.__text_store = SharedTextStore()
+            extractor = WatchdogExtractor(
+                self.pdf_filename,
+                timeout=self.extraction_timeout,
+                workers=self.extraction_workers,
+                text_store=self.__text_store,
+            )
+        elif self.extraction_threads is not None:
+            extractor = ThreadedExtractor(
+                self.pdf_filename,
+                workers=self.extraction_threads,
+                reader_pool=self.reader_pool,
+            )
+        else:
+            return {}
+        page_numbers = [
+            page_number
+            for page_number in range(0, self.total_page_number)
+            if not self.__page_extraction_is_skipped(page_number)
+            and self.__original_text_key(page_number) not in self.__original_texts
+        ]
+        self.extraction_report = extractor.extract(
+            page_numbers,
+            {
+                page_number: self.__get_header_band_height(page_number)
+                for page_number in page_numbers
+            },
+            {
+                page_number: self.__get_extraction_mode(page_number)
+                for page_number in page_numbers
+            },
+        )
+        self.extraction_report.print_report()
+        return self.extraction_report.results
+
+    def __get_header_band_height(self, page_number):
+        if self.__is_headless_page(page_number):
+            return None
+        return self.header_band_height
+
+    def __get_extraction_mode(self, page_number):
+        if (
+            self.__is_chapter_beginning_page(page_number)
+            and self.pages_info[page_number]["chapter_info"].get(
+                "illumination_delimiter"
+            )
+            is not None
+        ):
+            return "layout"
+        return self.extraction_mode
+
+    def __original_text_key(self, page_number):
+        return (
+            page_number,
+            self.__get_header_band_height(page_number),
+            self.__get_extraction_mode(page_number),
+        )
+
+    def __page_extraction_is_skipped(self, page_number):
+        if not self.skip_headless_illustrations:
+            return False
+        return self.__is_headless_page(page_number)
 
     def build_chapters(self):
+        self.diagnostics.truncate(self.__construction_diagnostic_count)
+        self.__continuation_decisions = {}
+        self.continuation_report = None
+        if self.detect_continuations:
+            self.continuation_detector = ContinuationDetector(self.segmenter)
+        self.stage_timings = {}
+        stage_start = time.perf_counter()
+        # Note: the first build opens the reader (checking the number of pages)
+        reader = self.reader
+        original_texts = self.extract_original_texts()
         resulting_chapters = []
+        # The pages whose header gets removed (i.e. not skipped)
+        extracted_pages = []
         current_chapter = Chapter("Preamble")
         resulting_chapters.append(current_chapter)
         for page_number in range(0, self.total_page_number):
@@ -1035,22 +845,84 @@ class Converter:
                 current_chapter = Chapter(new_chapter_name)
                 resulting_chapters.append(current_chapter)
 
-            original_page = self.reader.pages[page_number]
+            original_page = reader.pages[page_number]
             new_extracted_page = ExtractedPage(
                 page_number,
                 PageLayout(self.__convert_to_logical_page_number(page_number)),
                 original_page,
             )
-            self.remove_header(new_extracted_page)
+            if self.__page_extraction_is_skipped(page_number):
+                new_extracted_page.set_extraction_skipped()
+                current_chapter.add_page(new_extracted_page)
+                continue
+            new_extracted_page.header_band_height = self.__get_header_band_height(
+                page_number
+            )
+            new_extracted_page.extraction_mode = self.__get_extraction_mode(
+                page_number
+            )
+            cache_key = self.__original_text_key(page_number)
+            if cache_key in self.__original_texts:
+                new_extracted_page.set_original_text(*self.__original_texts[cache_key])
+            elif page_number in original_texts:
+                extraction_result = original_texts[page_number]
+                if extraction_result.failed:
+                    new_extracted_page.set_extraction_failed()
+                elif self.__text_store is not None:
+                    # Decoded on first use (the shared memory is released
+                    # chapter after chapter, the texts are not cached)
+                    new_extracted_page.set_extraction_result(extraction_result)
+                else:
+                    new_extracted_page.set_original_text(
+                        extraction_result.text,
+                        extraction_result.removed_header,
+                        extraction_result.extraction_mode,
+                    )
+            if not new_extracted_page.extraction_failed and self.__text_store is None:
+                # Note: this is where the lazy extraction takes place
+                self.__original_texts[cache_key] = (
+                    new_extracted_page.original_text,
+                    new_extracted_page.removed_header,
+                    new_extracted_page.extraction_mode,
+                )
             current_chapter.add_page(new_extracted_page)
+            extracted_pages.append(new_extracted_page)
+        stage_start = self.__end_stage("extraction", stage_start)
+        if self.infer_headers:
+            # Note: the inference reads (hence decodes) every page text first
+            self.__infer_page_headers(extracted_pages)
+            stage_start = self.__end_stage("header_removal", stage_start)
+        # The remaining stages only involve the pages of a chapter: they run
+        # chapter after chapter, for the shared memory of a chapter to be
+        # released as soon as it is broken into paragraphs
         for chapter in resulting_chapters:
+            for page in chapter.pages:
+                if not page.extraction_skipped:
+                    self.remove_header(page)
+            stage_start = self.__end_stage("header_removal", stage_start)
             self.sanitize_newlines(chapter)
-        for chapter in resulting_chapters:
-            self.reconstitute_pages_ending_sentence(chapter)
-        for chapter in resulting_chapters:
+            stage_start = self.__end_stage("newlines", stage_start)
+            delimiter_locations = self.locate_paragraph_delimiters([chapter])
+            self.reconstitute_pages_ending_sentence(chapter, delimiter_locations)
+            stage_start = self.__end_stage("continuations", stage_start)
             self.break_chapter_into_paragraphs(chapter)
+            if self.__text_store is not None:
+                self.__text_store.release(page.page_number for page in chapter.pages)
+            stage_start = self.__end_stage("paragraphs", stage_start)
+        if self.__text_store is not None:
+            self.__text_store.close()
+            self.__text_store = None
         return resulting_chapters
 
+    def __end_stage(self, stage, stage_start):
+        # Add the duration of the stage (that may run chapter after chapter)
+        # and return the start of the next one
+        stage_end = time.perf_counter()
+        self.stage_timings[stage] = (
+            self.stage_timings.get(stage, 0.0) + stage_end - stage_start
+        )
+        return stage_end
+
     def sanitize_newlines(self, chapter):
         # Newlines are encountered to denote different usages
         #  - set some tabulations of illuminations (example "\       ")
@@ -1065,6 +937,8 @@ class Converter:
             # following pattern is here: look for a newline preceded (?<=...)
             # by any character that is not an extended whitespace (\s) and
             # followed (?=[^\s]) by any character that is not a whitespace:
+            # Note: one character replacing another, the offset map of the page
+            # (when provenance is tracked) holds as is
             new_text = re.sub("(?<=[^\s])\n(?=[^\s])", " ", page.text)
             page.text = new_text
 
@@ -1072,7 +946,13 @@ class Converter:
         for page in chapter.pages:
             paragraphs = re.split("\n    ", page.text)
             page_number = page.page_layout.reader_page_number
-            for paragraph_text in paragraphs:
+            # The offset of the paragraph within the page text (the separator
+            # being 5 characters long)
+            paragraph_start = -5
+            paragraph_end = -5
+            for paragraph_index, paragraph_text in enumerate(paragraphs):
+                paragraph_start = paragraph_end + 5
+                paragraph_end = paragraph_start + len(paragraph_text)
                 if len(paragraph_text) == 0:
                     # Avoid creating empty paragraphs (resulting from previous
                     # erroneous/careless string manipulations):
@@ -1089,24 +969,48 @@ class Converter:
                 )
                 new_paragraph = Paragraph(new_paragraph_layout)
                 new_paragraph.text = paragraph_text
+                if page.offset_map is not None:
+                    new_paragraph.offset_map = page.offset_map.slice(
+                        paragraph_start, paragraph_end
+                    )
+                # The last paragraph of the page may finish on a later page.
+                # In which case, its sentences starting within the text taken
+                # from that later page belong to that later page.
+                last_page = page
+                continuation_start = len(paragraph_text)
+                if (
+                    paragraph_index == len(paragraphs) - 1
+                    and page.continuation_page is not None
+                ):
+                    last_page = page.continuation_page
+                    continuation_start -= page.continuation_length
+                new_paragraph.set_page_numbers(page.page_number, last_page.page_number)
+                # Break the paragraph into sentences
+                for start, end in self.segmenter.span_tokenize(paragraph_text):
+                    sentence_page = page if start < continuation_start else last_page
+                    new_sentence = Sentence(
+                        paragraph_text[start:end],
+                        sentence_page.page_layout.reader_page_number,
+                        sentence_page.page_number,
+                    )
+                    if new_paragraph.offset_map is not None:
+                        new_sentence.set_source(new_paragraph.offset_map, start, end)
+                    new_paragraph.add_sentence(new_sentence)
                 chapter.add_paragraph(new_paragraph)
 
-    def reconstitute_pages_ending_sentence(self, chapter):
+    def __paragraph_continuations(self, chapter):
         """
-        When a page ends with un unfinished sentence then the next page begins
-        with the end of that sentence. If we want the page layout to be correct
-        we need to reconstitute the unfinished sentence of the pages. In order
-        to do so, we need to remove the finishing part of the sentence from the
-        next page and for this we need to know were that (partial) sentence
-        ends. By default the delimiter is the dot ("."") character but when this
-        is not the case we use a manually defined delimiter (an ad-hoc string).
+        Return the list of the (page index, next page index) pairs, where the
+        last paragraph of the page (designated by its index within
+        chapter.pages) finishes on the next page (at next page index). Pages
+        that were explicitly stated as not to be treated, or whose last
+        paragraph finishes with the chapter, are not listed.
         """
-        if len(chapter.pages) == 1:
-            # Nothing to do for a single page
-            return
+        if self.detect_continuations:
+            return self.__detected_paragraph_continuations(chapter)
+        continuations = []
         for page_index in range(0, len(chapter.pages) - 1):
-            current_page = chapter.pages[page_index]
-            page_number = current_page.page_number
+            page_number = chapter.pages[page_index].page_number
             if not self.__page_requires_paragraph_continuation(page_number):
                 continue
             next_page_number = self.__get_page_number_finishing_last_paragraph(
@@ -1121,33 +1025,199 @@ class Converter:
                 # chapter which is thus complete. There is hence nothing to be
                 # collected from the next page
                 continue
-
-            number_skipped_pages = next_page_number - page_number - 1
-            next_page = chapter.pages[page_index + 1 + number_skipped_pages]
             # Note: when some illustration pages have been skipped in order to
             # retrieve the page holding the end of the paragraph, it is most
             # often due to the fact that we found some illustration in between.
             # We thus could/should advance the page_index in order to skip that
             # (illustration) page when reconstituting the paragraph. Yet we
             # leave this non optimal situation for code readability reasons.
-            delimiter = self.__get_first_paragraph_delimiter(next_page_number)
-            try:
-                ending_sentence, remaining_page_text = next_page.text.split(
-                    delimiter, 1
-                )
-                current_page.set_text(current_page.text + ending_sentence + delimiter)
-                next_page.text = remaining_page_text
-            except:
-                print(
-                    "Within page number ",
+            number_skipped_pages = next_page_number - page_number - 1
+            continuations.append(
+                (page_index, page_index + 1 + number_skipped_pages)
+            )
+        return continuations
+
+    def __continuation_candidates(self, chapter):
+        """
+        Return the list of the (page index, next page index) pairs of the
+        chapter text pages that are followed by another text page, the
+        illustration pages in between being skipped.
+        """
+        candidates = []
+        for page_index, page in enumerate(chapter.pages):
+            if self.__page_is_illustration(page.page_number):
+                continue
+            next_page_index = page_index + 1
+            while next_page_index < len(chapter.pages) and self.__page_is_illustration(
+                chapter.pages[next_page_index].page_number
+            ):
+                next_page_index += 1
+            if next_page_index < len(chapter.pages):
+                candidates.append((page_index, next_page_index))
+        return candidates
+
+    def __continuation_decision(self, page, next_page):
+        if page.page_number not in self.__continuation_decisions:
+            self.__continuation_decisions[page.page_number] = (
+                self.continuation_detector.detect(
+                    page.page_number,
+                    page.text,
                     next_page.page_number,
-                    " unable to find delimiter ",
-                    delimiter,
-                    " within page text: ",
                     next_page.text,
+                    next_page.leading_indentation,
                 )
-                print("Skipping handling of page number ", page_number)
+            )
+        return self.__continuation_decisions[page.page_number]
+
+    def __detected_paragraph_continuations(self, chapter):
+        # Same as __paragraph_continuations() where the hand annotations are
+        # only used as overrides of the detection
+        continuations = []
+        for page_index, next_page_index in self.__continuation_candidates(chapter):
+            page = chapter.pages[page_index]
+            next_page = chapter.pages[next_page_index]
+            if not self.__page_requires_paragraph_continuation(page.page_number):
                 continue
+            if (
+                self.__page_has_paragraph_delimiter(next_page.page_number)
+                or self.__continuation_decision(page, next_page).continued
+            ):
+                continuations.append((page_index, next_page_index))
+        return continuations
+
+    def __evaluate_continuation_detection(self, chapters, matcher, report):
+        for chapter in chapters:
+            for page_index, next_page_index in self.__continuation_candidates(
+                chapter
+            ):
+                page = chapter.pages[page_index]
+                next_page = chapter.pages[next_page_index]
+                decision = self.__continuation_decision(page, next_page)
+                if not self.__page_requires_paragraph_continuation(page.page_number):
+                    report.add(decision, next_page.text, False, None)
+                elif self.__page_has_paragraph_delimiter(next_page.page_number):
+                    end_offsets = matcher.find_all(next_page.text).get(
+                        self.__get_first_paragraph_delimiter(next_page.page_number),
+                        [],
+                    )
+                    report.add(
+                        decision,
+                        next_page.text,
+                        True,
+                        end_offsets[0] if end_offsets else None,
+                    )
+                # Otherwise the hand annotations say nothing about the page
+
+    def locate_paragraph_delimiters(self, chapters):
+        """
+        Locate, within the pages holding the end of a paragraph started on a
+        previous page, the first_paragraph_delimiter of these pages. All the
+        delimiters are searched for at once (with a single scan of each page
+        text) and all the missing or ambiguous delimiters are reported
+        together. Return a dictionary associating to such a page number its
+        DelimiterLocation.
+        When continuations are detected, the pages with no hand written
+        delimiter get the location of the detected paragraph end.
+        Note: the locations are offsets within the page texts as they are
+        before any paragraph reconstitution.
+        """
+        continuations = [
+            (chapter.pages[page_index], chapter.pages[next_page_index])
+            for chapter in chapters
+            for page_index, next_page_index in self.__paragraph_continuations(
+                chapter
+            )
+        ]
+        continued_pages = [next_page for _, next_page in continuations]
+        annotated_page_numbers = {
+            page.page_number
+            for page in continued_pages
+            if not self.detect_continuations
+            or self.__page_has_paragraph_delimiter(page.page_number)
+        }
+        matcher = MultiPatternMatcher(
+            self.__get_first_paragraph_delimiter(page_number)
+            for page_number in sorted(annotated_page_numbers)
+        )
+        locations = {}
+        for page, next_page in continuations:
+            if next_page.page_number in annotated_page_numbers:
+                delimiter = self.__get_first_paragraph_delimiter(
+                    next_page.page_number
+                )
+                end_offsets = matcher.find_all(next_page.text).get(delimiter, [])
+            else:
+                end_offset = self.__continuation_decisions[page.page_number].end_offset
+                delimiter = next_page.text[:end_offset]
+                end_offsets = [end_offset]
+            locations[next_page.page_number] = DelimiterLocation(
+                next_page.page_number, delimiter, end_offsets
+            )
+        self.__report_delimiter_locations(continued_pages, locations)
+        if self.detect_continuations:
+            # The chapters located one call after the other add to the report
+            if self.continuation_report is None:
+                self.continuation_report = ContinuationReport(
+                    self.continuation_detector
+                )
+            self.__evaluate_continuation_detection(
+                chapters, matcher, self.continuation_report
+            )
+        return locations
+
+    def __report_delimiter_locations(self, continued_pages, locations):
+        for page in continued_pages:
+            location = locations[page.page_number]
+            if location.missing:
+                self.diagnostics.warning(
+                    "missing_delimiter",
+                    "Unable to find the paragraph delimiter within page text.",
+                    page_number=page.page_number,
+                    expected=location.delimiter,
+                    found=page.text,
+                    fallback="skipping handling of the paragraph ending on "
+                    "that page",
+                )
+            elif location.is_ambiguous(page.text):
+                self.diagnostics.warning(
+                    "ambiguous_delimiter",
+                    "The first occurrence of the delimiter does not end a "
+                    "paragraph while a later occurrence does: maybe a longer "
+                    "delimiter is required?",
+                    page_number=page.page_number,
+                    expected=location.delimiter,
+                    found=page.text[: location.end_offset],
+                )
+
+    def reconstitute_pages_ending_sentence(self, chapter, delimiter_locations=None):
+        """
+        When a page ends with un unfinished sentence then the next page begins
+        with the end of that sentence. If we want the page layout to be correct
+        we need to reconstitute the unfinished sentence of the pages. In order
+        to do so, we need to remove the finishing part of the sentence from the
+        next page and for this we need to know were that (partial) sentence
+        ends. By default the delimiter is the dot ("."") character but when this
+        is not the case we use a manually defined delimiter (an ad-hoc string).
+        The delimiters are located beforehand (refer to
+        locate_paragraph_delimiters) which leaves us with slicing the texts.
+        """
+        if delimiter_locations is None:
+            delimiter_locations = self.locate_paragraph_delimiters([chapter])
+        for page_index, next_page_index in self.__paragraph_continuations(chapter):
+            current_page = chapter.pages[page_index]
+            next_page = chapter.pages[next_page_index]
+            end_offset = delimiter_locations[next_page.page_number].end_offset
+            if end_offset is None:
+                # Already reported by locate_paragraph_delimiters()
+                continue
+            current_page.set_text(current_page.text + next_page.text[:end_offset])
+            current_page.set_continuation(next_page, end_offset)
+            next_page.text = next_page.text[end_offset:]
+            if current_page.offset_map is not None:
+                current_page.offset_map = current_page.offset_map.concatenate(
+                    next_page.offset_map.slice(0, end_offset)
+                )
+                next_page.offset_map = next_page.offset_map.slice(end_offset)
 
     def remove_header(self, extracted_page):
         """
@@ -1156,49 +1226,97 @@ class Converter:
         the page number, a combination of the above ... or nothing.
         Clean up this mess.
         """
-        original_page_text = extracted_page.original_pdf_page.extract_text(
-            extraction_mode="layout"
-        )
+        if extracted_page.extraction_failed:
+            # There is no text to clean up. The page is kept (empty) in order
+            # for the page numbering to remain consistent:
+            self.diagnostics.warning(
+                "extraction_failed",
+                "The text extraction of the page failed.",
+                page_number=extracted_page.page_number,
+                fallback="empty page",
+            )
+            extracted_page.text = ""
+            if self.track_provenance:
+                extracted_page.offset_map = Provenance.OffsetMap()
+            return
+        original_page_text = extracted_page.original_text
+        if extracted_page.extraction_mode == "plain":
+            self.diagnostics.warning(
+                "plain_extraction",
+                "The page was extracted in plain mode (e.g. once its layout "
+                "mode extraction timed out) and its indentation could not be "
+                "restored: the paragraphs starting on it are merged with the "
+                "preceding ones.",
+                page_number=extracted_page.page_number,
+                fallback="unindented page text",
+            )
+        offset_map = None
+        if self.track_provenance:
+            offset_map = Provenance.OffsetMap.identity(
+                extracted_page.page_number, len(original_page_text)
+            )
 
         # Remove the heading bunch of whitespaces (and assimilated characters)
         header_less_page_text = original_page_text.lstrip()
+        if extracted_page.header_removed_by_geometry():
+            # The header was already dropped while extracting the page
+            self.__finalize_header_less_text(
+                extracted_page, original_page_text, offset_map
+            )
+            return
         # Make sure the exact header text is encountered
-        header_text = self.__get_page_header(extracted_page.page_number)
+        header_text = self.__page_header(extracted_page.page_number)
         if not re.match("^" + header_text, header_less_page_text):
-            print(
-                "Header ",
-                header_text,
-                "not found on pdf page ",
-                extracted_page.page_number,
-                " ",
-                end="",
+            self.diagnostics.error(
+                "header_mismatch",
+                "Header not found on pdf page (that is reader page number "
+                + str(extracted_page.page_layout.reader_page_number)
+                + ").",
+                page_number=extracted_page.page_number,
+                expected=header_text,
+                found=original_page_text,
+                fallback="header left within the page text",
             )
-            print(
-                "(that is reader page number ",
-                extracted_page.page_layout.reader_page_number,
-                ")",
+            self.__finalize_header_less_text(
+                extracted_page, original_page_text, offset_map
             )
-            original_page_text = extracted_page.original_pdf_page.extract_text(
-                extraction_mode="layout"
+            return
+        # Proceed with the removal of the header. Headless pages keep their
+        # leading whitespaces (for the indentation of their first line to be
+        # measured)
+        if header_text:
+            if offset_map is not None:
+                offset_map = offset_map.slice(
+                    len(original_page_text) - len(header_less_page_text)
+                )
+            header_less_page_text, offset_map = self.__sub(
+                header_text, "", header_less_page_text, offset_map
             )
-            print("Pdf original text : ", repr(original_page_text))
-            print("Exiting.")
-            sys.exit()
-        # Proceed with the removal of the header
-        header_less_page_text = re.sub(header_text, "", header_less_page_text)
+        else:
+            header_less_page_text = original_page_text
         extracted_page.set_removed_header(header_text)
+        self.__finalize_header_less_text(
+            extracted_page, header_less_page_text, offset_map
+        )
+
+    def __finalize_header_less_text(
+        self, extracted_page, header_less_page_text, offset_map=None
+    ):
+        extracted_page.leading_indentation = leading_indentation(
+            header_less_page_text
+        )
         # Eventually, remove some possibly leaving whitespaces
-        header_less_page_text = header_less_page_text.lstrip()
+        if offset_map is not None:
+            header_less_page_text, offset_map = Provenance.lstrip(
+                header_less_page_text, offset_map
+            )
+        else:
+            header_less_page_text = header_less_page_text.lstrip()
         # When necessary fix chapter illumination
         page_number = extracted_page.page_number
         if self.__is_chapter_beginning_page(page_number):
-            header_less_page_text = self.fix_illumination(
-                page_number, header_less_page_text
+            header_less_page_text, offset_map = self.__fix_illumination(
+                page_number, header_less_page_text, offset_map
             )
-
-        # Break the original streamlined text into sentences.
-        # FIXME FIXME
-        tokenized_text = nltk.tokenize.sent_tokenize(header_less_page_text)
-        # print("Tokenized text: ", nltk.tokenize.sent_tokenize(text))
-
         extracted_page.text = header_less_page_text
+        extracted_page.offset_map = offset_map
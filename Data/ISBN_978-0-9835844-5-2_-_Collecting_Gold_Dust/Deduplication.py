@@ -0,0 +1,158 @@
+import re
+import zlib
+import numpy
+
+# The Mersenne prime 2^31 - 1: with coefficients below it and 32 bits shingle
+# hashes, a * x + b never overflows 64 bits
+_PRIME = (1 << 31) - 1
+_WORD = re.compile(r"\w+")
+
+
+def shingle_hashes(text, shingle_size=5):
+    """
+    Return the (unique) 32 bits hashes of the word shingles (sequences of
+    shingle_size consecutive lowercase words) of the text. Texts shorter than
+    a shingle make a single shingle.
+    """
+    words = _WORD.findall(text.lower())
+    if len(words) < shingle_size:
+        shingles = [" ".join(words)]
+    else:
+        shingles = [
+            " ".join(words[index : index + shingle_size])
+            for index in range(len(words) - shingle_size + 1)
+        ]
+    return numpy.unique(
+        numpy.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles),
+            dtype=numpy.uint64,
+            count=len(shingles),
+        )
+    )
+
+
+class MinHasher:
+    """
+    Computes MinHash signatures: for each of the permutation_count hash
+    functions h(x) = (a * x + b) mod p, the minimum over the shingle hashes.
+    All the permutations of all the shingles are computed at once (as a
+    shingles x permutations matrix).
+    """
+
+    def __init__(self, permutation_count=128, seed=1):
+        generator = numpy.random.default_rng(seed)
+        self.permutation_count = permutation_count
+        self.a = generator.integers(1, _PRIME, permutation_count, dtype=numpy.uint64)
+        self.b = generator.integers(0, _PRIME, permutation_count, dtype=numpy.uint64)
+
+    def signature(self, hashes):
+        permuted = (numpy.outer(hashes, self.a) + self.b) % _PRIME
+        return permuted.min(axis=0).astype(numpy.uint32)
+
+
+class ParagraphReference:
+    """Where a paragraph comes from"""
+
+    def __init__(self, book, chapter, reference, text):
+        self.book = book
+        self.chapter = chapter
+        self.reference = reference
+        self.text = text
+
+
+class NearDuplicateDetector:
+    """
+    Finds clusters of near duplicate paragraphs (across books) with MinHash
+    signatures and locality sensitive hashing (LSH): signatures are cut into
+    bands of rows and paragraphs sharing an identical band become candidate
+    duplicates. Candidates are confirmed when their estimated Jaccard
+    similarity (the ratio of equal signature values) reaches the threshold.
+    The cost grows with the number of paragraphs (and of candidates) instead
+    of the number of pairs of paragraphs.
+    Attributes
+    ----------
+    band_count, rows_per_band: int
+        The LSH banding of the signatures (their product is the signature
+        length). The higher the rows per band, the fewer (and more similar)
+        the candidates.
+    threshold: float
+        The minimal estimated Jaccard similarity of near duplicates
+    """
+
+    def __init__(
+        self,
+        band_count=32,
+        rows_per_band=4,
+        threshold=0.8,
+        shingle_size=5,
+        min_words=8,
+        seed=1,
+    ):
+        self.band_count = band_count
+        self.rows_per_band = rows_per_band
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        # Shorter paragraphs (titles, page numbers...) are ignored
+        self.min_words = min_words
+        self.hasher = MinHasher(band_count * rows_per_band, seed)
+        self.references = []
+        self.__signatures = []  # One uint32 array per paragraph
+        self.__buckets = {}  # (band, band bytes) -> paragraph identifiers
+
+    def add_paragraph(self, book, chapter, reference, text):
+        if len(_WORD.findall(text)) < self.min_words:
+            return
+        identifier = len(self.references)
+        signature = self.hasher.signature(shingle_hashes(text, self.shingle_size))
+        self.references.append(ParagraphReference(book, chapter, reference, text))
+        self.__signatures.append(signature)
+        for band in range(self.band_count):
+            rows = signature[band * self.rows_per_band : (band + 1) * self.rows_per_band]
+            self.__buckets.setdefault((band, rows.tobytes()), []).append(identifier)
+
+    def add_document(self, book, document):
+        for chapter in document.chapters:
+            for paragraph in chapter.paragraphs:
+                self.add_paragraph(
+                    book,
+                    chapter.name,
+                    paragraph.page_layout.reference_text,
+                    paragraph.text,
+                )
+
+    def similarity(self, first, second):
+        return float(
+            numpy.count_nonzero(self.__signatures[first] == self.__signatures[second])
+            / self.hasher.permutation_count
+        )
+
+    def clusters(self):
+        """
+        Return the clusters of near duplicates (lists of ParagraphReference),
+        largest first. Within a bucket, paragraphs are only compared with the
+        first one: clusters are then joined (union-find) through the other
+        bands.
+        """
+        parents = list(range(len(self.references)))
+
+        def root(identifier):
+            while parents[identifier] != identifier:
+                parents[identifier] = parents[parents[identifier]]
+                identifier = parents[identifier]
+            return identifier
+
+        for identifiers in self.__buckets.values():
+            first = identifiers[0]
+            for other in identifiers[1:]:
+                if root(first) == root(other):
+                    continue
+                if self.similarity(first, other) >= self.threshold:
+                    parents[root(other)] = root(first)
+
+        members = {}
+        for identifier in range(len(self.references)):
+            members.setdefault(root(identifier), []).append(
+                self.references[identifier]
+            )
+        clusters = [cluster for cluster in members.values() if len(cluster) > 1]
+        return sorted(clusters, key=len, reverse=True)
@@ -0,0 +1,127 @@
+import re
+from collections import deque
+
+
+class MultiPatternMatcher:
+    """
+    Aho-Corasick automaton locating all the occurrences of a set of patterns
+    (e.g. all the first_paragraph_delimiter entries of a book) within a text
+    in a single pass, whatever the number of patterns.
+    Attributes
+    ----------
+    patterns: list
+        The (distinct) searched strings. A pattern is identified by its index
+        within this list.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = list(dict.fromkeys(patterns))
+        # The automaton nodes are numbered. For each node:
+        #  - __goto holds the transitions (a dictionary character -> node),
+        #  - __fail holds the node of the longest proper suffix that is also
+        #    a prefix of some pattern,
+        #  - __outputs holds the indexes of the patterns ending on that node.
+        self.__goto = [{}]
+        self.__fail = [0]
+        self.__outputs = [[]]
+        for pattern_index, pattern in enumerate(self.patterns):
+            node = 0
+            for character in pattern:
+                if character not in self.__goto[node]:
+                    self.__goto.append({})
+                    self.__fail.append(0)
+                    self.__outputs.append([])
+                    self.__goto[node][character] = len(self.__goto) - 1
+                node = self.__goto[node][character]
+            self.__outputs[node].append(pattern_index)
+        self.__build_failure_links()
+
+    def __build_failure_links(self):
+        # Breadth first traversal: the failure link of a node only depends on
+        # nodes of lower depth
+        nodes = deque(self.__goto[0].values())
+        while nodes:
+            node = nodes.popleft()
+            for character, child in self.__goto[node].items():
+                nodes.append(child)
+                fallback = self.__fail[node]
+                while fallback and character not in self.__goto[fallback]:
+                    fallback = self.__fail[fallback]
+                self.__fail[child] = self.__goto[fallback].get(character, 0)
+                if self.__fail[child] == child:
+                    self.__fail[child] = 0
+                self.__outputs[child] = (
+                    self.__outputs[child] + self.__outputs[self.__fail[child]]
+                )
+
+    def find_all(self, text):
+        """
+        Return a dictionary associating to the pattern (string) the sorted list
+        of the end offsets (exclusive) of all its occurrences within text.
+        Patterns with no occurrence are absent from the dictionary.
+        """
+        occurrences = {}
+        goto = self.__goto
+        fail = self.__fail
+        outputs = self.__outputs
+        node = 0
+        for index, character in enumerate(text):
+            while node and character not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(character, 0)
+            for pattern_index in outputs[node]:
+                occurrences.setdefault(self.patterns[pattern_index], []).append(
+                    index + 1
+                )
+        return occurrences
+
+
+# A paragraph ends either with the end of the page text or with a newline
+# followed by the four whitespaces that indent the next paragraph
+_PARAGRAPH_BOUNDARY = re.compile(r"[ ]*\n    |\s*$")
+
+
+def ends_paragraph(text, offset):
+    """Whether the text that follows offset starts a new paragraph"""
+    return _PARAGRAPH_BOUNDARY.match(text, offset) is not None
+
+
+class DelimiterLocation:
+    """
+    Where the paragraph continuation delimiter of a page was found.
+    Attributes
+    ----------
+    page_number: int
+        The number of the page holding the end of the continued paragraph
+    delimiter: str
+        The first_paragraph_delimiter of that page
+    end_offsets: list
+        The end offsets of all the delimiter occurrences within the page text
+    """
+
+    def __init__(self, page_number, delimiter, end_offsets):
+        self.page_number = page_number
+        self.delimiter = delimiter
+        self.end_offsets = end_offsets
+
+    @property
+    def missing(self):
+        return not self.end_offsets
+
+    @property
+    def end_offset(self):
+        # As for str.split(delimiter, 1), the first occurrence is the one used
+        if self.missing:
+            return None
+        return self.end_offsets[0]
+
+    def is_ambiguous(self, text):
+        """
+        A delimiter is ambiguous when its first occurrence falls within a
+        paragraph while a later occurrence does end a paragraph. This is e.g.
+        the case of "practice." on page 10 (where "flagging practice." must
+        be used instead).
+        """
+        if self.missing or ends_paragraph(text, self.end_offsets[0]):
+            return False
+        return any(ends_paragraph(text, offset) for offset in self.end_offsets[1:])
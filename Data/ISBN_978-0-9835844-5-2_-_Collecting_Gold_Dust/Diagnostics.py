@@ -0,0 +1,164 @@
+import sys
+import json
+
+
+class Diagnostic:
+    """
+    A problem encountered while converting the book.
+    Attributes
+    ----------
+    severity: str
+        "error" when the conversion cannot be trusted past that problem
+        (strict mode exits on errors), "warning" otherwise
+    kind: str
+        A short identifier of the problem (e.g. "header_mismatch")
+    message: str
+        The human readable description of the problem
+    page_number: int
+        The (pdf) page number the problem relates to, when any
+    expected, found:
+        What the structural information expected versus what was found
+    fallback: str
+        What the conversion did instead (fail-soft mode), when any
+    """
+
+    def __init__(
+        self,
+        severity,
+        kind,
+        message,
+        page_number=None,
+        expected=None,
+        found=None,
+        fallback=None,
+    ):
+        self.severity = severity
+        self.kind = kind
+        self.message = message
+        self.page_number = page_number
+        self.expected = expected
+        self.found = found
+        self.fallback = fallback
+
+    def to_dict(self):
+        return {
+            "severity": self.severity,
+            "kind": self.kind,
+            "message": self.message,
+            "page_number": self.page_number,
+            "expected": self.expected,
+            "found": self.found,
+            "fallback": self.fallback,
+        }
+
+    def print(self, max_length=300, stream=sys.stderr):
+        if self.page_number is None:
+            print(self.severity.capitalize(), ": ", self.message, file=stream)
+        else:
+            print(
+                self.severity.capitalize(),
+                " on page number ",
+                self.page_number,
+                ": ",
+                self.message,
+                file=stream,
+            )
+        for label, value in (("expected", self.expected), ("found", self.found)):
+            if value is None:
+                continue
+            value = repr(value)
+            if len(value) > max_length:
+                value = value[:max_length] + "..."
+            print("   - " + label + ": ", value, file=stream)
+        if self.fallback is not None:
+            print("   - fallback: ", self.fallback, file=stream)
+
+
+class Diagnostics:
+    """
+    Collects the problems encountered while converting the book. In strict
+    mode (the default), a problem gets printed as soon as encountered and an
+    error exits the process. In fail-soft mode, problems are only recorded:
+    the caller falls back (as described by the diagnostic) and the conversion
+    carries on, leaving all the problems to be reported at once (refer to
+    print_report and write_json).
+    """
+
+    def __init__(self, fail_soft=False):
+        self.fail_soft = fail_soft
+        self.entries = []
+        # The keys of the recorded entries (refer to __key)
+        self.__keys = set()
+
+    @staticmethod
+    def __key(diagnostic):
+        # The expected and found values may not be hashable (e.g. the
+        # structural information of a page): their representation is
+        return (
+            diagnostic.kind,
+            diagnostic.page_number,
+            repr(diagnostic.expected),
+            repr(diagnostic.found),
+        )
+
+    def __record(self, diagnostic):
+        # The same problem may be encountered several times (e.g. the type of
+        # a page is checked by several stages): only record it once
+        key = self.__key(diagnostic)
+        if key in self.__keys:
+            return False
+        self.__keys.add(key)
+        self.entries.append(diagnostic)
+        if not self.fail_soft:
+            diagnostic.print()
+        return True
+
+    def error(self, kind, message, **details):
+        diagnostic = Diagnostic("error", kind, message, **details)
+        if self.__record(diagnostic) and not self.fail_soft:
+            print("Exiting.", file=sys.stderr)
+            sys.exit()
+        return diagnostic
+
+    def warning(self, kind, message, **details):
+        diagnostic = Diagnostic("warning", kind, message, **details)
+        self.__record(diagnostic)
+        return diagnostic
+
+    def truncate(self, length):
+        """Forget the problems recorded after the length first ones"""
+        for entry in self.entries[length:]:
+            self.__keys.discard(self.__key(entry))
+        del self.entries[length:]
+
+    def errors(self):
+        return [entry for entry in self.entries if entry.severity == "error"]
+
+    def print_report(self, stream=sys.stderr):
+        if not self.entries:
+            print("Conversion diagnostics: no problem encountered.", file=stream)
+            return
+        print(
+            "Conversion diagnostics: ",
+            len(self.errors()),
+            " error(s), ",
+            len(self.entries) - len(self.errors()),
+            " warning(s).",
+            file=stream,
+        )
+        for entry in sorted(
+            self.entries,
+            key=lambda entry: (
+                -1 if entry.page_number is None else entry.page_number
+            ),
+        ):
+            entry.print(stream=stream)
+
+    def write_json(self, filename):
+        with open(filename, "w", encoding="utf-8") as output:
+            json.dump(
+                [entry.to_dict() for entry in self.entries],
+                output,
+                ensure_ascii=False,
+                indent=1,
+            )
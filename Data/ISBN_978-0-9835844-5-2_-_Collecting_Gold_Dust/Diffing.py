@@ -0,0 +1,209 @@
+"""
+Differences between two conversions of a book, for the downstream consumers
+(search index, chunk store, embeddings...) to only reprocess what changed.
+Paragraphs are compared by content hash (refer to Model.content_hash): the
+cost of the diff, and the size of the change feed, scale with the size of the
+edit rather than with the size of the book.
+"""
+import os
+import json
+import difflib
+from collections import Counter
+from Model import Chapter, Document, PageLayout, Paragraph, Sentence
+
+
+class ParagraphChange:
+    """
+    A change of a paragraph between two conversions.
+    Attributes
+    ----------
+    kind: str
+        "added", "removed", "modified" (the paragraph at that place has a new
+        text) or "moved" (the same text now appears elsewhere)
+    old, new: Paragraph
+        The paragraph within the old (resp. new) document, None when added
+        (resp. removed)
+    """
+
+    def __init__(self, kind, old, new):
+        self.kind = kind
+        self.old = old
+        self.new = new
+
+    def sentence_changes(self):
+        """
+        Return the content hashes of the removed sentences and of the added
+        sentences (the sentences that both paragraphs share are left out)
+        """
+        old_hashes = Counter()
+        new_hashes = Counter()
+        for paragraph, hashes in ((self.old, old_hashes), (self.new, new_hashes)):
+            if paragraph is not None:
+                hashes.update(sentence.content_hash for sentence in paragraph.sentences)
+        removed = sorted((old_hashes - new_hashes).elements())
+        added = sorted((new_hashes - old_hashes).elements())
+        return removed, added
+
+    def to_dict(self):
+        removed_sentences, added_sentences = self.sentence_changes()
+        change = {"kind": self.kind}
+        for side, paragraph in (("old", self.old), ("new", self.new)):
+            if paragraph is None:
+                continue
+            change[side] = {
+                "positional_id": paragraph.positional_id,
+                "content_hash": paragraph.content_hash,
+                "reference": paragraph.page_layout.reference_text,
+            }
+        change["new_text"] = None if self.new is None else self.new.text
+        change["removed_sentences"] = removed_sentences
+        change["added_sentences"] = added_sentences
+        return change
+
+
+def _paragraphs(document):
+    return [
+        paragraph for chapter in document.chapters for paragraph in chapter.paragraphs
+    ]
+
+
+def _similarity(old, new):
+    return difflib.SequenceMatcher(None, old.text, new.text).quick_ratio()
+
+
+def diff_documents(old_document, new_document, modification_threshold=0.5):
+    """
+    Generate the ParagraphChange list turning the old document into the new
+    one. The paragraph sequences (as content hashes) are aligned, the aligned
+    paragraphs being left out even when their positional id changed (e.g.
+    because of a paragraph inserted before them within the chapter). Within
+    the unaligned stretches:
+     - a paragraph whose content appears unaligned on the other side too is
+       moved,
+     - the remaining paragraphs are paired in order as modified when their
+       texts are similar enough (modification_threshold), or reported as
+       removed and added otherwise.
+    """
+    old_paragraphs = _paragraphs(old_document)
+    new_paragraphs = _paragraphs(new_document)
+    old_hashes = [paragraph.content_hash for paragraph in old_paragraphs]
+    new_hashes = [paragraph.content_hash for paragraph in new_paragraphs]
+    matcher = difflib.SequenceMatcher(None, old_hashes, new_hashes, autojunk=False)
+    stretches = [
+        (range(start, end), range(other_start, other_end))
+        for operation, start, end, other_start, other_end in matcher.get_opcodes()
+        if operation != "equal"
+    ]
+    # The contents left unaligned on both sides moved
+    unaligned_old = Counter(
+        old_hashes[index] for old_range, _ in stretches for index in old_range
+    )
+    unaligned_new = Counter(
+        new_hashes[index] for _, new_range in stretches for index in new_range
+    )
+    moved = unaligned_old & unaligned_new
+    moved_old = {}  # content hash -> old paragraphs that moved, in order
+    stretch_old = []  # the old paragraphs of each stretch that did not move
+    for old_range, _ in stretches:
+        remaining_old = []
+        for index in old_range:
+            content = old_hashes[index]
+            if moved[content] > 0:
+                moved[content] -= 1
+                moved_old.setdefault(content, []).append(old_paragraphs[index])
+            else:
+                remaining_old.append(old_paragraphs[index])
+        stretch_old.append(remaining_old)
+
+    for (_, new_range), remaining_old in zip(stretches, stretch_old):
+        remaining_new = []
+        for index in new_range:
+            content = new_hashes[index]
+            if moved_old.get(content):
+                yield ParagraphChange(
+                    "moved", moved_old[content].pop(0), new_paragraphs[index]
+                )
+            else:
+                remaining_new.append(new_paragraphs[index])
+        pairs = min(len(remaining_old), len(remaining_new))
+        for old, new in zip(remaining_old, remaining_new):
+            if _similarity(old, new) >= modification_threshold:
+                yield ParagraphChange("modified", old, new)
+            else:
+                yield ParagraphChange("removed", old, None)
+                yield ParagraphChange("added", None, new)
+        for old in remaining_old[pairs:]:
+            yield ParagraphChange("removed", old, None)
+        for new in remaining_new[pairs:]:
+            yield ParagraphChange("added", None, new)
+
+
+def change_batches(changes, batch_size=1000):
+    """Group the changes (as dictionaries) into lists of batch_size"""
+    batch = []
+    for change in changes:
+        batch.append(change.to_dict())
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def write_change_feed(changes, stream, batch_size=1000):
+    """
+    Write the changes onto the stream as JSON lines, one batch of changes at
+    a time, and return the number of changes of each kind
+    """
+    counts = Counter()
+    for batch in change_batches(changes, batch_size):
+        counts.update(change["kind"] for change in batch)
+        stream.write(
+            "".join(json.dumps(change, ensure_ascii=False) + "\n" for change in batch)
+        )
+    return counts
+
+
+def book_name(filename):
+    """The name of a converted book: its file name without the extensions of
+    the format (and of the compression), e.g. "book.v2" for book.v2.jsonl.gz"""
+    name = os.path.basename(filename)
+    if name.endswith(".gz"):
+        name = name[: -len(".gz")]
+    return os.path.splitext(name)[0]
+
+
+def read_json_lines_chapters(lines):
+    """
+    Generate the chapters out of the lines written by Writers.JsonLinesWriter
+    (paragraphs and sentences only: the pages are not written), each chapter
+    once its last line was read
+    """
+    chapter = None
+    chapter_index = None
+    for line in lines:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if record["chapter_index"] != chapter_index:
+            if chapter is not None:
+                yield chapter
+            chapter_index = record["chapter_index"]
+            chapter = Chapter(record["chapter"])
+        layout = PageLayout(record["reader_page_number"])
+        layout.set_reference_text(record["reference"])
+        paragraph = Paragraph(layout)
+        paragraph.text = record["text"]
+        for sentence in record["sentences"]:
+            paragraph.add_sentence(Sentence(sentence, record["reader_page_number"]))
+        chapter.add_paragraph(paragraph)
+    if chapter is not None:
+        yield chapter
+
+
+def read_json_lines_document(lines):
+    """Rebuild a Document out of the lines (refer to read_json_lines_chapters)"""
+    document = Document()
+    for chapter in read_json_lines_chapters(lines):
+        document.add_chapter(chapter)
+    return document
@@ -0,0 +1,743 @@
+import os
+import sys
+import time
+import threading
+import contextlib
+
+# Note: pypdf (whose import is slow) and multiprocessing are only imported when
+# pages get actually extracted, for short lived invocations (and tools that
+# only need the page structure) not to pay for them
+
+
+class ExtractionResult:
+    """
+    Outcome of the text extraction of a single pdf page.
+    Attributes
+    ----------
+    page_number: int
+        The index of the page as it appears extracted by pydf::PdfReader()
+    text: str
+        The extracted text or None when the extraction failed
+    extraction_mode: str
+        The extraction mode ("layout", "indented" or "plain") that produced
+        the text
+    duration: float
+        Wall clock time (in seconds) spent on the page, summed over attempts
+    timed_out_modes: list
+        The extraction modes that exceeded the per-page time budget
+    error: str
+        The representation of the exception raised by pypdf (if any)
+    removed_header: str
+        When the header was dropped by geometry during extraction, the text
+        found within the header band. None otherwise.
+    text_store: SharedTexts.SharedTextStore
+        When the text was handed-off through shared memory, the store it gets
+        decoded from on first access
+    """
+
+    def __init__(self, page_number):
+        self.page_number = page_number
+        self._text = None
+        self.text_store = None
+        self.extraction_mode = None
+        self.duration = 0.0
+        self.timed_out_modes = []
+        self.error = None
+        self.removed_header = None
+
+    @property
+    def text(self):
+        if self._text is None and self.text_store is not None:
+            if self.page_number in self.text_store:
+                self._text = self.text_store.text(self.page_number)
+        return self._text
+
+    @text.setter
+    def text(self, value):
+        self._text = value
+
+    @property
+    def failed(self):
+        if self.text_store is not None and self.page_number in self.text_store:
+            return False
+        return self._text is None
+
+
+class ExtractionReport:
+    """
+    The per page results of a (watched) extraction together with the pages
+    that proved slow, timed out or failed.
+    """
+
+    def __init__(self, slow_page_threshold):
+        self.slow_page_threshold = slow_page_threshold
+        self.results = {}
+        self.wall_time = 0.0
+
+    def add_result(self, result):
+        self.results[result.page_number] = result
+
+    def slow_pages(self):
+        slow = [
+            result
+            for result in self.results.values()
+            if result.duration >= self.slow_page_threshold
+        ]
+        return sorted(slow, key=lambda result: result.duration, reverse=True)
+
+    def timed_out_pages(self):
+        return [
+            result.page_number
+            for result in self.results.values()
+            if result.timed_out_modes
+        ]
+
+    def failed_pages(self):
+        return [
+            result.page_number for result in self.results.values() if result.failed
+        ]
+
+    def print_report(self, stream=sys.stderr):
+        print(
+            "Extracted ",
+            len(self.results),
+            " pages in ",
+            round(self.wall_time, 3),
+            " seconds.",
+            file=stream,
+        )
+        for result in self.slow_pages():
+            print(
+                "   - Slow page number ",
+                result.page_number,
+                ": ",
+                round(result.duration, 3),
+                " seconds (mode ",
+                result.extraction_mode,
+                ", timed out modes ",
+                result.timed_out_modes,
+                ")",
+                file=stream,
+            )
+        if self.failed_pages():
+            print("   - Failed pages: ", self.failed_pages(), file=stream)
+
+
+def extract_layout_text_below_band(page, header_band_height):
+    """
+    Extract the text of a pdf page in layout mode while dropping the text
+    rendered within the header band, that is within header_band_height (in pdf
+    units) from the top of the page. Return the extracted text together with
+    the (dropped) text of the header band.
+    pypdf ignores text visitors in layout mode: we thus filter the text show
+    operations (whose coordinates are known) before pypdf lays them out. The
+    fixed character width is computed on all the operations (header included)
+    so that the remaining text is laid out exactly as extract_text(
+    extraction_mode="layout") would.
+    These operations are private to pypdf (requirements.txt pins the tested
+    releases): should they change, the whole page is extracted in layout mode
+    instead and the returned header is None (the header then gets removed
+    from the text, refer to Converter.remove_header).
+    """
+    from pypdf.generic import ContentStream
+
+    contents = page.get("/Contents")
+    if contents is None:
+        # A page with no content stream has no text
+        return "", ""
+    try:
+        from pypdf._text_extraction import _layout_mode
+
+        fonts = page._layout_mode_fonts()
+        operations = iter(
+            ContentStream(contents.get_object(), page.pdf, "bytes").operations
+        )
+        bt_groups = _layout_mode.text_show_operations(operations, fonts, True, None)
+        if not bt_groups:
+            return "", ""
+        char_width = _layout_mode.fixed_char_width(bt_groups, 1.25)
+
+        header_limit = float(page.mediabox.top) - header_band_height
+        body_groups = []
+        header_groups = []
+        for bt_group in bt_groups:
+            if bt_group["ty"] >= header_limit:
+                header_groups.append(bt_group)
+            else:
+                body_groups.append(bt_group)
+
+        def lay_out(groups):
+            if not groups:
+                return ""
+            ty_groups = _layout_mode.y_coordinate_groups(groups, None)
+            return _layout_mode.fixed_width_page(ty_groups, char_width, True, 1)
+
+        return lay_out(body_groups), lay_out(header_groups).strip()
+    except (ImportError, AttributeError, TypeError):
+        return page.extract_text(extraction_mode="layout"), None
+
+
+# The fixed character width (as a fraction of the font size) that layout mode
+# ends up with for proportional fonts (refer to _layout_mode.fixed_char_width)
+_CHARACTER_WIDTH = 0.4
+# Lines indented by that many characters (or more) start a new paragraph
+# (refer to Converter.break_chapter_into_paragraphs)
+_PARAGRAPH_INDENTATION = 4
+
+
+class _PlainLine:
+    """A line of the plain mode text together with its position"""
+
+    def __init__(self):
+        self.text = ""
+        self.x = None
+        self.y = None
+        self.font_size = None
+
+    def add(self, text, cm, tm, font_size):
+        self.text += text
+        if self.x is None and text.strip():
+            # The text matrix is relative to the current transformation matrix
+            self.x = tm[4] * cm[0] + tm[5] * cm[2] + cm[4]
+            self.y = tm[4] * cm[1] + tm[5] * cm[3] + cm[5]
+            self.font_size = font_size * abs(tm[3] * cm[3]) or font_size
+
+
+def extract_indented_text(page, header_band_height=None, layout_fallback=True):
+    """
+    Extract the text of a pdf page in the (cheap) plain mode while restoring
+    what the conversion needs from layout mode: the indentation of the lines
+    (an indented line starts a new paragraph) and the blank lines between
+    distant lines. The position of each line is taken from a text visitor.
+    Return the extracted text, the text found within the header band (or None
+    with no header band) and the extraction mode that was finally used:
+    "indented", or "layout" when the plain mode text proved inconsistent with
+    the positions (lines out of reading order, text not seen by the visitor,
+    indentations too close to the paragraph threshold...) and the page was
+    extracted again in layout mode. Without layout_fallback (e.g. once layout
+    mode timed out), the plain mode text is then returned as is ("plain"
+    mode): its paragraph indentation is lost.
+    """
+    lines = [_PlainLine()]
+
+    def visit(text, cm, tm, font_dict, font_size):
+        parts = text.split("\n")
+        for part_index, part in enumerate(parts):
+            if part_index > 0:
+                lines.append(_PlainLine())
+            lines[-1].add(part, cm, tm, font_size)
+
+    plain_text = page.extract_text(visitor_text=visit)
+    laid_out = _lay_out_plain_lines(
+        plain_text, lines, float(page.mediabox.top), header_band_height
+    )
+    if laid_out is None:
+        if not layout_fallback:
+            return plain_text, None, "plain"
+        return extract_page_text_with_mode(page, "layout", header_band_height)
+    return laid_out + ("indented",)
+
+
+def _lay_out_plain_lines(plain_text, lines, page_top, header_band_height):
+    # Return the (text, header) pair or None when the lines are inconsistent.
+    # The lines are laid out as _layout_mode.fixed_width_page would.
+    if "\n".join(line.text for line in lines) != plain_text:
+        return None
+    lines = [line for line in lines if line.text.strip()]
+    header = None
+    if header_band_height is not None:
+        header_limit = page_top - header_band_height
+        header_lines = [line for line in lines if line.y >= header_limit]
+        if lines[: len(header_lines)] != header_lines:
+            return None
+        header = " ".join(line.text.strip() for line in header_lines)
+        lines = lines[len(header_lines) :]
+    if not lines:
+        return "", header
+    for line, next_line in zip(lines, lines[1:]):
+        if next_line.y >= line.y:
+            return None  # Not in reading order: layout mode sorts lines by y
+    font_sizes = [line.font_size for line in lines]
+    character_width = _CHARACTER_WIDTH * max(set(font_sizes), key=font_sizes.count)
+    # Layout mode drops the whitespaces common to all the lines
+    margin = min(line.x for line in lines)
+
+    text_lines = []
+    previous_line = None
+    for line in lines:
+        indentation = (line.x - margin) / character_width
+        if abs(indentation - _PARAGRAPH_INDENTATION) < 1:
+            # Too close to the threshold for the character width estimate to
+            # tell whether layout mode would start a paragraph
+            return None
+        if previous_line is not None:
+            blank_lines = int((previous_line.y - line.y) / line.font_size) - 1
+            text_lines.extend([""] * blank_lines)
+        spaces = int(line.x // character_width) - int(margin // character_width)
+        text_lines.append(" " * spaces + line.text.rstrip())
+        previous_line = line
+    return "\n".join(text_lines), header
+
+
+def extract_page_text(page, extraction_mode="layout", header_band_height=None):
+    """
+    Return the extracted text of the page together with its removed header.
+    The header is only removed (by geometry) for layout (or indented) mode
+    extractions with a header band. Otherwise, the removed header is None.
+    The indented mode (refer to extract_indented_text) falls back to layout
+    mode on the pages whose plain text proves inconsistent. The plain mode
+    restores the indentation in the same way when it can, and otherwise
+    keeps the plain text (refer to extract_page_text_with_mode).
+    """
+    return extract_page_text_with_mode(page, extraction_mode, header_band_height)[:2]
+
+
+def extract_page_text_with_mode(
+    page, extraction_mode="layout", header_band_height=None
+):
+    """
+    Same as extract_page_text, together with the extraction mode that was
+    finally used: "indented" for the plain mode pages whose indentation was
+    restored, "plain" for those whose indentation is lost
+    """
+    if extraction_mode == "indented":
+        return extract_indented_text(page, header_band_height)
+    if extraction_mode == "plain":
+        # The fallback of a layout mode timeout: layout mode is not retried
+        return extract_indented_text(page, header_band_height, layout_fallback=False)
+    if extraction_mode == "layout" and header_band_height is not None:
+        return extract_layout_text_below_band(page, header_band_height) + ("layout",)
+    return page.extract_text(extraction_mode=extraction_mode), None, extraction_mode
+
+
+def _extraction_worker(pdf_filename, tasks, results, shared_memory=False):
+    """
+    Worker process loop: each worker parses its own copy of the pdf (a
+    PdfReader can not be shared across processes) and extracts the pages it
+    is handed until it receives the None sentinel. Each task is acknowledged
+    (the reader being open by then) before its result gets sent, both through
+    the private results pipe of the worker. With shared memory, the texts are
+    written to shared memory arenas and only their locations are sent back
+    (refer to SharedTexts.py).
+    """
+    from pypdf import PdfReader
+
+    reader = PdfReader(pdf_filename)
+    writer = None
+    if shared_memory:
+        from SharedTexts import SharedTextWriter
+
+        writer = SharedTextWriter()
+    while True:
+        task = tasks.get()
+        if task is None:
+            if writer is not None:
+                writer.close()
+            return
+        page_number, extraction_mode, header_band_height = task
+        results.send(("started", task))
+        start = time.perf_counter()
+        try:
+            text, removed_header, extraction_mode = extract_page_text_with_mode(
+                reader.pages[page_number], extraction_mode, header_band_height
+            )
+            if writer is not None:
+                text = writer.write(text)
+            error = None
+        except Exception as exception:
+            text, removed_header = None, None
+            error = repr(exception)
+        results.send(
+            (
+                "done",
+                task,
+                text,
+                removed_header,
+                extraction_mode,
+                time.perf_counter() - start,
+                error,
+            )
+        )
+
+
+class _WorkerSlot:
+    """
+    A worker process together with its private task queue, its private
+    results pipe and the task it is currently busy with (when any). Keeping
+    one task queue per worker is what allows to know which process to
+    terminate when a page exceeds its budget, and one results pipe per worker
+    that terminating a worker (possibly while it sends a result) leaves the
+    results of the other workers intact.
+    Attributes
+    ----------
+    assigned_at: float
+        When the current task was handed to the worker
+    started_at: float
+        When the worker acknowledged the current task (None until then): the
+        time budget of the page starts then, a respawned worker having first
+        to parse the pdf
+    """
+
+    def __init__(self, context, pdf_filename, shared_memory):
+        self.tasks = context.Queue()
+        self.results, worker_end = context.Pipe(duplex=False)
+        self.process = context.Process(
+            target=_extraction_worker,
+            args=(pdf_filename, self.tasks, worker_end, shared_memory),
+            daemon=True,
+        )
+        self.process.start()
+        # Only the worker writes: the pipe reads as closed once it exits
+        worker_end.close()
+        self.task = None
+        self.assigned_at = None
+        self.started_at = None
+
+    def assign(self, task):
+        self.task = task
+        self.assigned_at = time.perf_counter()
+        self.started_at = None
+        self.tasks.put(task)
+
+    def acknowledge(self, task):
+        if task == self.task:
+            self.started_at = time.perf_counter()
+
+    def release(self):
+        self.task = None
+        self.assigned_at = None
+        self.started_at = None
+
+    def stop(self):
+        self.tasks.put(None)
+
+    def kill(self):
+        self.process.terminate()
+        self.process.join()
+        self.results.close()
+
+
+class WatchdogExtractor:
+    """
+    Extracts the text of pdf pages within isolated worker processes while
+    enforcing a per page time budget. A page whose layout mode extraction
+    exceeds the budget has its worker terminated (and replaced) and is retried
+    with the (cheaper) plain extraction mode. When the retry also fails, the
+    page is flagged as failed and the extraction carries on with the other
+    pages. A single pathological page thus no longer stalls the whole batch.
+    The budget of a page starts once its worker acknowledged it, that is once
+    the worker has parsed the pdf: the parsing by a respawned worker is
+    bounded by the (larger) open_timeout instead.
+    Attributes
+    ----------
+    pdf_filename: str
+        The pdf file that every worker opens on its own
+    timeout: float
+        The time budget (in seconds) of a single extraction attempt of a page
+    workers: int
+        The number of worker processes
+    open_timeout: float
+        The time budget (in seconds) of a worker to acknowledge its task
+        (parsing the pdf first when just spawned)
+    fallback_modes: list
+        The extraction modes tried in turn after a timeout (or an error)
+    slow_page_threshold: float
+        Pages taking longer than this (in seconds) are listed by the report
+    text_store: SharedTexts.SharedTextStore
+        When not None, the workers hand the extracted texts off through shared
+        memory: the results only get their text decoded from that store on
+        first access. The caller releases the texts (and eventually closes the
+        store) once processed.
+    """
+
+    def __init__(
+        self,
+        pdf_filename,
+        timeout=10.0,
+        workers=None,
+        fallback_modes=("plain",),
+        slow_page_threshold=1.0,
+        text_store=None,
+        open_timeout=60.0,
+    ):
+        self.pdf_filename = pdf_filename
+        self.timeout = timeout
+        self.open_timeout = open_timeout
+        self.workers = workers or os.cpu_count() or 1
+        self.fallback_modes = list(fallback_modes)
+        self.slow_page_threshold = slow_page_threshold
+        self.text_store = text_store
+
+    def __next_mode(self, extraction_mode):
+        modes = ["layout"] + self.fallback_modes
+        # Other modes (e.g. indented) fall back to layout mode first
+        index = modes.index(extraction_mode) + 1 if extraction_mode in modes else 0
+        if index >= len(modes):
+            return None
+        return modes[index]
+
+    def extract(self, page_numbers, header_band_heights=None, extraction_modes=None):
+        """
+        Extract the given pages and return an ExtractionReport. The optional
+        header_band_heights dictionary provides, for each page number, the
+        height of the header band to be dropped (refer to
+        extract_layout_text_below_band) or None for pages with no header. The
+        optional extraction_modes dictionary provides, for each page number,
+        the mode of its first extraction attempt (layout mode by default).
+        """
+        if header_band_heights is None:
+            header_band_heights = {}
+        report = ExtractionReport(self.slow_page_threshold)
+        if extraction_modes is None:
+            extraction_modes = {}
+        pending = [
+            (
+                page_number,
+                extraction_modes.get(page_number, "layout"),
+                header_band_heights.get(page_number),
+            )
+            for page_number in page_numbers
+        ]
+        pending.reverse()  # We pop() from the end and want pages in order
+        for page_number in page_numbers:
+            report.add_result(ExtractionResult(page_number))
+        if not pending:
+            return report
+
+        import multiprocessing
+        from multiprocessing.connection import wait
+
+        shared_memory = self.text_store is not None
+        if shared_memory:
+            from SharedTexts import start_tracking
+
+            start_tracking()
+        context = multiprocessing.get_context()
+        slots = [
+            _WorkerSlot(context, self.pdf_filename, shared_memory)
+            for _ in range(min(self.workers, len(pending)))
+        ]
+        busy = {}  # task -> slot
+        start = time.perf_counter()
+        try:
+            while pending or busy:
+                for slot in slots:
+                    if slot.task is None and pending:
+                        task = pending.pop()
+                        slot.assign(task)
+                        busy[task] = slot
+
+                ready = wait(
+                    [slot.results for slot in slots], timeout=min(0.1, self.timeout)
+                )
+                for slot_index, slot in enumerate(list(slots)):
+                    if slot.results not in ready:
+                        continue
+                    try:
+                        message = slot.results.recv()
+                    except EOFError:
+                        # The worker exited (e.g. crashed) on its own
+                        self.__replace_slot(
+                            slots, slot_index, context, busy, pending, report, False
+                        )
+                        continue
+                    if message[0] == "started":
+                        slot.acknowledge(message[1])
+                        continue
+                    _, task, text, removed_header, mode, duration, error = message
+                    if busy.get(task) is not slot:
+                        continue
+                    busy.pop(task).release()
+                    result = report.results[task[0]]
+                    result.duration += duration
+                    if error is None and shared_memory:
+                        self.text_store.add(task[0], text)
+                        result.text_store = self.text_store
+                        result.extraction_mode = mode
+                        result.removed_header = removed_header
+                    elif error is None:
+                        result.text = text
+                        result.extraction_mode = mode
+                        result.removed_header = removed_header
+                    else:
+                        result.error = error
+                        self.__retry_or_give_up(task, pending)
+
+                # The watchdog part: terminate the workers that exceed the budget
+                now = time.perf_counter()
+                for slot_index, slot in enumerate(list(slots)):
+                    if slot.task is None:
+                        continue
+                    if slot.started_at is not None:
+                        exceeded = now - slot.started_at >= self.timeout
+                    else:
+                        exceeded = now - slot.assigned_at >= self.open_timeout
+                    if exceeded:
+                        self.__replace_slot(
+                            slots, slot_index, context, busy, pending, report, True
+                        )
+        finally:
+            for slot in slots:
+                slot.stop()
+            for slot in slots:
+                slot.process.join(timeout=1.0)
+                if slot.process.is_alive():
+                    slot.process.terminate()
+                    slot.process.join()
+                slot.results.close()
+        report.wall_time = time.perf_counter() - start
+        return report
+
+    def __replace_slot(
+        self, slots, slot_index, context, busy, pending, report, timed_out
+    ):
+        # Terminate the worker of the slot (and replace it), its task (if any)
+        # being recorded as timed out (or failed) and retried
+        slot = slots[slot_index]
+        task = slot.task
+        slot.kill()
+        slots[slot_index] = _WorkerSlot(
+            context, self.pdf_filename, self.text_store is not None
+        )
+        if task is None:
+            return
+        busy.pop(task)
+        result = report.results[task[0]]
+        result.duration += time.perf_counter() - (
+            slot.started_at if slot.started_at is not None else slot.assigned_at
+        )
+        if timed_out:
+            result.timed_out_modes.append(task[1])
+        else:
+            result.error = "The extraction worker exited"
+        self.__retry_or_give_up(task, pending)
+
+    def __retry_or_give_up(self, task, pending):
+        page_number, extraction_mode, header_band_height = task
+        next_mode = self.__next_mode(extraction_mode)
+        if next_mode is not None:
+            # Retried pages go first in order not to leave them for the end
+            pending.append((page_number, next_mode, header_band_height))
+
+
+class ReaderPool:
+    """
+    A pool of independent pypdf readers, a PdfReader being not safe to share
+    across threads. Much like a connection pool, the readers that get given
+    back are kept (up to size per pdf file) and lent again, sparing the
+    parsing of the pdf to the next extractions of the same file (e.g. the next
+    book of a batch, or the next build of the chapters).
+    """
+
+    def __init__(self, size=None):
+        self.size = size or os.cpu_count() or 1
+        self.__idle_readers = {}  # pdf filename -> list of idle readers
+        self.__lock = threading.Lock()
+        self.opened_readers = 0
+
+    def acquire(self, pdf_filename):
+        with self.__lock:
+            idle_readers = self.__idle_readers.get(pdf_filename)
+            if idle_readers:
+                return idle_readers.pop()
+            self.opened_readers += 1
+        from pypdf import PdfReader
+
+        return PdfReader(pdf_filename)
+
+    def release(self, pdf_filename, reader):
+        with self.__lock:
+            idle_readers = self.__idle_readers.setdefault(pdf_filename, [])
+            if len(idle_readers) < self.size:
+                idle_readers.append(reader)
+
+    @contextlib.contextmanager
+    def reader(self, pdf_filename):
+        reader = self.acquire(pdf_filename)
+        try:
+            yield reader
+        finally:
+            self.release(pdf_filename, reader)
+
+    def clear(self):
+        with self.__lock:
+            self.__idle_readers = {}
+
+
+class ThreadedExtractor:
+    """
+    Extracts the text of pdf pages within a pool of threads, each extraction
+    borrowing its own reader from a ReaderPool. Compared with the processes of
+    the WatchdogExtractor, threads cost nothing to start and the extracted
+    texts need no pickling: this suits short books. The pages extraction only
+    runs in parallel on free-threaded python builds (or wherever pypdf waits
+    on I/O or decompression, which release the GIL). Note that a thread can
+    not be killed: there is no time budget.
+    Attributes
+    ----------
+    pdf_filename: str
+    workers: int
+        The number of threads
+    reader_pool: ReaderPool
+        Where readers are borrowed from (pass the same pool to the extractors
+        of a batch of books for the readers to be reused)
+    slow_page_threshold: float
+        Pages taking longer than this (in seconds) are listed by the report
+    """
+
+    def __init__(
+        self, pdf_filename, workers=None, reader_pool=None, slow_page_threshold=1.0
+    ):
+        self.pdf_filename = pdf_filename
+        self.workers = workers or os.cpu_count() or 1
+        if reader_pool is None:
+            reader_pool = ReaderPool(self.workers)
+        self.reader_pool = reader_pool
+        self.slow_page_threshold = slow_page_threshold
+
+    def __extract_page(self, result, extraction_mode, header_band_height):
+        start = time.perf_counter()
+        with self.reader_pool.reader(self.pdf_filename) as reader:
+            try:
+                (
+                    result.text,
+                    result.removed_header,
+                    result.extraction_mode,
+                ) = extract_page_text_with_mode(
+                    reader.pages[result.page_number],
+                    extraction_mode,
+                    header_band_height,
+                )
+            except Exception as exception:
+                result.error = repr(exception)
+        result.duration = time.perf_counter() - start
+
+    def extract(self, page_numbers, header_band_heights=None, extraction_modes=None):
+        """
+        Extract the given pages and return an ExtractionReport (refer to
+        WatchdogExtractor.extract for the optional dictionaries)
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        if header_band_heights is None:
+            header_band_heights = {}
+        if extraction_modes is None:
+            extraction_modes = {}
+        report = ExtractionReport(self.slow_page_threshold)
+        for page_number in page_numbers:
+            report.add_result(ExtractionResult(page_number))
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [
+                executor.submit(
+                    self.__extract_page,
+                    report.results[page_number],
+                    extraction_modes.get(page_number, "layout"),
+                    header_band_heights.get(page_number),
+                )
+                for page_number in page_numbers
+            ]
+            for future in futures:
+                future.result()
+        report.wall_time = time.perf_counter() - start
+        return report
@@ -0,0 +1,223 @@
+"""
+Generation of small fixture pdf books following the structural rules of
+Collecting Gold Dust (page headers, roman numbered preamble, chapters,
+illustrations, paragraphs continued on the next page...) together with their
+structural information (the equivalent of Structure.PAGES_INFO). The pdf files
+are written by hand (with the standard Helvetica font): no dependency needed.
+"""
+import os
+import random
+import textwrap
+import roman
+
+BOOK_TITLE = "COLLECTING GOLD DUST: Nurturing the Dhamma in Daily Living"
+PAGE_SIZE = (432, 648)
+_WORDS = (
+    "mind awareness practice wisdom attention object moment mindfulness "
+    "effort nature the a of in with and to is was be we our right gently "
+    "knowing seeing feeling thinking noticing patience interest stillness "
+    "understanding defilement craving aversion delusion dhamma teacher yogi"
+).split()
+
+
+def _pdf_string(text):
+    escaped = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    return "(" + escaped + ")"
+
+
+def write_pdf(filename, pages, page_size=PAGE_SIZE):
+    """
+    Write a pdf file whose pages hold text lines, each page being given as a
+    list of (x, y, font size, text) tuples (in pdf units, text in ascii).
+    """
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # The page tree, once the page objects are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica "
+        b"/Encoding /WinAnsiEncoding >>",
+    ]
+    page_references = []
+    for lines in pages:
+        content = "".join(
+            "BT /F1 %g Tf %g %g Td %s Tj ET\n" % (size, x, y, _pdf_string(text))
+            for x, y, size, text in lines
+        ).encode("latin-1")
+        objects.append(
+            b"<< /Length %d >>\nstream\n" % len(content) + content + b"endstream"
+        )
+        objects.append(
+            (
+                "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %g %g] "
+                "/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+                % (page_size[0], page_size[1], len(objects))
+            ).encode("ascii")
+        )
+        page_references.append("%d 0 R" % len(objects))
+    objects[1] = (
+        "<< /Type /Pages /Kids [%s] /Count %d >>"
+        % (" ".join(page_references), len(page_references))
+    ).encode("ascii")
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref_offset,
+    )
+    with open(filename, "wb") as pdf:
+        pdf.write(output)
+
+
+class FixtureBook:
+    """
+    A generated book of page_count pages following the header rules of
+    Converter.__get_page_header, with chapters starting on the pages given
+    by chapters (page number -> name) and headless illustrations on the
+    illustrations pages. Unless the page ends a chapter (or precedes an
+    illustration ending it), the last paragraph of one text page out of three
+    fits on its page: the others continue on the next text page.
+    Attributes
+    ----------
+    pdf_filename: str
+    total_page_number: int
+    pages_info: dict
+        The structural information (refer to Structure.PAGES_INFO)
+    """
+
+    def __init__(
+        self,
+        pdf_filename,
+        page_count=28,
+        chapters=None,
+        illustrations=(23,),
+        seed=1,
+        page_numbering_offset=16,
+    ):
+        if chapters is None:
+            chapters = {2: "Foreword", 20: "First Steps", 26: "Second Steps"}
+        self.pdf_filename = pdf_filename
+        self.total_page_number = page_count
+        self.chapters = chapters
+        self.illustrations = set(illustrations)
+        self.page_numbering_offset = page_numbering_offset
+        self.__random = random.Random(seed)
+        self.pages_info = {}
+        pages = self.__build_pages()
+        os.makedirs(os.path.dirname(os.path.abspath(pdf_filename)), exist_ok=True)
+        write_pdf(pdf_filename, pages)
+
+    def __reader_page_number(self, page_number):
+        if page_number == 0:
+            return "Cover"
+        if page_number <= 17:
+            return roman.toRoman(page_number).lower()
+        return str(page_number - self.page_numbering_offset)
+
+    def __chapter_name(self, page_number):
+        name = None
+        for chapter_page in sorted(self.chapters):
+            if chapter_page <= page_number:
+                name = self.chapters[chapter_page]
+        return name
+
+    def header(self, page_number):
+        """The (literal) header, as ruled by Converter.__get_page_header"""
+        if page_number in self.illustrations:
+            return ""
+        if page_number in self.chapters:
+            return self.chapters[page_number]
+        if page_number < 10 or page_number in (15, 17):
+            return ""
+        if page_number < 15:
+            return roman.toRoman(page_number).lower()
+        if page_number == 16:
+            return roman.toRoman(16).lower() * 2
+        if page_number < 20:
+            return self.__reader_page_number(page_number)
+        if page_number % 2 == 0:
+            return self.__reader_page_number(page_number) + " | " + BOOK_TITLE
+        return (
+            self.__chapter_name(page_number)
+            + " | "
+            + self.__reader_page_number(page_number)
+        )
+
+    def __sentence(self):
+        word_count = self.__random.randint(6, 14)
+        words = [self.__random.choice(_WORDS) for _ in range(word_count)]
+        return words[0].capitalize() + " " + " ".join(words[1:]) + "."
+
+    def __paragraph(self, sentence_count):
+        return " ".join(self.__sentence() for _ in range(sentence_count))
+
+    def __next_text_page(self, page_number):
+        next_page_number = page_number + 1
+        while next_page_number in self.illustrations:
+            next_page_number += 1
+        if next_page_number >= self.total_page_number or next_page_number in (
+            self.chapters
+        ):
+            return None
+        return next_page_number
+
+    def __build_pages(self):
+        pages = []
+        continued_text = None  # The end of the paragraph of the previous page
+        for page_number in range(self.total_page_number):
+            info = {"type": "generic"}
+            if page_number in self.chapters:
+                info = {
+                    "type": "chapter",
+                    "chapter_info": {
+                        "name": self.chapters[page_number],
+                        "illumination_delimiter": None,
+                    },
+                }
+            if page_number in self.illustrations:
+                self.pages_info[page_number] = {"type": "illustration"}
+                pages.append([(120, 400, 11, "An illustration quote.")])
+                continue
+            paragraphs = []  # (indented, text)
+            if continued_text is not None:
+                paragraphs.append((False, continued_text))
+                # The last three words are unique enough within a page
+                info["first_paragraph_delimiter"] = " ".join(
+                    continued_text.split()[-3:]
+                )
+                continued_text = None
+            for _ in range(self.__random.randint(1, 3)):
+                sentence_count = self.__random.randint(1, 3)
+                paragraphs.append((True, self.__paragraph(sentence_count)))
+            next_page_number = self.__next_text_page(page_number)
+            if next_page_number is not None and page_number % 3 != 0:
+                # Cut the last paragraph in the middle of its last sentence
+                indented, text = paragraphs[-1]
+                words = (text + " " + self.__sentence()).split()
+                cut = len(words) - self.__random.randint(3, 6)
+                paragraphs[-1] = (indented, " ".join(words[:cut]))
+                continued_text = " ".join(words[cut:])
+            else:
+                info["paragraph_fits_on_page"] = True
+            self.pages_info[page_number] = info
+            pages.append(self.__page_lines(page_number, paragraphs))
+        return pages
+
+    def __page_lines(self, page_number, paragraphs):
+        lines = []
+        header = self.header(page_number)
+        if header:
+            lines.append((150, 620, 9, header))
+        y = 580
+        for indented, text in paragraphs:
+            for line_index, line in enumerate(textwrap.wrap(text, 60)):
+                x = 94 if indented and line_index == 0 else 72
+                lines.append((x, y, 11, line))
+                y -= 14
+        return lines
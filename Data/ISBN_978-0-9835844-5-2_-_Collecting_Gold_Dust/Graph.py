@@ -0,0 +1,259 @@
+"""
+Export of the structure of converted books (Document -> Chapter -> Paragraph
+-> Sentence, together with the PageLayout links) as a Cytoscape.js compatible
+graph (refer to GraphVisualization.md at the root of the repository). Books
+and chapters are compound (parent) nodes, paragraphs and sentences nodes of
+their chapter, pages nodes of their book.
+
+The elements are written out as they are generated, one chapter at a time:
+the memory only grows with the size of a chapter (and the number of pages of
+the current book), not with the size of the library. Leaf nodes get coarse
+preset positions (a grid per chapter, the chapters of a book stacked within
+a column, one column per book) for the browser not to run any layout
+algorithm. Large graphs can be written as JSON lines (batches of elements)
+for the browser to add them incrementally.
+"""
+import json
+
+LEVELS_OF_DETAIL = ("sentence", "paragraph", "chapter")
+# Coarse layout: the spacing of the leaf nodes
+SPACING = 40
+PARAGRAPHS_PER_ROW = 10
+SENTENCES_PER_ROW = 10
+# The horizontal room left for the page column and for the chapters of a book
+PAGE_COLUMN_WIDTH = 3 * SPACING
+BOOK_WIDTH = PAGE_COLUMN_WIDTH + (SENTENCES_PER_ROW + 3) * SPACING
+# The vertical room between two chapters of a book
+CHAPTER_GAP = 2 * SPACING
+# Batches of elements are encoded at once (as compact JSON arrays)
+_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def _label(text, label_length):
+    text = " ".join(text.split())
+    if len(text) <= label_length:
+        return text
+    return text[: label_length - 1] + "…"
+
+
+class GraphExporter:
+    """
+    Writes the elements (nodes and edges) of the books onto a text stream,
+    either as a single Cytoscape JSON object ({"layout": ..., "elements":
+    [...]}) or, when json_lines is set, as that object without its elements
+    on the first line followed by the elements in batches (a JSON array per
+    line).
+    Levels of detail:
+     - "sentence": every paragraph and sentence is a node,
+     - "paragraph": sentences are left out (counted by their paragraph),
+     - "chapter": paragraphs are collapsed into their chapter (a cluster node
+       counting its paragraphs and sentences, linked to its pages).
+    Attributes
+    ----------
+    node_count, edge_count: int
+        The number of elements written so far
+    """
+
+    def __init__(
+        self,
+        stream,
+        level_of_detail="sentence",
+        json_lines=False,
+        batch_size=1000,
+        label_length=40,
+    ):
+        if level_of_detail not in LEVELS_OF_DETAIL:
+            raise ValueError("Unknown level of detail: " + str(level_of_detail))
+        self.stream = stream
+        self.level_of_detail = level_of_detail
+        self.json_lines = json_lines
+        self.batch_size = batch_size
+        self.label_length = label_length
+        self.node_count = 0
+        self.edge_count = 0
+        self.__batch = []
+        self.__first_batch = True
+        self.__book_ids = set()
+        self.__started = False
+        # The state of the current book: its pages written so far and the
+        # layout cursor
+        self.__pages = set()
+        self.__x = 0
+        self.__y = 0
+
+    def __start(self):
+        header = {
+            "layout": {"name": "preset"},
+            "level_of_detail": self.level_of_detail,
+        }
+        if self.json_lines:
+            self.stream.write(json.dumps(header) + "\n")
+        else:
+            self.stream.write(json.dumps(header)[:-1] + ', "elements": [\n')
+        self.__started = True
+
+    def __write(self, element):
+        self.__batch.append(element)
+        if len(self.__batch) >= self.batch_size:
+            self.__flush()
+
+    def __flush(self):
+        if not self.__batch:
+            return
+        elements = _ENCODER.encode(self.__batch)
+        if self.json_lines:
+            self.stream.write(elements + "\n")
+        else:
+            if not self.__first_batch:
+                self.stream.write(",\n")
+            self.stream.write(elements[1:-1])
+        self.__first_batch = False
+        self.__batch = []
+
+    def __node(self, node_id, kind, parent=None, position=None, **data):
+        data["id"] = node_id
+        data["kind"] = kind
+        if parent is not None:
+            data["parent"] = parent
+        node = {"group": "nodes", "data": data, "classes": kind}
+        if position is not None:
+            node["position"] = {"x": position[0], "y": position[1]}
+        self.__write(node)
+        self.node_count += 1
+
+    def __edge(self, source, target, kind, **data):
+        data["id"] = source + "->" + target
+        data["source"] = source
+        data["target"] = target
+        data["kind"] = kind
+        self.__write({"group": "edges", "data": data, "classes": kind})
+        self.edge_count += 1
+
+    def add_book(self, book, chapters):
+        """
+        Write the elements of the chapters (e.g. out of build_chapters, or
+        of Diffing.read_json_lines_chapters) of a book, one at a time. The
+        book (e.g. Diffing.book_name) identifies its nodes: it must be unique.
+        """
+        if book in self.__book_ids:
+            raise ValueError("Duplicate book: " + str(book))
+        if not self.__started:
+            self.__start()
+        book_id = book
+        self.__node(book_id, "document", label=book)
+        self.__pages = set()
+        self.__x = len(self.__book_ids) * BOOK_WIDTH
+        self.__y = 0
+        for chapter_index, chapter in enumerate(chapters):
+            self.__add_chapter(book_id, chapter_index, chapter)
+        self.__book_ids.add(book_id)
+
+    def __page(self, book_id, reader_page_number):
+        # The page node (written on first reference, next to the referencing
+        # node)
+        page_id = book_id + "/page/" + str(reader_page_number)
+        if page_id not in self.__pages:
+            self.__pages.add(page_id)
+            self.__node(
+                page_id,
+                "page",
+                parent=book_id,
+                position=(self.__x, self.__y),
+                label=str(reader_page_number),
+            )
+        return page_id
+
+    def __add_chapter(self, book_id, chapter_index, chapter):
+        chapter_id = book_id + "/" + str(chapter_index)
+        chapter_x = self.__x + PAGE_COLUMN_WIDTH
+        if self.level_of_detail == "chapter":
+            self.__add_chapter_cluster(book_id, chapter_id, chapter_x, chapter)
+            return
+        self.__node(chapter_id, "chapter", parent=book_id, label=chapter.name)
+        for paragraph_index, paragraph in enumerate(chapter.paragraphs):
+            if self.level_of_detail == "sentence":
+                # A row per paragraph, followed by its rows of sentences
+                column = 0
+            else:
+                column = paragraph_index % PARAGRAPHS_PER_ROW
+                if paragraph_index > 0 and column == 0:
+                    self.__y += SPACING
+            paragraph_id = chapter_id + "/" + str(paragraph_index)
+            page_id = self.__page(book_id, paragraph.page_layout.reader_page_number)
+            self.__node(
+                paragraph_id,
+                "paragraph",
+                parent=chapter_id,
+                position=(chapter_x + column * SPACING, self.__y),
+                label=_label(paragraph.text, self.label_length),
+                positional_id=paragraph.positional_id,
+                reference=paragraph.page_layout.reference_text,
+                sentence_count=len(paragraph.sentences),
+            )
+            self.__edge(paragraph_id, page_id, "starts_on")
+            if self.level_of_detail == "sentence":
+                self.__add_sentences(book_id, chapter_id, paragraph_id, paragraph)
+        if self.level_of_detail == "paragraph":
+            self.__y += SPACING
+        self.__y += CHAPTER_GAP
+
+    def __add_sentences(self, book_id, chapter_id, paragraph_id, paragraph):
+        chapter_x = self.__x + PAGE_COLUMN_WIDTH
+        paragraph_page = paragraph.page_layout.reader_page_number
+        for sentence_index, sentence in enumerate(paragraph.sentences):
+            column = sentence_index % SENTENCES_PER_ROW
+            if sentence_index > 0 and column == 0:
+                self.__y += SPACING
+            sentence_id = paragraph_id + "/" + str(sentence_index)
+            self.__node(
+                sentence_id,
+                "sentence",
+                parent=chapter_id,
+                position=(chapter_x + (column + 1) * SPACING, self.__y),
+                label=_label(sentence.sentence, self.label_length),
+            )
+            self.__edge(paragraph_id, sentence_id, "contains")
+            reader_page_number = sentence.page_layout.reader_page_number
+            if reader_page_number != paragraph_page:
+                # Only the sentences continued on another page are linked
+                self.__edge(
+                    sentence_id, self.__page(book_id, reader_page_number), "on_page"
+                )
+        self.__y += SPACING
+
+    def __add_chapter_cluster(self, book_id, chapter_id, chapter_x, chapter):
+        # The paragraph count of each page the chapter paragraphs start on
+        page_weights = {}
+        sentence_count = 0
+        for paragraph in chapter.paragraphs:
+            reader_page_number = paragraph.page_layout.reader_page_number
+            page_weights[reader_page_number] = (
+                page_weights.get(reader_page_number, 0) + 1
+            )
+            sentence_count += len(paragraph.sentences)
+        self.__node(
+            chapter_id,
+            "chapter",
+            parent=book_id,
+            position=(chapter_x, self.__y),
+            label=chapter.name,
+            paragraph_count=len(chapter.paragraphs),
+            sentence_count=sentence_count,
+        )
+        for reader_page_number, weight in page_weights.items():
+            self.__edge(
+                chapter_id,
+                self.__page(book_id, reader_page_number),
+                "starts_on",
+                weight=weight,
+            )
+            self.__y += SPACING
+        self.__y += CHAPTER_GAP
+
+    def close(self):
+        """Write the remaining elements (and end the JSON object)"""
+        if not self.__started:
+            self.__start()
+        self.__flush()
+        if not self.json_lines:
+            self.stream.write("\n]}\n")
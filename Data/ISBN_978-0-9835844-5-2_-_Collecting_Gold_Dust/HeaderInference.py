@@ -0,0 +1,286 @@
+import re
+import sys
+import time
+import difflib
+
+PAGE_SLOT = "{page}"
+# The characters separating the parts of a header (e.g. "12 | BOOK TITLE")
+_SEPARATORS = re.compile(r"\s*[|•·–—-]+\s*")
+
+
+def first_line(text):
+    """The first non blank line of the text"""
+    return text.lstrip().split("\n", 1)[0].rstrip()
+
+
+def header_template(line, reader_page_number):
+    """
+    Return the template of a (first) line: its whitespace runs collapsed and
+    the standalone occurrences of the reader page number replaced by a slot.
+    A line made of the page number repeated (e.g. "xvixvi", an overprinted
+    page number extracted twice) is the page number alone.
+    """
+    normalized = " ".join(line.split())
+    if reader_page_number is None:
+        return normalized
+    page = re.escape(str(reader_page_number))
+    if re.fullmatch("(?:" + page + "){2,}", normalized):
+        return PAGE_SLOT
+    return re.sub(r"(?<!\w)" + page + r"(?!\w)", PAGE_SLOT, normalized)
+
+
+def template_fragments(template):
+    """The parts of the template, split on its slots and separators"""
+    return [
+        fragment
+        for part in template.split(PAGE_SLOT)
+        for fragment in _SEPARATORS.split(part)
+        if len(fragment) > 1
+    ]
+
+
+class InferredHeader:
+    """
+    The page header derived for a page.
+    Attributes
+    ----------
+    page_number: int
+        The (pdf) page number
+    line: str
+        The first line of the page text
+    kind: str
+        "template" when the first line follows a template recurring across
+        pages (or a template made of known fragments and of the page number),
+        "fragment" when it is a part of such a template or a known fragment
+        (e.g. the chapter name of a chapter starting page) and "none" when the
+        page is considered headless
+    template: str
+        The recurring template (or the fragment) the line follows, when any
+    support: int
+        The number of pages following the template (0 for the templates and
+        fragments only known out of the book structure)
+    confidence: float
+        The confidence (between 0 and 1) in the kind. For headless pages the
+        closer the first line is to a recurring template (i.e. a near miss),
+        the lower the confidence.
+    header: str
+        The regular expression matching the header at the beginning of the
+        page text (refer to Converter.remove_header), empty when headless
+    """
+
+    def __init__(self, page_number, line, kind, template, support, confidence):
+        self.page_number = page_number
+        self.line = line
+        self.kind = kind
+        self.template = template
+        self.support = support
+        self.confidence = confidence
+        self.header = "" if kind == "none" else re.escape(line.strip())
+
+
+class HeaderInferrer:
+    """
+    Infers the page headers of a book out of the first lines of its pages,
+    without any book specific rule: the first lines are turned into templates
+    (the page number of each page becoming a slot) and the templates shared
+    by at least min_support pages are considered headers. The first lines
+    that equal a part of such a template (e.g. a chapter name alone, as found
+    on chapter starting pages) are headers too.
+    Fragments can also be known beforehand (e.g. the chapter names of the
+    book structure): a first line equal to a known fragment is a header, and
+    so is a first line made of known (or recurring) fragments and of the page
+    number, even when it does not recur (e.g. the header of the only page of
+    a chapter following its starting page).
+    Pages whose inferred header has a confidence below review_threshold are
+    listed by the report for a human check.
+    """
+
+    # The confidence in a header only known out of the book structure: a
+    # known fragment, or a (non recurring) template made of fragments
+    KNOWN_FRAGMENT_CONFIDENCE = 0.9
+    COMPOSED_TEMPLATE_CONFIDENCE = 0.5
+
+    def __init__(self, min_support=2, review_threshold=0.6):
+        self.min_support = min_support
+        self.review_threshold = review_threshold
+        self.elapsed = 0.0
+
+    def infer(self, page_texts, reader_page_numbers, known_fragments=()):
+        """
+        Return the InferredHeader of every page, as a dictionary keyed by page
+        number, given the (original) text and the reader page number of every
+        page (two dictionaries keyed by page number), and the header fragments
+        known beforehand (e.g. the chapter names).
+        """
+        start = time.perf_counter()
+        lines = {}
+        templates = {}
+        pages_per_template = {}
+        for page_number, text in page_texts.items():
+            lines[page_number] = first_line(text)
+            template = header_template(
+                lines[page_number], reader_page_numbers.get(page_number)
+            )
+            templates[page_number] = template
+            if template:
+                pages_per_template.setdefault(template, []).append(page_number)
+        recurring = {
+            template: len(pages)
+            for template, pages in pages_per_template.items()
+            if len(pages) >= self.min_support
+        }
+        fragments = {}
+        for template, support in recurring.items():
+            for fragment in template_fragments(template):
+                fragments[fragment] = max(support, fragments.get(fragment, 0))
+        known = {" ".join(fragment.split()) for fragment in known_fragments}
+        known.discard("")
+
+        headers = {}
+        for page_number, template in templates.items():
+            line = lines[page_number]
+            if template in recurring:
+                support = recurring[template]
+                headers[page_number] = InferredHeader(
+                    page_number,
+                    line,
+                    "template",
+                    template,
+                    support,
+                    support / (support + 1),
+                )
+            elif template in fragments or template in known:
+                support = fragments.get(template, 0)
+                confidence = support / (support + 1)
+                if template in known:
+                    confidence = max(confidence, self.KNOWN_FRAGMENT_CONFIDENCE)
+                headers[page_number] = InferredHeader(
+                    page_number, line, "fragment", template, support, confidence
+                )
+            elif self.__is_composed(template, fragments, known):
+                headers[page_number] = InferredHeader(
+                    page_number,
+                    line,
+                    "template",
+                    template,
+                    0,
+                    self.COMPOSED_TEMPLATE_CONFIDENCE,
+                )
+            else:
+                closest, similarity = self.__closest_template(template, recurring)
+                headers[page_number] = InferredHeader(
+                    page_number, line, "none", closest, 0, 1.0 - similarity
+                )
+        self.elapsed = time.perf_counter() - start
+        return headers
+
+    @staticmethod
+    def __is_composed(template, fragments, known):
+        # Whether the template is made of the page number and of (at least one)
+        # known fragment, every other fragment being a recurring one
+        parts = template_fragments(template)
+        return (
+            PAGE_SLOT in template
+            and any(part in known for part in parts)
+            and all(part in known or part in fragments for part in parts)
+        )
+
+    @staticmethod
+    def __closest_template(template, recurring):
+        closest = None
+        best = 0.0
+        for candidate in recurring:
+            matcher = difflib.SequenceMatcher(None, template, candidate)
+            if matcher.quick_ratio() <= best:
+                continue
+            ratio = matcher.ratio()
+            if ratio > best:
+                closest, best = candidate, ratio
+        return closest, best
+
+    @staticmethod
+    def agrees(inferred, expected):
+        """
+        Whether the inferred header agrees with an expected (e.g. hand written)
+        header regular expression
+        """
+        if not expected:
+            return inferred.kind == "none"
+        if inferred.kind == "none":
+            return False
+        return re.fullmatch(expected, inferred.line.strip()) is not None
+
+    def print_report(self, headers, expected_headers=None, stream=sys.stderr):
+        """
+        Print the recurring templates, the pages to be reviewed and, when
+        expected headers are provided (a dictionary keyed by page number), the
+        agreement with them.
+        """
+        print(
+            "Inferred the headers of ",
+            len(headers),
+            " pages in ",
+            round(self.elapsed * 1000, 2),
+            " ms.",
+            file=stream,
+        )
+        supports = {}
+        for header in headers.values():
+            if header.kind != "none":
+                supports[(header.kind, header.template)] = header.support
+        for (kind, template), support in sorted(
+            supports.items(), key=lambda item: -item[1]
+        ):
+            print(
+                "   - ", kind, " (", support, " pages): ", repr(template), file=stream
+            )
+        to_review = [
+            header
+            for header in headers.values()
+            if header.confidence < self.review_threshold
+        ]
+        print(
+            "Pages to review (confidence below ",
+            self.review_threshold,
+            "):",
+            file=stream,
+        )
+        for header in sorted(to_review, key=lambda header: header.page_number):
+            print(
+                "   - page number ",
+                header.page_number,
+                " (",
+                header.kind,
+                ", confidence ",
+                round(header.confidence, 2),
+                "): ",
+                repr(header.line),
+                file=stream,
+            )
+        if expected_headers is None:
+            return
+        disagreements = [
+            page_number
+            for page_number, expected in sorted(expected_headers.items())
+            if page_number in headers
+            and not self.agrees(headers[page_number], expected)
+        ]
+        compared = len([page for page in expected_headers if page in headers])
+        print(
+            "Agreement with the expected headers: ",
+            compared - len(disagreements),
+            " / ",
+            compared,
+            " pages.",
+            file=stream,
+        )
+        for page_number in disagreements:
+            print(
+                "   - page number ",
+                page_number,
+                ": expected ",
+                repr(expected_headers[page_number]),
+                ", inferred ",
+                repr(headers[page_number].header),
+                file=stream,
+            )
@@ -1,3 +1,19 @@
+import re
+import bisect
+import hashlib
+
+_WHITESPACES = re.compile(r"\s+")
+
+
+def content_hash(text):
+    """
+    A stable (across runs and machines) hash of the text, insensitive to the
+    whitespaces (the layout mode leftovers) around and between its words
+    """
+    normalized = _WHITESPACES.sub(" ", text).strip()
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+
+
 class Document:
     """
     A list of Chapters.
@@ -5,9 +21,111 @@ class Document:
 
     def __init__(self):
         self.chapters = []
+        self.__page_index = None
 
     def add_chapter(self, new_chapter):
         self.chapters.append(new_chapter)
+        self.__page_index = None  # Rebuilt on next lookup
+
+    def page_index(self):
+        if self.__page_index is None:
+            self.__page_index = PageIndex(self)
+        return self.__page_index
+
+    def paragraphs_on_page(self, page_number=None, reader_page_number=None):
+        """
+        Return the paragraphs (in document order) with some text on the page
+        designated either by its (pdf) page number or by its reader page
+        number (e.g. 87, "xiv" or "Cover").
+        """
+        return self.page_index().paragraphs(
+            self.__page_number(page_number, reader_page_number)
+        )
+
+    def sentences_on_page(self, page_number=None, reader_page_number=None):
+        """Return the (paragraph, sentence) pairs of the sentences on the page"""
+        return self.page_index().sentences(
+            self.__page_number(page_number, reader_page_number)
+        )
+
+    def __page_number(self, page_number, reader_page_number):
+        if page_number is not None:
+            return page_number
+        return self.page_index().page_number_of(reader_page_number)
+
+
+class PageIndex:
+    """
+    Random access, by page, to the paragraphs and sentences of a Document.
+    The paragraphs are numbered in document order, and sorted arrays of their
+    first and last (pdf) page numbers allow for a page lookup by bisection.
+    Paragraphs continued on a later page (refer to
+    Converter.reconstitute_pages_ending_sentence) belong to every page in
+    between. Note that this is why the last pages are not sorted (a paragraph
+    continued over an illustration page ends after the illustration
+    paragraphs): the running maximum of the last pages is used instead.
+    """
+
+    def __init__(self, document):
+        self.paragraph_list = []
+        self.first_pages = []
+        self.last_pages_running_maximum = []
+        # The number of the first sentence of each paragraph in document order
+        self.first_sentences = []
+        # Reader page number (as a string) -> pdf page number
+        self.reader_pages = {}
+        sentence_count = 0
+        running_maximum = -1
+        for chapter in document.chapters:
+            for page in chapter.pages:
+                self.reader_pages[str(page.page_layout.reader_page_number)] = (
+                    page.page_number
+                )
+            for paragraph in chapter.paragraphs:
+                if paragraph.page_number is None:
+                    continue  # Not produced by a Converter: no page known
+                running_maximum = max(running_maximum, paragraph.last_page_number)
+                self.paragraph_list.append(paragraph)
+                self.first_pages.append(paragraph.page_number)
+                self.last_pages_running_maximum.append(running_maximum)
+                self.first_sentences.append(sentence_count)
+                sentence_count += len(paragraph.sentences)
+        self.sentence_count = sentence_count
+
+    def page_number_of(self, reader_page_number):
+        return self.reader_pages.get(str(reader_page_number))
+
+    def paragraph_range(self, page_number):
+        """
+        Return the range of the numbers of the paragraphs that may hold text
+        of the page: those starting on the page or before, and not (all)
+        ending before it.
+        """
+        if page_number is None:
+            return range(0)
+        low = bisect.bisect_left(self.last_pages_running_maximum, page_number)
+        high = bisect.bisect_right(self.first_pages, page_number)
+        return range(low, high)
+
+    def paragraphs(self, page_number):
+        return [
+            self.paragraph_list[number]
+            for number in self.paragraph_range(page_number)
+            if self.paragraph_list[number].last_page_number >= page_number
+        ]
+
+    def sentences(self, page_number):
+        return [
+            (paragraph, sentence)
+            for paragraph in self.paragraphs(page_number)
+            for sentence in paragraph.sentences
+            if sentence.page_number == page_number
+        ]
+
+    def sentence_range(self, paragraph_number):
+        """The numbers (in document order) of the sentences of the paragraph"""
+        first = self.first_sentences[paragraph_number]
+        return range(first, first + len(self.paragraph_list[paragraph_number].sentences))
 
 
 class Chapter:
@@ -25,27 +143,116 @@ class Chapter:
         self.pages.append(page)
 
     def add_paragraph(self, new_paragraph):
+        new_paragraph.set_positional_id(
+            str(self.name) + "/" + str(len(self.paragraphs))
+        )
         self.paragraphs.append(new_paragraph)
 
 
 class Paragraph:
     """
     A list of sentences.
+    Attributes
+    ----------
+    positional_id: str
+        The chapter name and the index of the paragraph within the chapter
+        (e.g. "Foreword/3"), set when added to a chapter. Unlike the content
+        hash, it stays the same when the text of the paragraph gets fixed.
+    offset_map: Provenance.OffsetMap
+        When provenance is tracked, maps the offsets of the paragraph text to
+        the original texts of the pages
     """
 
     def __init__(self, layout):
         self.sentences = list()
         self.page_layout = layout
+        # The pdf page numbers of the pages the paragraph starts and ends on
+        # (they differ for paragraphs continued on a later page)
+        self.page_number = None
+        self.last_page_number = None
+        self.positional_id = None
+        self.offset_map = None
+
+    def source_ranges(self):
+        """
+        The character ranges (Provenance.SourceRange list) of the original
+        page texts the paragraph comes from (empty when not tracked)
+        """
+        if self.offset_map is None:
+            return []
+        return self.offset_map.source_ranges()
+
+    @property
+    def content_hash(self):
+        return content_hash(self.text)
 
     def add_sentence(self, sentence):
+        if self.positional_id is not None:
+            sentence.positional_id = (
+                self.positional_id + "/" + str(len(self.sentences))
+            )
         self.sentences.append(sentence)
 
+    def set_positional_id(self, positional_id):
+        # The sentences are numbered within the paragraph
+        self.positional_id = positional_id
+        for sentence_index, sentence in enumerate(self.sentences):
+            sentence.positional_id = positional_id + "/" + str(sentence_index)
+
+    def set_page_numbers(self, page_number, last_page_number):
+        self.page_number = page_number
+        self.last_page_number = last_page_number
+
 
 class Sentence:
     """
     A sentence _has_ a Layout (a page identifier for the reader to retrieve it)
     """
 
-    def __init__(self, text, reader_page_number):
+    def __init__(self, text, reader_page_number, page_number=None):
         self.sentence = text
         self.page_layout = PageLayout(reader_page_number)
+        # The pdf page number of the page holding the sentence start
+        self.page_number = page_number
+        # The positional id of the paragraph followed by the sentence index
+        # (refer to Paragraph.positional_id)
+        self.positional_id = None
+        # When provenance is tracked, the offset map of the paragraph together
+        # with the offsets of the sentence within the paragraph text
+        self.__offset_map = None
+        self.__span = None
+
+    def set_source(self, paragraph_offset_map, start, end):
+        self.__offset_map = paragraph_offset_map
+        self.__span = (start, end)
+
+    def source_ranges(self):
+        """Refer to Paragraph.source_ranges"""
+        if self.__offset_map is None:
+            return []
+        return self.__offset_map.source_ranges(*self.__span)
+
+    @property
+    def content_hash(self):
+        return content_hash(self.sentence)
+
+
+class PageLayout:
+    """
+    reader_page_number: str
+        The page number as it appears to a human reader on the printed (or
+        rendered by a pdf viewer) page. Note that, some pages might have roman
+        numbering, some pages an integerand some pages may have no numbering
+        at all (e.g. the cover or back-cover or some illustrative pages).
+    """
+
+    def __init__(self, reader_page_number):
+        self.reader_page_number = reader_page_number
+        self._reference_text = None
+
+    @property
+    def reference_text(self):
+        return self._reference_text
+
+    def set_reference_text(self, value):
+        self._reference_text = value
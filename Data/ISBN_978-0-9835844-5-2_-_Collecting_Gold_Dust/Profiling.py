@@ -0,0 +1,163 @@
+import os
+import sys
+import pstats
+import cProfile
+
+PROJECT_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+CATEGORIES = ("pypdf", "nltk", "re", "project", "other")
+
+
+def function_category(function):
+    """
+    Return the category (one of CATEGORIES) of a pstats function key, i.e. a
+    (filename, line number, function name) tuple. Built-in functions have
+    "~" as filename: regular expressions are recognized by their name.
+    """
+    filename, _, name = function
+    path = filename.replace("\\", "/")
+    if "/pypdf/" in path:
+        return "pypdf"
+    if "/nltk/" in path:
+        return "nltk"
+    if (
+        "/re/" in path
+        or path.endswith(("/re.py", "/sre_compile.py", "/sre_parse.py"))
+        or (filename == "~" and ("re.Pattern" in name or "_sre." in name))
+    ):
+        return "re"
+    if filename == "~":
+        # Note: os.path.abspath would resolve "~" against the current directory
+        return "other"
+    if "/site-packages/" not in path and os.path.abspath(filename).startswith(
+        PROJECT_DIRECTORY + os.sep
+    ):
+        return "project"
+    return "other"
+
+
+def function_label(function):
+    filename, line, name = function
+    if filename == "~":
+        return name
+    return os.path.basename(filename) + ":" + str(line) + "(" + name + ")"
+
+
+def collapsed_stacks(stats, max_depth=64, min_microseconds=1):
+    """
+    Return the flamegraph compatible collapsed stacks ("root;...;leaf
+    microseconds" lines) of the pstats.Stats. cProfile only records caller to
+    callee edges, and listing every caller path grows combinatorially with
+    shared (or recursive) callees. Hence the approximation: each function is
+    drawn once, with all its own time, under the first stack reaching it
+    (callees being explored by decreasing cumulative time of their edge, so
+    mostly under their heaviest caller). There is at most one line per
+    function, and the own times sum up to the profiled time. The functions
+    left unreached (below max_depth, or within caller cycles) start their own
+    stacks. Lines below min_microseconds are dropped.
+    """
+    callees = {}
+    roots = []
+    for function, (_, _, _, _, callers) in stats.stats.items():
+        if not callers:
+            roots.append(function)
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((edge[3], function))
+    for function_callees in callees.values():
+        function_callees.sort(key=lambda callee: -callee[0])
+
+    lines = []
+    visited = set()
+
+    def walk(function, stack):
+        visited.add(function)
+        stack = stack + [function]
+        own_time = stats.stats[function][2]
+        if round(own_time * 1e6) >= max(1, min_microseconds):
+            lines.append(
+                ";".join(function_label(frame) for frame in stack)
+                + " "
+                + str(round(own_time * 1e6))
+            )
+        if len(stack) >= max_depth:
+            return
+        for _, callee in callees.get(function, []):
+            if callee not in visited:
+                walk(callee, stack)
+
+    for root in roots:
+        walk(root, [])
+    for function in stats.stats:
+        if function not in visited:
+            walk(function, [])
+    return sorted(lines)
+
+
+class StageProfiler:
+    """
+    Profiles the stages of a run separately (with cProfile). For each stage,
+    writes to the directory a <stage>.pstats file (refer to the pstats module
+    or snakeviz) and a <stage>.collapsed file (refer to flamegraph.pl or
+    speedscope), then prints its hottest functions per category.
+    Note that the work done by other processes (e.g. the extraction workers)
+    is not profiled.
+    """
+
+    def __init__(self, directory, top=10):
+        self.directory = directory
+        self.top = top
+        os.makedirs(directory, exist_ok=True)
+
+    def run(self, stage, function, *arguments, **keyword_arguments):
+        """Return function(*arguments, **keyword_arguments), profiled"""
+        profile = cProfile.Profile()
+        try:
+            return profile.runcall(function, *arguments, **keyword_arguments)
+        finally:
+            self.save(stage, profile)
+
+    def save(self, stage, profile):
+        base_filename = os.path.join(self.directory, stage)
+        profile.dump_stats(base_filename + ".pstats")
+        stats = pstats.Stats(profile)
+        with open(base_filename + ".collapsed", "w", encoding="utf-8") as output:
+            for line in collapsed_stacks(stats):
+                output.write(line + "\n")
+        self.print_report(stage, stats)
+
+    def print_report(self, stage, stats, stream=sys.stderr):
+        print("Profile of ", stage, ": ", round(stats.total_tt, 3), " s", file=stream)
+        print(
+            "   (",
+            os.path.join(self.directory, stage + ".{pstats,collapsed}"),
+            ")",
+            file=stream,
+        )
+        per_category = {category: [] for category in CATEGORIES}
+        for function, (_, calls, own_time, cumulative_time, _) in stats.stats.items():
+            per_category[function_category(function)].append(
+                (own_time, cumulative_time, calls, function)
+            )
+        for category in CATEGORIES:
+            functions = sorted(per_category[category], reverse=True)
+            if not functions:
+                continue
+            print(
+                "   - ",
+                category,
+                ": ",
+                round(sum(function[0] for function in functions), 3),
+                " s (own time)",
+                file=stream,
+            )
+            for own_time, cumulative_time, calls, function in functions[: self.top]:
+                print(
+                    "      ",
+                    round(own_time, 4),
+                    " s own, ",
+                    round(cumulative_time, 4),
+                    " s cumulative, ",
+                    calls,
+                    " calls: ",
+                    function_label(function),
+                    file=stream,
+                )
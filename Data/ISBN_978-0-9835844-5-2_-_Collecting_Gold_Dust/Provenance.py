@@ -0,0 +1,230 @@
+"""
+Provenance of the converted texts: offset maps from the characters of a text
+rewritten by the conversion stages (header removal, illumination fix, newline
+sanitization, paragraph continuation...) back to the characters of the
+original (layout mode) texts of the pdf pages, for a sentence or a paragraph
+to be located within its page (e.g. to be highlighted) without extracting
+the page again.
+"""
+import re
+import bisect
+
+
+class SourceRange:
+    """A range of characters of the original text of a page"""
+
+    __slots__ = ("page_number", "start", "end")
+
+    def __init__(self, page_number, start, end):
+        self.page_number = page_number
+        self.start = start
+        self.end = end
+
+    def __eq__(self, other):
+        return (self.page_number, self.start, self.end) == (
+            other.page_number,
+            other.start,
+            other.end,
+        )
+
+    def __repr__(self):
+        return "SourceRange(%r, %d, %d)" % (self.page_number, self.start, self.end)
+
+    def to_list(self):
+        return [self.page_number, self.start, self.end]
+
+
+class OffsetMap:
+    """
+    Maps the offsets of a text to the original page texts it comes from, as
+    runs of characters (in text order): the run starting at starts[i] of
+    lengths[i] characters comes from the source_lengths[i] characters
+    starting at source_starts[i] within the original text of page
+    page_numbers[i]. When both lengths are equal, the run is a copy (each
+    character maps to a character). Otherwise it replaced its source (each
+    character maps to the whole source run). Lookups bisect the runs.
+    """
+
+    __slots__ = (
+        "starts",
+        "lengths",
+        "page_numbers",
+        "source_starts",
+        "source_lengths",
+        "length",
+    )
+
+    def __init__(self):
+        self.starts = []
+        self.lengths = []
+        self.page_numbers = []
+        self.source_starts = []
+        self.source_lengths = []
+        self.length = 0
+
+    @classmethod
+    def identity(cls, page_number, length):
+        """The map of the original text (of length characters) of a page"""
+        offset_map = cls()
+        offset_map.append_run(length, page_number, 0, length)
+        return offset_map
+
+    def __len__(self):
+        return self.length
+
+    def append_run(self, length, page_number, source_start, source_length):
+        if length == 0:
+            return
+        if self.starts:
+            last = len(self.starts) - 1
+            if (
+                self.lengths[last] == self.source_lengths[last]
+                and length == source_length
+                and self.page_numbers[last] == page_number
+                and self.source_starts[last] + self.source_lengths[last]
+                == source_start
+            ):
+                # Contiguous copies make a single run
+                self.lengths[last] += length
+                self.source_lengths[last] += source_length
+                self.length += length
+                return
+        self.starts.append(self.length)
+        self.lengths.append(length)
+        self.page_numbers.append(page_number)
+        self.source_starts.append(source_start)
+        self.source_lengths.append(source_length)
+        self.length += length
+
+    def __runs(self, start, end):
+        # The (run index, clipped start, clipped end) of the runs within range
+        index = max(0, bisect.bisect_right(self.starts, start) - 1)
+        while index < len(self.starts) and self.starts[index] < end:
+            run_start = self.starts[index]
+            run_end = run_start + self.lengths[index]
+            if run_end > start:
+                yield index, max(start, run_start), min(end, run_end)
+            index += 1
+
+    def extend(self, other, start=0, end=None):
+        """Append the runs of other mapping its text[start:end]"""
+        if end is None:
+            end = other.length
+        for index, clipped_start, clipped_end in other.__runs(start, end):
+            length = clipped_end - clipped_start
+            if other.lengths[index] == other.source_lengths[index]:
+                source_start = (
+                    other.source_starts[index] + clipped_start - other.starts[index]
+                )
+                self.append_run(
+                    length, other.page_numbers[index], source_start, length
+                )
+            else:
+                self.append_run(
+                    length,
+                    other.page_numbers[index],
+                    other.source_starts[index],
+                    other.source_lengths[index],
+                )
+
+    def slice(self, start, end=None):
+        """The map of text[start:end]"""
+        offset_map = OffsetMap()
+        offset_map.extend(self, start, end)
+        return offset_map
+
+    def concatenate(self, other):
+        """The map of the text followed by the text of other"""
+        offset_map = self.slice(0)
+        offset_map.extend(other)
+        return offset_map
+
+    def source_ranges(self, start=0, end=None):
+        """
+        Return the SourceRange list (one per page, or per non contiguous part
+        of a page) that text[start:end] comes from
+        """
+        if end is None:
+            end = self.length
+        ranges = []
+        for index, clipped_start, clipped_end in self.__runs(start, end):
+            page_number = self.page_numbers[index]
+            if self.lengths[index] == self.source_lengths[index]:
+                source_start = (
+                    self.source_starts[index] + clipped_start - self.starts[index]
+                )
+                source_end = source_start + clipped_end - clipped_start
+            else:
+                source_start = self.source_starts[index]
+                source_end = source_start + self.source_lengths[index]
+            last = ranges[-1] if ranges else None
+            if (
+                last is not None
+                and last.page_number == page_number
+                and source_start <= last.end
+            ):
+                last.end = max(last.end, source_end)
+            else:
+                ranges.append(SourceRange(page_number, source_start, source_end))
+        return ranges
+
+    def source_position(self, offset):
+        """The (page number, offset) of the source of text[offset], or of the
+        end of the source of the text before offset when offset is the end"""
+        if offset < self.length:
+            source_range = self.source_ranges(offset, offset + 1)[0]
+            return source_range.page_number, source_range.start
+        if self.length == 0:
+            return None, 0
+        source_range = self.source_ranges(self.length - 1, self.length)[0]
+        return source_range.page_number, source_range.end
+
+
+def sub(pattern, replacement, text, offset_map):
+    """
+    re.sub(pattern, replacement, text) together with the offset map of the
+    result (given the offset map of text). The characters of a replacement
+    map to the source of the matched text.
+    """
+    parts = []
+    result_map = OffsetMap()
+    position = 0
+    for match in re.finditer(pattern, text):
+        parts.append(text[position : match.start()])
+        result_map.extend(offset_map, position, match.start())
+        replaced = match.expand(replacement)
+        parts.append(replaced)
+        if replaced:
+            ranges = offset_map.source_ranges(match.start(), match.end())
+            if ranges:
+                # Note: a match over several pages maps to the first one
+                result_map.append_run(
+                    len(replaced),
+                    ranges[0].page_number,
+                    ranges[0].start,
+                    ranges[0].end - ranges[0].start,
+                )
+            else:
+                page_number, source_start = offset_map.source_position(
+                    match.start()
+                )
+                result_map.append_run(len(replaced), page_number, source_start, 0)
+        position = match.end()
+    parts.append(text[position:])
+    result_map.extend(offset_map, position)
+    return "".join(parts), result_map
+
+
+def lstrip(text, offset_map):
+    """text.lstrip() together with its offset map"""
+    stripped = text.lstrip()
+    return stripped, offset_map.slice(len(text) - len(stripped))
+
+
+def prepend(prefix, offset_map):
+    """The offset map of prefix + text (the prefix maps to the text start)"""
+    page_number, source_start = offset_map.source_position(0)
+    result_map = OffsetMap()
+    result_map.append_run(len(prefix), page_number, source_start, 0)
+    result_map.extend(offset_map)
+    return result_map
@@ -0,0 +1,284 @@
+import os
+import json
+import time
+import difflib
+import tracemalloc
+import pypdf
+
+
+def document_snapshot(chapters):
+    """
+    Return the (JSON serializable) snapshot of the paragraphs and sentences
+    of the chapters, together with the version of pypdf that extracted them
+    (other versions may lay the text out differently).
+    """
+    return {
+        "pypdf_version": pypdf.__version__,
+        "chapters": [
+            {
+                "name": chapter.name,
+                "paragraphs": [
+                    {
+                        "reference": paragraph.page_layout.reference_text,
+                        "text": paragraph.text,
+                        "sentences": [
+                            sentence.sentence for sentence in paragraph.sentences
+                        ],
+                    }
+                    for paragraph in chapter.paragraphs
+                ],
+            }
+            for chapter in chapters
+        ],
+    }
+
+
+def _paragraph_diff(golden, current):
+    lines = []
+    if golden["reference"] != current["reference"]:
+        lines.append("      reference: " + golden["reference"])
+        lines.append("              -> " + current["reference"])
+    for line in difflib.unified_diff(
+        golden["sentences"] or [golden["text"]],
+        current["sentences"] or [current["text"]],
+        n=0,
+        lineterm="",
+    ):
+        if line[:3] not in ("---", "+++", "@@ "):
+            lines.append("      " + line)
+    if len(lines) == 0:
+        # Only the whitespaces (that sentences do not hold) differ
+        lines.append("      - " + repr(golden["text"]))
+        lines.append("      + " + repr(current["text"]))
+    return lines
+
+
+def snapshot_diff(golden, current):
+    """
+    Return the human readable lines describing the differences between two
+    snapshots, paragraph per paragraph: removed (-), added (+) and modified
+    (~, followed by the sentences that differ) paragraphs. No line means no
+    difference.
+    """
+    lines = []
+    golden_chapters = [chapter["name"] for chapter in golden["chapters"]]
+    current_chapters = [chapter["name"] for chapter in current["chapters"]]
+    if golden_chapters != current_chapters:
+        lines.append("Chapters: " + repr(golden_chapters))
+        lines.append("      -> " + repr(current_chapters))
+    for golden_chapter, current_chapter in zip(
+        golden["chapters"], current["chapters"]
+    ):
+        golden_paragraphs = golden_chapter["paragraphs"]
+        current_paragraphs = current_chapter["paragraphs"]
+        matcher = difflib.SequenceMatcher(
+            None,
+            [paragraph["text"] for paragraph in golden_paragraphs],
+            [paragraph["text"] for paragraph in current_paragraphs],
+            autojunk=False,
+        )
+        chapter_lines = []
+        for operation, start, end, other_start, other_end in matcher.get_opcodes():
+            if operation == "equal":
+                continue
+            pairs = min(end - start, other_end - other_start)
+            if operation == "replace":
+                for offset in range(pairs):
+                    chapter_lines.append(
+                        "   ~ " + golden_paragraphs[start + offset]["reference"]
+                    )
+                    chapter_lines.extend(
+                        _paragraph_diff(
+                            golden_paragraphs[start + offset],
+                            current_paragraphs[other_start + offset],
+                        )
+                    )
+            else:
+                pairs = 0
+            for paragraph in golden_paragraphs[start + pairs : end]:
+                chapter_lines.append("   - " + paragraph["reference"])
+                chapter_lines.append("      " + repr(paragraph["text"]))
+            for paragraph in current_paragraphs[other_start + pairs : other_end]:
+                chapter_lines.append("   + " + paragraph["reference"])
+                chapter_lines.append("      " + repr(paragraph["text"]))
+        if chapter_lines:
+            lines.append("Chapter " + repr(golden_chapter["name"]) + ":")
+            lines.extend(chapter_lines)
+    return lines
+
+
+class Measurement:
+    """
+    The cost of a conversion.
+    Attributes
+    ----------
+    wall_time: float
+        The duration (in seconds) of the converter construction and of the
+        chapters building
+    peak_memory: int
+        The peak of the memory (in bytes) allocated by python along the
+        conversion (as traced by tracemalloc, in a distinct conversion in
+        order for the tracing not to slow down the timed one)
+    stage_timings: dict
+        The duration of each stage (refer to Converter.stage_timings)
+    """
+
+    def __init__(self, wall_time, peak_memory, stage_timings):
+        self.wall_time = wall_time
+        self.peak_memory = peak_memory
+        self.stage_timings = stage_timings
+
+    def to_budget(self, headroom, minimal_time=0.05):
+        """
+        The budget allowing for headroom times the measurement (with a floor
+        for the times, too short times being mostly noise)
+        """
+        return {
+            "wall_time": max(minimal_time, self.wall_time * headroom),
+            "peak_memory": int(self.peak_memory * headroom),
+            "stages": {
+                stage: max(minimal_time, timing * headroom)
+                for stage, timing in self.stage_timings.items()
+            },
+        }
+
+    def over_budget(self, budget):
+        """Return the lines describing what exceeds the budget"""
+        lines = []
+        measured = [
+            ("wall time (s)", self.wall_time, budget["wall_time"]),
+            ("peak memory (bytes)", self.peak_memory, budget["peak_memory"]),
+        ] + [
+            ("stage " + stage + " (s)", timing, budget["stages"].get(stage))
+            for stage, timing in self.stage_timings.items()
+        ]
+        for label, value, limit in measured:
+            if limit is not None and value > limit:
+                lines.append(
+                    "   "
+                    + label
+                    + ": "
+                    + str(round(value, 4))
+                    + " over budget "
+                    + str(round(limit, 4))
+                )
+        return lines
+
+
+class RegressionCase:
+    """
+    A conversion whose result is compared with a golden snapshot and whose
+    cost is compared with a budget.
+    Attributes
+    ----------
+    name: str
+    make_converter: callable
+        Returns the (fresh) Converter to run
+    """
+
+    def __init__(self, name, make_converter):
+        self.name = name
+        self.make_converter = make_converter
+
+    def convert(self):
+        start = time.perf_counter()
+        converter = self.make_converter()
+        chapters = converter.build_chapters()
+        return converter, chapters, time.perf_counter() - start
+
+    def run(self):
+        """Return the snapshot of the conversion and its Measurement"""
+        converter, chapters, wall_time = self.convert()
+        tracemalloc.start()
+        try:
+            self.convert()
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        measurement = Measurement(
+            wall_time, peak_memory, dict(converter.stage_timings)
+        )
+        return document_snapshot(chapters), measurement
+
+
+class RegressionHarness:
+    """
+    Runs regression cases against the golden snapshots (one JSON file per
+    case within golden_directory) and the budgets (a single JSON file, keyed
+    by case name). Cases with no golden snapshot fail, and cases with no
+    budget only get reported as such, until recorded.
+    """
+
+    def __init__(self, golden_directory, budgets_filename):
+        self.golden_directory = golden_directory
+        self.budgets_filename = budgets_filename
+        self.budgets = {}
+        if os.path.exists(budgets_filename):
+            with open(budgets_filename, encoding="utf-8") as budgets:
+                self.budgets = json.load(budgets)
+
+    def __golden_filename(self, case):
+        return os.path.join(self.golden_directory, case.name + ".json")
+
+    def run(self, cases, update_golden=False, record_budgets=False, headroom=2.0):
+        """Run the cases and return whether they all passed"""
+        passed = True
+        for case in cases:
+            snapshot, measurement = case.run()
+            print(
+                "Case ",
+                case.name,
+                ": ",
+                round(measurement.wall_time, 3),
+                " s, ",
+                round(measurement.peak_memory / 1e6, 2),
+                " MB peak, stages ",
+                {
+                    stage: round(timing, 4)
+                    for stage, timing in measurement.stage_timings.items()
+                },
+            )
+            passed = self.__check_golden(case, snapshot, update_golden) and passed
+            if record_budgets:
+                self.budgets[case.name] = measurement.to_budget(headroom)
+                print("   budget recorded")
+            elif case.name not in self.budgets:
+                print("   no budget recorded")
+            else:
+                over_budget = measurement.over_budget(self.budgets[case.name])
+                for line in over_budget:
+                    print(line)
+                passed = passed and not over_budget
+        if record_budgets:
+            with open(self.budgets_filename, "w", encoding="utf-8") as budgets:
+                json.dump(self.budgets, budgets, indent=1, sort_keys=True)
+        print("All cases passed." if passed else "Some cases failed.")
+        return passed
+
+    def __check_golden(self, case, snapshot, update_golden):
+        filename = self.__golden_filename(case)
+        if update_golden:
+            os.makedirs(self.golden_directory, exist_ok=True)
+            with open(filename, "w", encoding="utf-8") as golden:
+                json.dump(snapshot, golden, ensure_ascii=False, indent=1)
+            print("   golden snapshot written to ", filename)
+            return True
+        if not os.path.exists(filename):
+            # A snapshot is only (re)written on explicit request: a missing
+            # one must not pass silently
+            print("   no golden snapshot ", filename, " (refer to --update-golden)")
+            return False
+        with open(filename, encoding="utf-8") as golden:
+            golden_snapshot = json.load(golden)
+        if golden_snapshot["pypdf_version"] != snapshot["pypdf_version"]:
+            print(
+                "   warning: golden snapshot made with pypdf ",
+                golden_snapshot["pypdf_version"],
+                " (now ",
+                snapshot["pypdf_version"],
+                ")",
+            )
+        lines = snapshot_diff(golden_snapshot, snapshot)
+        for line in lines:
+            print(line)
+        return not lines
@@ -0,0 +1,293 @@
+import os
+import re
+import sys
+import array
+import pickle
+import hashlib
+from collections import OrderedDict
+
+
+class Segmenter:
+    """
+    Interface of the sentence segmenters used by the Converter to break a
+    paragraph into sentences. A segmenter returns the sentences as (start,
+    end) character offsets within the segmented text, the whitespaces that
+    separate sentences belonging to no sentence.
+    Attributes
+    ----------
+    name: str
+        The identifier of the segmenter (engine)
+    version: str
+        Changes whenever the segmentation produced for a given text may change
+    """
+
+    name = None
+    version = None
+
+    def span_tokenize(self, text):
+        raise NotImplementedError
+
+    def tokenize(self, text):
+        return [text[start:end] for start, end in self.span_tokenize(text)]
+
+    def identity(self):
+        """Identifies the segmentation that this segmenter produces"""
+        return self.name + ":" + self.version
+
+
+class PunktSegmenter(Segmenter):
+    """
+    The nltk Punkt sentence tokenizer. Note that nltk (whose import is
+    costly) and its tokenizer data are only loaded on first segmentation: the
+    identity only reads the installed nltk version, for cached segmentations
+    (refer to CachedSegmenter) not to load them at all.
+    """
+
+    name = "punkt"
+
+    def __init__(self, language="english"):
+        self.language = language
+        self.version = None
+        self.__tokenizer = None
+
+    def __get_tokenizer(self):
+        if self.__tokenizer is None:
+            import nltk
+
+            # Refer to
+            # https://stackoverflow.com/questions/78862426/unable-to-use-nltk-functions
+            nltk.download("punkt_tab")
+            self.__tokenizer = nltk.tokenize.PunktTokenizer(self.language)
+        return self.__tokenizer
+
+    def span_tokenize(self, text):
+        return list(self.__get_tokenizer().span_tokenize(text))
+
+    def identity(self):
+        if self.version is None:
+            from importlib.metadata import version
+
+            self.version = version("nltk") + "-" + self.language
+        return Segmenter.identity(self)
+
+
+class RegexSegmenter(Segmenter):
+    """
+    A rule based sentence segmenter relying on a single compiled regular
+    expression. A sentence ends with a terminal punctuation (possibly followed
+    by closing quotes or parentheses) and some whitespace, provided that the
+    next sentence starts with an uppercase letter or a digit, and that the
+    word before the full stop is not a known abbreviation (nor an initial).
+    Attributes
+    ----------
+    abbreviations: set
+        The words (without their full stop) that do not end a sentence when
+        followed by a full stop
+    """
+
+    name = "regex"
+    version = "2"
+
+    # English abbreviations together with those encountered in the Dhamma
+    # books (e.g. "Ven. U Tejaniya"). The Burmese and Pali honorifics
+    # ("Sayadaw", "U", "Daw"...) are not written with a full stop: a full stop
+    # after them ends a sentence.
+    DEFAULT_ABBREVIATIONS = (
+        "Mr",
+        "Mrs",
+        "Ms",
+        "Dr",
+        "Prof",
+        "St",
+        "Jr",
+        "Sr",
+        "vs",
+        "cf",
+        "e.g",
+        "i.e",
+        "Fig",
+        "Vol",
+        "p",
+        "pp",
+        "ch",
+        "Ven",
+        "Skt",
+    )
+
+    # A candidate boundary: terminal punctuation, closing quotes/parentheses,
+    # whitespace. The next sentence start is checked afterwards.
+    __candidate = re.compile(r"[.!?…]+[\"'”’)\]]*(\s+)")
+    __opening = "\"'“‘(["
+
+    def __init__(self, abbreviations=DEFAULT_ABBREVIATIONS):
+        self.abbreviations = set(abbreviations)
+
+    def identity(self):
+        # The abbreviations are configurable: they are part of the identity
+        abbreviations = "\0".join(sorted(self.abbreviations)).encode("utf-8")
+        return (
+            Segmenter.identity(self)
+            + ":"
+            + hashlib.blake2b(abbreviations, digest_size=8).hexdigest()
+        )
+
+    def __is_abbreviation(self, text, sentence_start, punctuation_start):
+        word_start = (
+            max(
+                sentence_start - 1,
+                text.rfind(" ", sentence_start, punctuation_start),
+                text.rfind("\n", sentence_start, punctuation_start),
+            )
+            + 1
+        )
+        word = text[word_start:punctuation_start].lstrip(self.__opening)
+        if word in self.abbreviations:
+            return True
+        # An initial (as in "J. Smith"), the pronoun "I" aside
+        return len(word) == 1 and word.isupper() and word != "I"
+
+    def span_tokenize(self, text):
+        spans = []
+        end_of_text = len(text.rstrip())
+        start = len(text) - len(text.lstrip())
+        for match in self.__candidate.finditer(text, start):
+            next_start = match.end()
+            if next_start >= end_of_text:
+                break
+            next_character = text[next_start]
+            if next_character in self.__opening and next_start + 1 < end_of_text:
+                next_character = text[next_start + 1]
+            if not (next_character.isupper() or next_character.isdigit()):
+                continue
+            if text[match.start()] == "." and self.__is_abbreviation(
+                text, start, match.start()
+            ):
+                continue
+            spans.append((start, match.start(1)))
+            start = next_start
+        if start < end_of_text:
+            spans.append((start, end_of_text))
+        return spans
+
+
+class SegmentationCache:
+    """
+    On disk cache of segmentation results that survives across conversions.
+    An entry is keyed by the hash of the segmenter identity together with the
+    segmented text, and holds the flat array of the sentence offsets (start0,
+    end0, start1, end1...) rather than copies of the sentences. The least
+    recently used entries are evicted beyond max_entries.
+    Attributes
+    ----------
+    filename: str
+        The file the cache is loaded from and saved to
+    max_entries: int
+        The maximum number of cached segmentations
+    hits, misses: int
+        Counters of the lookups that were (or not) found in the cache
+    """
+
+    def __init__(self, filename, max_entries=200000):
+        self.filename = filename
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.__entries = OrderedDict()
+        if os.path.exists(filename):
+            try:
+                with open(filename, "rb") as cache_file:
+                    self.__entries = pickle.load(cache_file)
+            except Exception as exception:
+                print(
+                    "Ignoring unreadable segmentation cache ", filename, file=sys.stderr
+                )
+                print("   ", repr(exception), file=sys.stderr)
+
+    def __len__(self):
+        return len(self.__entries)
+
+    @staticmethod
+    def key(identity, text):
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(identity.encode("utf-8"))
+        hasher.update(b"\0")
+        hasher.update(text.encode("utf-8"))
+        return hasher.digest()
+
+    def get(self, key):
+        """Return the list of (start, end) spans, or None when not cached"""
+        offsets = self.__entries.get(key)
+        if offsets is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.__entries.move_to_end(key)
+        offsets = array.array("I", offsets)
+        return list(zip(offsets[0::2], offsets[1::2]))
+
+    def put(self, key, spans):
+        offsets = array.array("I")
+        for start, end in spans:
+            offsets.append(start)
+            offsets.append(end)
+        self.__entries[key] = offsets.tobytes()
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.max_entries:
+            self.__entries.popitem(last=False)
+
+    def save(self):
+        directory = os.path.dirname(self.filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Write then rename, for an interrupted run not to corrupt the cache
+        temporary_filename = self.filename + ".tmp"
+        with open(temporary_filename, "wb") as cache_file:
+            pickle.dump(self.__entries, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_filename, self.filename)
+
+    def print_statistics(self, stream=sys.stderr):
+        lookups = max(1, self.hits + self.misses)
+        print(
+            "Segmentation cache: ",
+            self.hits,
+            " hits, ",
+            self.misses,
+            " misses (",
+            round(100 * self.hits / lookups, 2),
+            "% hit rate), ",
+            len(self),
+            " entries.",
+            file=stream,
+        )
+
+
+class CachedSegmenter(Segmenter):
+    """
+    Wraps a segmenter in order for its results to be looked up in (and stored
+    to) a SegmentationCache before doing any segmentation work.
+    """
+
+    def __init__(self, segmenter, cache):
+        self.segmenter = segmenter
+        self.cache = cache
+        self.name = segmenter.name
+        self.__identity = None
+
+    def identity(self):
+        return self.segmenter.identity()
+
+    def span_tokenize(self, text):
+        if self.__identity is None:
+            self.__identity = self.segmenter.identity()
+        key = self.cache.key(self.__identity, text)
+        spans = self.cache.get(key)
+        if spans is None:
+            spans = self.segmenter.span_tokenize(text)
+            self.cache.put(key, spans)
+        return spans
+
+
+SEGMENTERS = {
+    PunktSegmenter.name: PunktSegmenter,
+    RegexSegmenter.name: RegexSegmenter,
+}
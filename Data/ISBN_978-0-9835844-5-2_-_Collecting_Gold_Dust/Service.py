@@ -0,0 +1,297 @@
+import gzip
+import json
+import time
+import threading
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+from Diffing import book_name
+
+
+class BadRequest(Exception):
+    """A query missing (or with an invalid) parameter"""
+
+
+class LRUCache:
+    """
+    A (thread safe) least recently used cache with hit and miss counters.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        with self.__lock:
+            if key in self.__entries:
+                self.hits += 1
+                self.__entries.move_to_end(key)
+                return self.__entries[key]
+            self.misses += 1
+        # Computed outside of the lock: two threads may compute the same value
+        # concurrently, which is harmless (and rare)
+        value = compute()
+        with self.__lock:
+            self.__entries[key] = value
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.max_entries:
+                self.__entries.popitem(last=False)
+        return value
+
+
+class ConvertedBook:
+    """
+    A book converted to the JSON lines format (refer to
+    Writers.JsonLinesWriter). At load time the lines are only grouped by
+    chapter (and indexed) without being decoded: a chapter gets decoded on
+    first access (and kept in the chapters cache).
+    Attributes
+    ----------
+    name: str
+        The book name, derived from the file name (refer to Diffing.book_name)
+    """
+
+    def __init__(self, filename, chapters_cache):
+        self.name = book_name(filename)
+        self.chapters_cache = chapters_cache
+        self.__chapter_lines = []  # For each chapter the list of its raw lines
+        # reader page number (as a string) -> list of chapter indexes
+        self.__page_chapters = {}
+        # paragraph reference (that is a page reference, shared by the
+        # paragraphs starting on that page) -> list of (chapter index,
+        # paragraph index)
+        self.__references = {}
+        # positional id (when written) -> (chapter index, paragraph index)
+        self.__positional_ids = {}
+        opener = gzip.open if filename.endswith(".gz") else open
+        with opener(filename, "rb") as lines:
+            for line in lines:
+                if not line.strip():
+                    continue
+                # Only the few leading keys are needed for indexing: a full
+                # decoding is nevertheless the simplest (and a one off cost)
+                paragraph = json.loads(line)
+                chapter_index = paragraph["chapter_index"]
+                while len(self.__chapter_lines) <= chapter_index:
+                    self.__chapter_lines.append([])
+                self.__chapter_lines[chapter_index].append(line)
+                page = str(paragraph["reader_page_number"])
+                chapters = self.__page_chapters.setdefault(page, [])
+                if chapter_index not in chapters:
+                    chapters.append(chapter_index)
+                position = (chapter_index, paragraph["paragraph_index"])
+                self.__references.setdefault(paragraph["reference"], []).append(
+                    position
+                )
+                if paragraph.get("positional_id") is not None:
+                    self.__positional_ids[paragraph["positional_id"]] = position
+
+    def chapter(self, chapter_index):
+        return self.chapters_cache.get_or_compute(
+            (self.name, chapter_index),
+            lambda: [json.loads(line) for line in self.__chapter_lines[chapter_index]],
+        )
+
+    def chapter_count(self):
+        return len(self.__chapter_lines)
+
+    def paragraphs_on_page(self, reader_page_number):
+        return [
+            paragraph
+            for chapter_index in self.__page_chapters.get(str(reader_page_number), [])
+            for paragraph in self.chapter(chapter_index)
+            if str(paragraph["reader_page_number"]) == str(reader_page_number)
+        ]
+
+    def paragraph(self, chapter_index, paragraph_index):
+        """Return the paragraph, or None when there is no such paragraph"""
+        if not 0 <= chapter_index < self.chapter_count():
+            return None
+        chapter = self.chapter(chapter_index)
+        if not 0 <= paragraph_index < len(chapter):
+            return None
+        return chapter[paragraph_index]
+
+    def paragraph_of_positional_id(self, positional_id):
+        if positional_id not in self.__positional_ids:
+            return None
+        return self.paragraph(*self.__positional_ids[positional_id])
+
+    def paragraphs_of_reference(self, reference):
+        """Return every paragraph (in order) starting on the referenced page"""
+        return [
+            self.paragraph(chapter_index, paragraph_index)
+            for chapter_index, paragraph_index in self.__references.get(reference, [])
+        ]
+
+    def search(self, query, limit):
+        query = query.lower()
+        found = []
+        for chapter_index in range(self.chapter_count()):
+            for paragraph in self.chapter(chapter_index):
+                if query in paragraph["text"].lower():
+                    found.append(paragraph)
+                    if len(found) >= limit:
+                        return found
+        return found
+
+
+class LatencyMetrics:
+    """Per endpoint request counts and latencies (in milliseconds)"""
+
+    def __init__(self, max_samples=10000):
+        self.max_samples = max_samples
+        self.__samples = {}
+        self.__counts = {}
+        self.__lock = threading.Lock()
+
+    def record(self, endpoint, duration):
+        with self.__lock:
+            self.__counts[endpoint] = self.__counts.get(endpoint, 0) + 1
+            samples = self.__samples.setdefault(endpoint, [])
+            samples.append(duration * 1000)
+            if len(samples) > self.max_samples:
+                del samples[: len(samples) - self.max_samples]
+
+    def summary(self):
+        with self.__lock:
+            summary = {}
+            for endpoint, samples in self.__samples.items():
+                ordered = sorted(samples)
+                summary[endpoint] = {
+                    "count": self.__counts[endpoint],
+                    "mean_ms": sum(ordered) / len(ordered),
+                    "p50_ms": ordered[len(ordered) // 2],
+                    "p99_ms": ordered[min(len(ordered) - 1, len(ordered) * 99 // 100)],
+                }
+            return summary
+
+
+class LookupService:
+    """
+    Read-only lookup of the paragraphs (and sentences) of converted books by
+    reader page number, by paragraph reference (as built by
+    Converter.break_chapter_into_paragraphs, every paragraph starting on the
+    referenced page being returned), by position (positional id, or chapter
+    and paragraph indexes) or by text search.
+    """
+
+    def __init__(self, filenames, cached_chapters=256):
+        self.chapters_cache = LRUCache(cached_chapters)
+        self.metrics = LatencyMetrics()
+        self.books = {}
+        for filename in filenames:
+            book = ConvertedBook(filename, self.chapters_cache)
+            if book.name in self.books:
+                raise ValueError(
+                    "Two converted books are named " + repr(book.name) + ": rename one"
+                )
+            self.books[book.name] = book
+
+    def __book(self, parameters):
+        name = parameters.get("book")
+        if name is None and len(self.books) == 1:
+            return next(iter(self.books.values()))
+        if name not in self.books:
+            raise LookupError("Unknown book: " + repr(name))
+        return self.books[name]
+
+    @staticmethod
+    def __parameter(parameters, name, convert=str):
+        if name not in parameters:
+            raise BadRequest("Missing parameter: " + name)
+        try:
+            return convert(parameters[name])
+        except ValueError:
+            raise BadRequest("Invalid parameter: " + name) from None
+
+    def __paragraph(self, parameters):
+        # The paragraph identified by its positional id, or by its chapter and
+        # paragraph indexes
+        book = self.__book(parameters)
+        if "id" in parameters:
+            paragraph = book.paragraph_of_positional_id(parameters["id"])
+        else:
+            paragraph = book.paragraph(
+                self.__parameter(parameters, "chapter", int),
+                self.__parameter(parameters, "paragraph", int),
+            )
+        if paragraph is None:
+            raise LookupError("Unknown paragraph")
+        return paragraph
+
+    def handle(self, endpoint, parameters):
+        """Return the (JSON serializable) answer to the query"""
+        if endpoint == "/books":
+            return sorted(self.books)
+        if endpoint == "/page":
+            return self.__book(parameters).paragraphs_on_page(
+                self.__parameter(parameters, "page")
+            )
+        if endpoint == "/paragraph":
+            if "reference" in parameters:
+                if "sentence" in parameters:
+                    raise BadRequest(
+                        "A reference identifies a page: use id (or chapter and "
+                        "paragraph) to select a sentence"
+                    )
+                paragraphs = self.__book(parameters).paragraphs_of_reference(
+                    parameters["reference"]
+                )
+                if not paragraphs:
+                    raise LookupError("Unknown reference: " + parameters["reference"])
+                return paragraphs
+            paragraph = self.__paragraph(parameters)
+            if "sentence" in parameters:
+                return paragraph["sentences"][
+                    self.__parameter(parameters, "sentence", int)
+                ]
+            return paragraph
+        if endpoint == "/search":
+            return self.__book(parameters).search(
+                self.__parameter(parameters, "q"),
+                self.__parameter(parameters, "limit", int)
+                if "limit" in parameters
+                else 20,
+            )
+        if endpoint == "/metrics":
+            return {
+                "requests": self.metrics.summary(),
+                "chapters_cache": {
+                    "hits": self.chapters_cache.hits,
+                    "misses": self.chapters_cache.misses,
+                },
+            }
+        raise LookupError("Unknown endpoint: " + endpoint)
+
+    def make_server(self, host="127.0.0.1", port=8765):
+        service = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                start = time.perf_counter()
+                url = urlsplit(self.path)
+                parameters = {
+                    key: values[0] for key, values in parse_qs(url.query).items()
+                }
+                try:
+                    status, answer = 200, service.handle(url.path, parameters)
+                except BadRequest as exception:
+                    status, answer = 400, {"error": str(exception)}
+                except LookupError as exception:
+                    status, answer = 404, {"error": str(exception)}
+                body = json.dumps(answer, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                service.metrics.record(url.path, time.perf_counter() - start)
+
+            def log_message(self, format, *args):
+                pass  # Refer to the /metrics endpoint instead
+
+        return ThreadingHTTPServer((host, port), RequestHandler)
@@ -0,0 +1,126 @@
+"""
+Hand-off of the extracted page texts from the extraction worker processes to
+the parent process through shared memory instead of pickling: the workers
+append the UTF-8 encoded texts to shared memory arenas, and only send the
+location (arena name, offset, length) of each text. The parent keeps these
+locations within an offset table and only decodes a text when the page gets
+processed. The arenas are released as soon as none of their texts is needed.
+"""
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+ARENA_SIZE = 1024 * 1024
+
+
+def start_tracking():
+    """
+    To be called by the parent before starting the workers: the arenas they
+    create are then tracked by the resource tracker of the parent, which
+    unlinks the arenas left over (e.g. by a killed worker) when the parent
+    exits, instead of unlinking them when the worker exits.
+    """
+    resource_tracker.ensure_running()
+
+
+class SharedTextWriter:
+    """
+    The worker side: appends texts to the arenas it creates. The arenas are
+    owned (and eventually unlinked) by the parent process.
+    """
+
+    def __init__(self, arena_size=ARENA_SIZE):
+        self.arena_size = arena_size
+        self.__arena = None
+        self.__offset = 0
+        self.__arenas = []
+
+    def write(self, text):
+        """Return the location (arena name, offset, length) of the text"""
+        data = text.encode("utf-8")
+        if self.__arena is None or self.__offset + len(data) > self.__arena.size:
+            self.__arena = SharedMemory(
+                create=True, size=max(self.arena_size, len(data), 1)
+            )
+            self.__arenas.append(self.__arena)
+            self.__offset = 0
+        offset = self.__offset
+        self.__arena.buf[offset : offset + len(data)] = data
+        self.__offset += len(data)
+        return self.__arena.name, offset, len(data)
+
+    def close(self):
+        for arena in self.__arenas:
+            arena.close()
+        self.__arenas = []
+        self.__arena = None
+
+
+class SharedTextStore:
+    """
+    The parent side: the offset table of the texts (keyed e.g. by page number)
+    written by the workers. Arenas are attached on first decoding and
+    unlinked once all their texts were released.
+    Attributes
+    ----------
+    shared_bytes: int
+        The size of the texts handed-off so far
+    """
+
+    def __init__(self):
+        self.__locations = {}  # key -> (arena name, offset, length)
+        self.__arenas = {}  # arena name -> attached SharedMemory (or None)
+        self.__arena_keys = {}  # arena name -> keys of its unreleased texts
+        self.shared_bytes = 0
+
+    def add(self, key, location):
+        arena_name, _, length = location
+        self.__locations[key] = location
+        self.__arenas.setdefault(arena_name, None)
+        self.__arena_keys.setdefault(arena_name, set()).add(key)
+        self.shared_bytes += length
+
+    def __contains__(self, key):
+        return key in self.__locations
+
+    def __len__(self):
+        return len(self.__locations)
+
+    def arena_count(self):
+        return len(self.__arenas)
+
+    def __arena(self, arena_name):
+        arena = self.__arenas[arena_name]
+        if arena is None:
+            arena = SharedMemory(name=arena_name)
+            self.__arenas[arena_name] = arena
+        return arena
+
+    def text(self, key):
+        arena_name, offset, length = self.__locations[key]
+        arena = self.__arena(arena_name)
+        return bytes(arena.buf[offset : offset + length]).decode("utf-8")
+
+    def release(self, keys):
+        """Forget the texts of the keys, unlinking the arenas left unused"""
+        for key in keys:
+            location = self.__locations.pop(key, None)
+            if location is None:
+                continue
+            arena_name = location[0]
+            arena_keys = self.__arena_keys[arena_name]
+            arena_keys.discard(key)
+            if not arena_keys:
+                self.__unlink(arena_name)
+
+    def __unlink(self, arena_name):
+        # Attaching is required for unlinking (and unregistering) the arena
+        arena = self.__arena(arena_name)
+        arena.close()
+        arena.unlink()
+        del self.__arenas[arena_name]
+        del self.__arena_keys[arena_name]
+
+    def close(self):
+        for arena_name in list(self.__arenas):
+            self.__unlink(arena_name)
+        self.__locations = {}
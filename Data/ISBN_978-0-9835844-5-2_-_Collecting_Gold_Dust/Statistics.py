@@ -0,0 +1,279 @@
+"""
+Streaming statistics (vocabulary, term and bigram frequencies, per chapter
+term counts) over the chapters of converted books. Each paragraph is
+tokenized once, and the terms are mapped to vocabulary ids whose counts are
+accumulated within numpy arrays. Partial statistics (e.g. of books converted
+in parallel) can be merged, and saved to (or loaded from) a compressed .npz
+file.
+"""
+import re
+import json
+import numpy
+
+_TERM = re.compile(r"[^\W\d_]+")
+# The letters with diacritics of the romanized Pali
+_PALI_LETTERS = re.compile("[āīūṃṁṅñṭḍṇḷ]")
+# Pali terms commonly romanized without diacritics (as tokenized: lower case)
+PALI_TERMS = frozenset(
+    (
+        "abhidhamma anatta anicca arahant arahants avijja bhante bhikkhu "
+        "bhikkhus bhikkhuni buddho citta dhamma dhammas dukkha jhana jhanas "
+        "kamma khandha khandhas kilesa kilesas magga metta nibbana panna "
+        "parami paramis patimokkha samadhi samatha sangha sankhara sankharas "
+        "sanna sati sila sutta suttas tanha vedana vinaya vinnana vipassana"
+    ).split()
+)
+# Bigrams are packed within 64 bits: the first term id within the upper half
+_HALF = numpy.uint64(32)
+_LOWER_HALF = numpy.uint64((1 << 32) - 1)
+
+
+def tokenize(text):
+    return _TERM.findall(text.lower())
+
+
+def is_pali_term(term, pali_terms=PALI_TERMS):
+    """
+    Whether the (tokenized) term is Pali: either spelled with diacritics or
+    one of the pali_terms (e.g. PALI_TERMS together with read_pali_terms)
+    """
+    return term in pali_terms or _PALI_LETTERS.search(term) is not None
+
+
+def read_pali_terms(filename):
+    """Return the terms (one per line, lower cased) of a Pali term list"""
+    with open(filename, encoding="utf-8") as lines:
+        return frozenset(line.strip().lower() for line in lines if line.strip())
+
+
+def _add_counts(keys, counts, other_keys, other_counts):
+    # The sorted union of the keys, with the counts of common keys summed
+    all_keys = numpy.concatenate((keys, other_keys))
+    all_counts = numpy.concatenate((counts, other_counts))
+    keys, inverse = numpy.unique(all_keys, return_inverse=True)
+    return keys, numpy.bincount(inverse, weights=all_counts).astype(numpy.int64)
+
+
+class ChapterCounts:
+    """The term counts of a chapter (as sorted term ids and their counts)"""
+
+    def __init__(self, book, name, term_ids, counts):
+        self.book = book
+        self.name = name
+        self.term_ids = term_ids
+        self.counts = counts
+
+    @property
+    def token_count(self):
+        return int(self.counts.sum())
+
+
+class CorpusStatistics:
+    """
+    The statistics accumulated over chapters (of any number of books), one
+    chapter at a time. The memory grows with the size of the vocabulary, the
+    number of distinct bigrams and the number of chapters, not with the size
+    of the corpus: the bigrams of the chapters are buffered (up to
+    bigram_buffer_size) before being counted.
+    Attributes
+    ----------
+    terms: list
+        The vocabulary: the term of each id
+    term_counts: numpy.ndarray
+        The number of occurrences of each term id
+    bigram_keys, bigram_counts: numpy.ndarray
+        The (sorted) bigrams, as packed term ids (refer to bigram), and their
+        number of occurrences
+    chapters: list
+        The ChapterCounts of every chapter
+    """
+
+    def __init__(self, bigram_buffer_size=1 << 20):
+        self.bigram_buffer_size = bigram_buffer_size
+        self.terms = []
+        self.__term_ids = {}
+        self.term_counts = numpy.zeros(0, dtype=numpy.int64)
+        self.bigram_keys = numpy.zeros(0, dtype=numpy.uint64)
+        self.bigram_counts = numpy.zeros(0, dtype=numpy.int64)
+        self.chapters = []
+        self.__pending_bigrams = []
+        self.__pending_bigram_count = 0
+
+    def term_id(self, term):
+        term_id = self.__term_ids.setdefault(term, len(self.terms))
+        if term_id == len(self.terms):
+            self.terms.append(term)
+        return term_id
+
+    @staticmethod
+    def bigram(first_id, second_id):
+        return (numpy.uint64(first_id) << _HALF) | numpy.uint64(second_id)
+
+    def __ids(self, terms):
+        return numpy.fromiter(
+            (self.term_id(term) for term in terms),
+            dtype=numpy.uint64,
+            count=len(terms),
+        )
+
+    def add_chapter(self, book, chapter):
+        """Accumulate the statistics of the paragraphs of the chapter"""
+        chapter_ids = []
+        for paragraph in chapter.paragraphs:
+            ids = self.__ids(tokenize(paragraph.text))
+            if len(ids) > 1:
+                # Bigrams do not span over paragraphs
+                self.__pending_bigrams.append((ids[:-1] << _HALF) | ids[1:])
+                self.__pending_bigram_count += len(ids) - 1
+            chapter_ids.append(ids)
+        ids = (
+            numpy.concatenate(chapter_ids)
+            if chapter_ids
+            else numpy.zeros(0, dtype=numpy.uint64)
+        )
+        term_ids, counts = numpy.unique(ids, return_counts=True)
+        self.chapters.append(
+            ChapterCounts(book, chapter.name, term_ids, counts.astype(numpy.int64))
+        )
+        self.__add_term_counts(term_ids, counts)
+        if self.__pending_bigram_count >= self.bigram_buffer_size:
+            self.flush()
+
+    def add_document(self, book, chapters):
+        """Accumulate the statistics of chapters (e.g. out of build_chapters)"""
+        for chapter in chapters:
+            self.add_chapter(book, chapter)
+        self.flush()
+
+    def __add_term_counts(self, term_ids, counts):
+        if len(self.term_counts) < len(self.terms):
+            size = max(len(self.terms), 2 * len(self.term_counts))
+            grown = numpy.zeros(size, dtype=numpy.int64)
+            grown[: len(self.term_counts)] = self.term_counts
+            self.term_counts = grown
+        numpy.add.at(self.term_counts, term_ids.astype(numpy.intp), counts)
+
+    def flush(self):
+        """Count the buffered bigrams"""
+        if not self.__pending_bigrams:
+            return
+        keys, counts = numpy.unique(
+            numpy.concatenate(self.__pending_bigrams), return_counts=True
+        )
+        self.bigram_keys, self.bigram_counts = _add_counts(
+            self.bigram_keys, self.bigram_counts, keys, counts
+        )
+        self.__pending_bigrams = []
+        self.__pending_bigram_count = 0
+
+    def merge(self, other):
+        """Add the statistics of other (whose term ids differ from ours)"""
+        self.flush()
+        other.flush()
+        mapping = numpy.fromiter(
+            (self.term_id(term) for term in other.terms),
+            dtype=numpy.uint64,
+            count=len(other.terms),
+        )
+        self.__add_term_counts(mapping, other.counts_of_terms())
+        first_ids = mapping[(other.bigram_keys >> _HALF).astype(numpy.intp)]
+        second_ids = mapping[(other.bigram_keys & _LOWER_HALF).astype(numpy.intp)]
+        keys = (first_ids << _HALF) | second_ids
+        self.bigram_keys, self.bigram_counts = _add_counts(
+            self.bigram_keys, self.bigram_counts, keys, other.bigram_counts
+        )
+        for chapter in other.chapters:
+            term_ids = mapping[chapter.term_ids.astype(numpy.intp)]
+            order = numpy.argsort(term_ids)
+            self.chapters.append(
+                ChapterCounts(
+                    chapter.book, chapter.name, term_ids[order], chapter.counts[order]
+                )
+            )
+
+    def counts_of_terms(self):
+        """The number of occurrences of each term id (one per term)"""
+        return self.term_counts[: len(self.terms)]
+
+    def top_terms(self, count=20, pali_only=False, pali_terms=PALI_TERMS):
+        """
+        Return the (term, occurrences) of the most frequent terms (only the
+        Pali ones, refer to is_pali_term, when pali_only is set)
+        """
+        counts = self.counts_of_terms()
+        if pali_only:
+            term_ids = numpy.array(
+                [
+                    term_id
+                    for term_id, term in enumerate(self.terms)
+                    if is_pali_term(term, pali_terms)
+                ],
+                dtype=numpy.intp,
+            )
+        else:
+            term_ids = numpy.arange(len(self.terms))
+        top = term_ids[numpy.argsort(-counts[term_ids], kind="stable")[:count]]
+        return [(self.terms[term_id], int(counts[term_id])) for term_id in top]
+
+    def top_bigrams(self, count=20):
+        self.flush()
+        top = numpy.argsort(-self.bigram_counts, kind="stable")[:count]
+        return [
+            (
+                self.terms[int(self.bigram_keys[index] >> _HALF)],
+                self.terms[int(self.bigram_keys[index] & _LOWER_HALF)],
+                int(self.bigram_counts[index]),
+            )
+            for index in top
+        ]
+
+    def token_count(self):
+        return int(self.counts_of_terms().sum())
+
+    def save(self, filename):
+        """Save the statistics to a compressed numpy (.npz) file"""
+        self.flush()
+        offsets = numpy.cumsum(
+            [0] + [len(chapter.term_ids) for chapter in self.chapters]
+        )
+        numpy.savez_compressed(
+            filename,
+            terms=numpy.array(self.terms, dtype=str),
+            term_counts=self.counts_of_terms(),
+            bigram_keys=self.bigram_keys,
+            bigram_counts=self.bigram_counts,
+            chapters=numpy.array(
+                json.dumps(
+                    [[chapter.book, chapter.name] for chapter in self.chapters],
+                    ensure_ascii=False,
+                )
+            ),
+            chapter_offsets=offsets,
+            chapter_term_ids=numpy.concatenate(
+                [chapter.term_ids for chapter in self.chapters]
+                + [numpy.zeros(0, dtype=numpy.uint64)]
+            ),
+            chapter_counts=numpy.concatenate(
+                [chapter.counts for chapter in self.chapters]
+                + [numpy.zeros(0, dtype=numpy.int64)]
+            ),
+        )
+
+    @classmethod
+    def load(cls, filename):
+        statistics = cls()
+        with numpy.load(filename) as arrays:
+            for term in arrays["terms"]:
+                statistics.term_id(str(term))
+            statistics.term_counts = arrays["term_counts"].astype(numpy.int64)
+            statistics.bigram_keys = arrays["bigram_keys"]
+            statistics.bigram_counts = arrays["bigram_counts"]
+            offsets = arrays["chapter_offsets"]
+            term_ids = arrays["chapter_term_ids"]
+            counts = arrays["chapter_counts"]
+            for index, (book, name) in enumerate(json.loads(str(arrays["chapters"]))):
+                start, end = offsets[index], offsets[index + 1]
+                statistics.chapters.append(
+                    ChapterCounts(book, name, term_ids[start:end], counts[start:end])
+                )
+        return statistics
@@ -0,0 +1,90 @@
+import os
+import time
+import difflib
+import Structure
+
+
+class StructureWatcher:
+    """
+    Keeps a Converter (together with its pdf reader and its already extracted
+    page texts) warm and reconverts the book each time its structural
+    information (Structure.py) is modified. Only the post-extraction stages
+    (header removal, newlines sanitization, paragraph reconstitution...) are
+    run again, after which the paragraphs that changed are printed as a diff.
+    Attributes
+    ----------
+    converter: Converter
+        The converter whose structure gets reloaded
+    interval: float
+        The delay (in seconds) between two checks of the structure file
+    """
+
+    def __init__(self, converter, interval=0.2):
+        self.converter = converter
+        self.interval = interval
+        self.structure_filename = Structure.__file__
+        self.paragraphs = None  # None until a first conversion succeeds
+
+    @staticmethod
+    def paragraphs_of(chapters):
+        # One line per paragraph in order for the diff to be paragraph wise
+        return [
+            paragraph.page_layout.reference_text + " " + repr(paragraph.text)
+            for chapter in chapters
+            for paragraph in chapter.paragraphs
+        ]
+
+    def convert(self):
+        """
+        Rebuild the chapters and print the paragraphs that differ from the
+        previous conversion. Structural errors (the Converter exits on them
+        unless in fail-soft mode) are reported without leaving the watch loop.
+        """
+        start = time.perf_counter()
+        try:
+            chapters = self.converter.build_chapters()
+        except SystemExit:
+            print("Conversion aborted: fix the structure and save it again.")
+            return
+        if self.converter.diagnostics.fail_soft:
+            self.converter.diagnostics.print_report()
+        paragraphs = self.paragraphs_of(chapters)
+        changed = 0
+        if self.paragraphs is not None:
+            for line in difflib.unified_diff(
+                self.paragraphs, paragraphs, "previous", "current", n=0, lineterm=""
+            ):
+                print(line)
+                if line[:1] in "+-" and line[:3] not in ("+++", "---"):
+                    changed += 1
+        self.paragraphs = paragraphs
+        print(
+            "Converted ",
+            len(paragraphs),
+            " paragraphs (",
+            changed,
+            " changed lines) in ",
+            round(time.perf_counter() - start, 3),
+            " seconds.",
+        )
+
+    def run(self):
+        last_modification = os.stat(self.structure_filename).st_mtime_ns
+        self.convert()
+        print("Watching ", self.structure_filename, " (Ctrl-C to stop)")
+        try:
+            while True:
+                time.sleep(self.interval)
+                modification = os.stat(self.structure_filename).st_mtime_ns
+                if modification == last_modification:
+                    continue
+                last_modification = modification
+                try:
+                    self.converter.reload_structure()
+                except Exception as exception:
+                    # Typically a syntax error while the file is being edited
+                    print("Unable to reload the structure: ", repr(exception))
+                    continue
+                self.convert()
+        except KeyboardInterrupt:
+            print("Stopped watching.")
@@ -0,0 +1,155 @@
+import io
+import sys
+import gzip
+import json
+
+
+def open_output(filename=None, compress=False, buffer_size=1 << 20):
+    """
+    Return a text stream writing (utf-8) to filename, or to the standard
+    output when filename is None, through a large buffer and, when compress
+    is set, through gzip compression. Closing the stream flushes everything
+    (yet never closes the standard output).
+    """
+    if filename is None:
+        # Whatever was already printed must come first
+        sys.stdout.flush()
+        binary = open(sys.stdout.fileno(), "wb", buffering=0, closefd=False)
+        if compress:
+            binary = gzip.GzipFile(fileobj=binary, mode="wb")
+    elif compress:
+        binary = gzip.GzipFile(filename, "wb")
+    else:
+        binary = open(filename, "wb", buffering=0)
+    return io.TextIOWrapper(
+        io.BufferedWriter(binary, buffer_size), encoding="utf-8", newline="\n"
+    )
+
+
+class DocumentWriter:
+    """
+    Writes a Document onto a text stream, one chapter after the other.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write_document(self, document):
+        for chapter_index, chapter in enumerate(document.chapters):
+            self.write_chapter(chapter_index, chapter)
+
+    def write_chapter(self, chapter_index, chapter):
+        raise NotImplementedError
+
+
+class DebugWriter(DocumentWriter):
+    """
+    The historical (human readable) dump of main.py: the extracted pages of
+    every chapter followed by the paragraphs of every chapter.
+    """
+
+    def write_document(self, document):
+        for chapter in document.chapters:
+            self.write_chapter_header(chapter)
+            for page in chapter.pages:
+                print(
+                    "##########################################################",
+                    file=self.stream,
+                )
+                print(repr(page), file=self.stream)
+                print(
+                    "##########################################################",
+                    file=self.stream,
+                )
+
+        self.stream.write(
+            "##########################################################\n"
+            "##########################################################\n"
+            "#################### OTHER ###############################\n"
+            "##########################################################\n"
+            "##########################################################\n"
+        )
+        for chapter_index, chapter in enumerate(document.chapters):
+            self.write_chapter(chapter_index, chapter)
+
+    def write_chapter_header(self, chapter):
+        self.stream.write(
+            "###################################################################\n"
+        )
+        print("################## Chapter name: ", chapter.name, file=self.stream)
+        self.stream.write(
+            "###################################################################\n"
+        )
+
+    def write_chapter(self, chapter_index, chapter):
+        self.write_chapter_header(chapter)
+        for paragraph in chapter.paragraphs:
+            print(
+                "Paragraph (ref:",
+                paragraph.page_layout.reference_text,
+                "):\n",
+                paragraph.text,
+                "\n",
+                file=self.stream,
+            )
+
+
+class JsonLinesWriter(DocumentWriter):
+    """One JSON object per paragraph (and per line)"""
+
+    def write_chapter(self, chapter_index, chapter):
+        lines = []
+        for paragraph_index, paragraph in enumerate(chapter.paragraphs):
+            record = {
+                "chapter": chapter.name,
+                "chapter_index": chapter_index,
+                "paragraph_index": paragraph_index,
+                "reader_page_number": paragraph.page_layout.reader_page_number,
+                "reference": paragraph.page_layout.reference_text,
+                "positional_id": paragraph.positional_id,
+                "content_hash": paragraph.content_hash,
+                "text": paragraph.text,
+                "sentences": [sentence.sentence for sentence in paragraph.sentences],
+            }
+            if paragraph.offset_map is not None:
+                # The [pdf page number, start, end] ranges of the original
+                # page texts (when provenance is tracked)
+                record["source_ranges"] = [
+                    source_range.to_list()
+                    for source_range in paragraph.source_ranges()
+                ]
+                record["sentence_source_ranges"] = [
+                    [source_range.to_list() for source_range in sentence.source_ranges()]
+                    for sentence in paragraph.sentences
+                ]
+            lines.append(json.dumps(record, ensure_ascii=False))
+        if lines:
+            self.stream.write("\n".join(lines) + "\n")
+
+
+class MarkdownWriter(DocumentWriter):
+    """A level two title per chapter followed by its paragraphs"""
+
+    def write_chapter(self, chapter_index, chapter):
+        parts = ["## " + (chapter.name or "(untitled)") + "\n\n"]
+        for paragraph in chapter.paragraphs:
+            parts.append(paragraph.text.strip() + "\n\n")
+        self.stream.write("".join(parts))
+
+
+class TextWriter(DocumentWriter):
+    """The chapter name (underlined) followed by its paragraphs"""
+
+    def write_chapter(self, chapter_index, chapter):
+        parts = [chapter.name + "\n" + "=" * len(chapter.name) + "\n\n"]
+        for paragraph in chapter.paragraphs:
+            parts.append(paragraph.text.strip() + "\n\n")
+        self.stream.write("".join(parts))
+
+
+WRITERS = {
+    "debug": DebugWriter,
+    "jsonl": JsonLinesWriter,
+    "markdown": MarkdownWriter,
+    "text": TextWriter,
+}
@@ -0,0 +1,61 @@
+"""
+Measures the chunking throughput (refer to Chunking.py) on a large corpus made
+of many copies of the converted book. The copies are generated on the fly (the
+same chapters are chunked over and over) in order for the memory to remain
+flat.
+"""
+import argparse
+import time
+from Model import Document
+from Converter import Converter
+from Chunking import Chunker
+from Segmentation import RegexSegmenter
+
+
+def corpus_chapters(document, copies):
+    for _ in range(copies):
+        yield from document.chapters
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--copies", type=int, default=200)
+    parser.add_argument("--max-tokens", type=int, default=256)
+    parser.add_argument("--overlap-tokens", type=int, default=32)
+    arguments = parser.parse_args()
+
+    document = Document()
+    for chapter in Converter(segmenter=RegexSegmenter()).build_chapters():
+        document.add_chapter(chapter)
+
+    chunker = Chunker(arguments.max_tokens, arguments.overlap_tokens)
+    chunks = 0
+    tokens = 0
+    pages = 0
+    start = time.perf_counter()
+    for chunk in chunker.chunks(corpus_chapters(document, arguments.copies)):
+        chunks += 1
+        tokens += chunk.token_count
+        pages += len(chunk.page_layouts)
+    elapsed = time.perf_counter() - start
+    print(
+        "Chunked ",
+        arguments.copies,
+        " copies of the book into ",
+        chunks,
+        " chunks (",
+        round(tokens / max(1, chunks), 1),
+        " tokens and ",
+        round(pages / max(1, chunks), 2),
+        " pages per chunk) in ",
+        round(elapsed, 3),
+        " seconds: ",
+        round(chunks / elapsed),
+        " chunks/s, ",
+        round(tokens / elapsed),
+        " tokens/s.",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Compares the pages extraction backends on generated fixture books of growing
+sizes: serial (one page after the other, within this process), threads (refer
+to Extraction.ThreadedExtractor, with a reader pool reused across the runs of
+a book) and processes (refer to Extraction.WatchdogExtractor, with a time
+budget large enough never to be reached). The threads only extract in parallel
+on free-threaded python builds.
+"""
+import os
+import sys
+import time
+import argparse
+from pypdf import PdfReader
+from Extraction import (
+    ReaderPool,
+    ThreadedExtractor,
+    WatchdogExtractor,
+    extract_page_text,
+)
+from Fixtures import FixtureBook
+
+
+def extract_serially(pdf_filename, page_numbers):
+    reader = PdfReader(pdf_filename)
+    for page_number in page_numbers:
+        extract_page_text(reader.pages[page_number])
+
+
+def best_time(function, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--page-counts", type=int, nargs="+", default=[28, 112, 448]
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--fixtures-directory",
+        default=os.path.join("junk", "fixtures"),
+        help="Where the fixture pdf books get generated.",
+    )
+    arguments = parser.parse_args()
+
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(
+        "Python ",
+        sys.version.split()[0],
+        ", GIL ",
+        "enabled" if is_gil_enabled else "disabled",
+        ", ",
+        arguments.workers,
+        " workers",
+    )
+    reader_pool = ReaderPool(arguments.workers)
+    for page_count in arguments.page_counts:
+        book = FixtureBook(
+            os.path.join(
+                arguments.fixtures_directory, "fixture_" + str(page_count) + ".pdf"
+            ),
+            page_count=page_count,
+        )
+        page_numbers = list(range(page_count))
+        threads = ThreadedExtractor(
+            book.pdf_filename, workers=arguments.workers, reader_pool=reader_pool
+        )
+        processes = WatchdogExtractor(
+            book.pdf_filename, timeout=600, workers=arguments.workers
+        )
+        timings = {
+            "serial": best_time(
+                lambda: extract_serially(book.pdf_filename, page_numbers),
+                arguments.repeat,
+            ),
+            "threads": best_time(
+                lambda: threads.extract(page_numbers), arguments.repeat
+            ),
+            "processes": best_time(
+                lambda: processes.extract(page_numbers), arguments.repeat
+            ),
+        }
+        print(
+            page_count,
+            " pages: ",
+            ", ".join(
+                backend + " " + str(round(timing * 1000, 1)) + " ms"
+                for backend, timing in timings.items()
+            ),
+        )
+    print("Readers opened by the pool: ", reader_pool.opened_readers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Compares the layout mode extraction of the pages with the indented one (the
+plain mode with the indentation restored out of the text positions, refer to
+Extraction.extract_indented_text): the extraction time of every page in both
+modes, the pages falling back to layout mode and the differences that the
+extraction mode makes on the converted paragraphs. Runs on a generated fixture
+book and on the original book when present locally.
+"""
+import os
+import time
+import argparse
+from pypdf import PdfReader
+from Converter import Converter, PDF_FILENAME
+from Extraction import extract_indented_text, extract_page_text
+from Fixtures import FixtureBook
+from Regression import document_snapshot, snapshot_diff
+from Segmentation import RegexSegmenter
+
+
+def time_page_extractions(pdf_filename, repeat):
+    """
+    Return the (best of repeat) layout and indented extraction times of every
+    page together with the pages where the indented extraction fell back to
+    layout mode.
+    """
+    reader = PdfReader(pdf_filename)
+    layout_times = []
+    indented_times = []
+    fallback_pages = []
+    for page_number, page in enumerate(reader.pages):
+        # The first extraction also parses the page (fonts, content stream)
+        extract_page_text(page, "layout")
+        layout_time = indented_time = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            extract_page_text(page, "layout")
+            layout_time = min(layout_time, time.perf_counter() - start)
+            start = time.perf_counter()
+            _, _, extraction_mode = extract_indented_text(page)
+            indented_time = min(indented_time, time.perf_counter() - start)
+        layout_times.append(layout_time)
+        indented_times.append(indented_time)
+        if extraction_mode != "indented":
+            fallback_pages.append(page_number)
+    return layout_times, indented_times, fallback_pages
+
+
+def compare_conversions(make_converter):
+    """Return the lines describing how the indented extraction changes the
+    converted paragraphs (no line means no change)"""
+    snapshots = {}
+    for extraction_mode in ("layout", "indented"):
+        converter = make_converter(extraction_mode)
+        snapshots[extraction_mode] = document_snapshot(converter.build_chapters())
+    return snapshot_diff(snapshots["layout"], snapshots["indented"])
+
+
+def run_case(name, pdf_filename, make_converter, repeat):
+    layout_times, indented_times, fallback_pages = time_page_extractions(
+        pdf_filename, repeat
+    )
+    layout_total = sum(layout_times)
+    indented_total = sum(indented_times)
+    print(
+        "Case ",
+        name,
+        ": ",
+        len(layout_times),
+        " pages extracted in ",
+        round(layout_total * 1000, 1),
+        " ms (layout) vs ",
+        round(indented_total * 1000, 1),
+        " ms (indented), ",
+        round((1 - indented_total / layout_total) * 100, 1) if layout_total else 0,
+        " % saved",
+    )
+    print("   - pages falling back to layout mode: ", fallback_pages)
+    lines = compare_conversions(make_converter)
+    print(
+        "   - converted paragraphs: ",
+        "identical" if not lines else str(len(lines)) + " lines of differences",
+    )
+    for line in lines:
+        print("   " + line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--fixtures-directory",
+        default=os.path.join("junk", "fixtures"),
+        help="Where the fixture pdf book gets generated.",
+    )
+    arguments = parser.parse_args()
+
+    book = FixtureBook(os.path.join(arguments.fixtures_directory, "fixture.pdf"))
+    run_case(
+        "fixture",
+        book.pdf_filename,
+        lambda extraction_mode: Converter(
+            pdf_filename=book.pdf_filename,
+            total_page_number=book.total_page_number,
+            pages_info=book.pages_info,
+            segmenter=RegexSegmenter(),
+            extraction_mode=extraction_mode,
+        ),
+        arguments.repeat,
+    )
+    if os.path.exists(PDF_FILENAME):
+        run_case(
+            "gold_dust",
+            PDF_FILENAME,
+            lambda extraction_mode: Converter(
+                segmenter=RegexSegmenter(), extraction_mode=extraction_mode
+            ),
+            arguments.repeat,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Compares the throughput of the sentence segmenters (refer to
+Segmentation.py) on the paragraphs of the converted book, together with their
+agreement with the reference segmenter (nltk's Punkt).
+"""
+import argparse
+import time
+from Converter import Converter
+from Segmentation import SEGMENTERS, PunktSegmenter, RegexSegmenter
+
+
+def segment_all(segmenter, paragraphs, repeat):
+    # Warm up (for Punkt this loads nltk and its tokenizer data)
+    segmenter.span_tokenize("Warm up. Done.")
+    start = time.perf_counter()
+    for _ in range(repeat):
+        spans = [segmenter.span_tokenize(paragraph) for paragraph in paragraphs]
+    return spans, (time.perf_counter() - start) / repeat
+
+
+def sentence_boundaries(spans):
+    # The end of the last sentence is the end of the paragraph: not a boundary
+    return {end for _, end in spans[:-1]}
+
+
+def print_agreement(reference_spans, candidate_spans):
+    identical = 0
+    common = 0
+    reference_count = 0
+    candidate_count = 0
+    for reference, candidate in zip(reference_spans, candidate_spans):
+        if reference == candidate:
+            identical += 1
+        reference_boundaries = sentence_boundaries(reference)
+        candidate_boundaries = sentence_boundaries(candidate)
+        common += len(reference_boundaries & candidate_boundaries)
+        reference_count += len(reference_boundaries)
+        candidate_count += len(candidate_boundaries)
+    print(
+        "   identical paragraphs: ",
+        round(100 * identical / max(1, len(reference_spans)), 2),
+        "%, boundary precision: ",
+        round(100 * common / max(1, candidate_count), 2),
+        "%, boundary recall: ",
+        round(100 * common / max(1, reference_count), 2),
+        "%",
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    arguments = parser.parse_args()
+
+    # The conversion itself uses the fast segmenter: we only need paragraphs
+    converter = Converter(segmenter=RegexSegmenter())
+    paragraphs = [
+        paragraph.text
+        for chapter in converter.build_chapters()
+        for paragraph in chapter.paragraphs
+    ]
+    characters = sum(len(paragraph) for paragraph in paragraphs)
+    print("Segmenting ", len(paragraphs), " paragraphs (", characters, " chars).")
+
+    reference_spans = None
+    for name, segmenter_class in SEGMENTERS.items():
+        spans, elapsed = segment_all(segmenter_class(), paragraphs, arguments.repeat)
+        print(
+            name,
+            ": ",
+            round(elapsed * 1000, 2),
+            " ms, ",
+            round(len(paragraphs) / elapsed),
+            " paragraphs/s, ",
+            round(characters / elapsed / 1e6, 2),
+            " MB/s, ",
+            sum(len(paragraph_spans) for paragraph_spans in spans),
+            " sentences",
+        )
+        if name == PunktSegmenter.name:
+            reference_spans = spans
+        else:
+            print_agreement(reference_spans, spans)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Measures the cost of handing the extracted page texts off from worker
+processes to the parent, by pickling through a queue versus through shared
+memory (refer to SharedTexts.py), for a large number of pages. The texts are
+the layout mode texts of a generated fixture book, repeated (and optionally
+enlarged, the pages of real books holding more text and layout whitespaces).
+The hand-off cost per page is compared with the extraction time per page.
+"""
+import os
+import time
+import pickle
+import argparse
+import multiprocessing
+from pypdf import PdfReader
+from Extraction import extract_page_text
+from Fixtures import FixtureBook
+from SharedTexts import SharedTextStore, SharedTextWriter, start_tracking
+
+
+def _send_texts(texts, page_numbers, results, start, shared_memory):
+    writer = SharedTextWriter() if shared_memory else None
+    start.wait()
+    for page_number in page_numbers:
+        text = texts[page_number % len(texts)]
+        if writer is not None:
+            text = writer.write(text)
+        results.put((page_number, text))
+    results.put(None)
+    if writer is not None:
+        writer.close()
+
+
+def hand_off(texts, page_count, workers, shared_memory):
+    """Return the hand-off duration (texts decoded included) and the size
+    of the pickled messages"""
+    if shared_memory:
+        start_tracking()
+    context = multiprocessing.get_context()
+    results = context.Queue()
+    start = context.Event()
+    processes = [
+        context.Process(
+            target=_send_texts,
+            args=(
+                texts,
+                range(worker, page_count, workers),
+                results,
+                start,
+                shared_memory,
+            ),
+        )
+        for worker in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    store = SharedTextStore()
+    message_bytes = 0
+    received = {}
+    begin = time.perf_counter()
+    start.set()
+    finished_workers = 0
+    while finished_workers < workers:
+        message = results.get()
+        if message is None:
+            finished_workers += 1
+            continue
+        message_bytes += len(pickle.dumps(message))
+        page_number, text = message
+        if shared_memory:
+            store.add(page_number, text)
+        else:
+            received[page_number] = text
+    if shared_memory:
+        for page_number in range(page_count):
+            received[page_number] = store.text(page_number)
+        store.close()
+    duration = time.perf_counter() - begin
+    for process in processes:
+        process.join()
+    assert len(received) == page_count
+    return duration, message_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page-count", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--text-scale",
+        type=int,
+        default=1,
+        help="Enlarge each page text that many times.",
+    )
+    parser.add_argument(
+        "--fixtures-directory",
+        default=os.path.join("junk", "fixtures"),
+        help="Where the fixture pdf book gets generated.",
+    )
+    arguments = parser.parse_args()
+
+    book = FixtureBook(os.path.join(arguments.fixtures_directory, "fixture.pdf"))
+    reader = PdfReader(book.pdf_filename)
+    start = time.perf_counter()
+    texts = [extract_page_text(page)[0] for page in reader.pages]
+    extraction_time = (time.perf_counter() - start) / len(texts)
+    texts = ["\n".join([text] * arguments.text_scale) for text in texts]
+    print(
+        "Extraction: ",
+        round(extraction_time * 1e6, 1),
+        " µs per page, ",
+        round(sum(len(text.encode("utf-8")) for text in texts) / len(texts)),
+        " bytes of text per page",
+    )
+    for shared_memory in (False, True):
+        duration, message_bytes = hand_off(
+            texts, arguments.page_count, arguments.workers, shared_memory
+        )
+        per_page = duration / arguments.page_count
+        print(
+            "shared memory" if shared_memory else "pickling",
+            ": ",
+            arguments.page_count,
+            " pages handed off in ",
+            round(duration * 1000, 1),
+            " ms, ",
+            round(per_page * 1e6, 1),
+            " µs per page (",
+            round(per_page / extraction_time * 100, 2),
+            " % of the extraction), ",
+            round(message_bytes / 1e6, 2),
+            " MB of messages",
+        )
+
+
+if __name__ == "__main__":
+    main()
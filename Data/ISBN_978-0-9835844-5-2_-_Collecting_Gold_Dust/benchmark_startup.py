@@ -0,0 +1,88 @@
+"""
+Measures, in fresh python processes, the time it takes to import Converter.py
+and to construct a Converter, and checks them against their budgets. The heavy
+dependencies (pypdf, nltk, roman) must not be imported by then: they only get
+imported once pages get extracted (or sentences segmented). Exits with a non
+zero status when over budget.
+"""
+import sys
+import json
+import argparse
+import subprocess
+
+HEAVY_MODULES = ("pypdf", "nltk", "roman", "numpy", "multiprocessing")
+
+# Run within a fresh process (the parent process already imported everything)
+MEASURE = """
+import sys, json, time
+start = time.perf_counter()
+import Converter
+imported = time.perf_counter()
+Converter.Converter()
+constructed = time.perf_counter()
+print(json.dumps({
+    "import": imported - start,
+    "construction": constructed - imported,
+    "heavy_modules": [module for module in %r if module in sys.modules],
+}))
+"""
+
+
+def measure_once():
+    output = subprocess.run(
+        [sys.executable, "-c", MEASURE % (HEAVY_MODULES,)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--import-budget",
+        type=float,
+        default=0.05,
+        help="Budget (in seconds) of the Converter.py import.",
+    )
+    parser.add_argument(
+        "--construction-budget",
+        type=float,
+        default=0.005,
+        help="Budget (in seconds) of the Converter construction.",
+    )
+    arguments = parser.parse_args()
+
+    measures = [measure_once() for _ in range(arguments.repeat)]
+    # The best of the runs: the others mostly measure the machine noise
+    import_time = min(measure["import"] for measure in measures)
+    construction_time = min(measure["construction"] for measure in measures)
+    heavy_modules = sorted(
+        {module for measure in measures for module in measure["heavy_modules"]}
+    )
+    print(
+        "Import: ",
+        round(import_time * 1000, 2),
+        " ms (budget ",
+        round(arguments.import_budget * 1000, 2),
+        " ms), construction: ",
+        round(construction_time * 1000, 3),
+        " ms (budget ",
+        round(arguments.construction_budget * 1000, 3),
+        " ms)",
+    )
+    passed = (
+        import_time <= arguments.import_budget
+        and construction_time <= arguments.construction_budget
+    )
+    if heavy_modules:
+        print("Heavy modules imported at startup: ", heavy_modules)
+        passed = False
+    print("Within budget." if passed else "Over budget.")
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Converts the generated fixture books (and the original book when present
+locally) and compares the resulting paragraphs with golden snapshots, and the
+conversion costs (wall time, peak memory and per stage timings) with recorded
+budgets. Exits with a non zero status when any case fails.
+"""
+import os
+import sys
+import argparse
+from Converter import Converter, PDF_FILENAME
+from Fixtures import FixtureBook
+from Regression import RegressionCase, RegressionHarness
+from Segmentation import RegexSegmenter
+
+DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "regression")
+
+
+def without_hand_annotations(pages_info):
+    # The structural information left when continuations are detected
+    return {
+        page_number: {
+            key: value
+            for key, value in info.items()
+            if key not in ("first_paragraph_delimiter", "paragraph_fits_on_page")
+        }
+        for page_number, info in pages_info.items()
+    }
+
+
+def regression_cases(fixtures_directory):
+    book = FixtureBook(os.path.join(fixtures_directory, "fixture.pdf"))
+    cases = [
+        RegressionCase(
+            "fixture",
+            lambda: Converter(
+                pdf_filename=book.pdf_filename,
+                total_page_number=book.total_page_number,
+                pages_info=book.pages_info,
+                segmenter=RegexSegmenter(),
+            ),
+        ),
+        RegressionCase(
+            "fixture_inferred",
+            lambda: Converter(
+                pdf_filename=book.pdf_filename,
+                total_page_number=book.total_page_number,
+                pages_info=without_hand_annotations(book.pages_info),
+                segmenter=RegexSegmenter(),
+                fail_soft=True,
+                infer_headers=True,
+                detect_continuations=True,
+            ),
+        ),
+        # The extraction the WatchdogExtractor falls back to on timeouts:
+        # paragraph breaking relies on the indentation restored out of the
+        # plain mode text positions (the paragraphs must match "fixture")
+        RegressionCase(
+            "fixture_plain_fallback",
+            lambda: Converter(
+                pdf_filename=book.pdf_filename,
+                total_page_number=book.total_page_number,
+                pages_info=book.pages_info,
+                segmenter=RegexSegmenter(),
+                extraction_mode="plain",
+            ),
+        ),
+    ]
+    if os.path.exists(PDF_FILENAME):
+        cases.append(RegressionCase("gold_dust", Converter))
+    return cases
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--case",
+        action="append",
+        default=None,
+        help="Only run that case (can be repeated).",
+    )
+    parser.add_argument(
+        "--update-golden",
+        action="store_true",
+        help="Overwrite the golden snapshots with the current results.",
+    )
+    parser.add_argument(
+        "--record-budgets",
+        action="store_true",
+        help="Record the current costs (times the headroom) as budgets.",
+    )
+    parser.add_argument("--headroom", type=float, default=2.0)
+    parser.add_argument(
+        "--fixtures-directory",
+        default=os.path.join("junk", "fixtures"),
+        help="Where the fixture pdf books get generated.",
+    )
+    arguments = parser.parse_args()
+
+    cases = regression_cases(arguments.fixtures_directory)
+    if arguments.case is not None:
+        cases = [case for case in cases if case.name in arguments.case]
+    harness = RegressionHarness(
+        os.path.join(DIRECTORY, "golden"), os.path.join(DIRECTORY, "budgets.json")
+    )
+    passed = harness.run(
+        cases,
+        update_golden=arguments.update_golden,
+        record_budgets=arguments.record_budgets,
+        headroom=arguments.headroom,
+    )
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
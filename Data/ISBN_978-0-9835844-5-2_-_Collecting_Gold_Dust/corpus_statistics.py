@@ -0,0 +1,81 @@
+"""
+Computes, in a single pass, the statistics (refer to Statistics.py) of a
+library of books converted with python main.py --format jsonl: the books are
+counted by parallel worker processes and their statistics merged. Reports the
+most frequent terms, Pali terms and bigrams and saves the statistics to a
+compressed numpy file.
+"""
+import os
+import gzip
+import time
+import argparse
+from multiprocessing import Pool
+from Diffing import book_name, read_json_lines_document
+from Statistics import PALI_TERMS, CorpusStatistics, read_pali_terms
+
+
+def book_statistics(filename):
+    opener = gzip.open if filename.endswith(".gz") else open
+    with opener(filename, "rt", encoding="utf-8") as lines:
+        document = read_json_lines_document(lines)
+    statistics = CorpusStatistics()
+    statistics.add_document(book_name(filename), document.chapters)
+    return statistics
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "filenames", nargs="+", help="Converted books (JSON lines, maybe .gz)"
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument(
+        "--output",
+        default=None,
+        metavar="FILENAME",
+        help="Where to save the statistics (.npz).",
+    )
+    parser.add_argument(
+        "--pali-terms",
+        default=None,
+        metavar="FILENAME",
+        help="A list of Pali terms (one per line) written without diacritics, "
+        "in addition to the built-in ones.",
+    )
+    arguments = parser.parse_args()
+    pali_terms = PALI_TERMS
+    if arguments.pali_terms is not None:
+        pali_terms = pali_terms | read_pali_terms(arguments.pali_terms)
+
+    start = time.perf_counter()
+    statistics = CorpusStatistics()
+    with Pool(min(arguments.workers, len(arguments.filenames))) as pool:
+        # Merged as they come: a single book statistics is held at a time
+        for partial in pool.imap_unordered(book_statistics, arguments.filenames):
+            statistics.merge(partial)
+    print(
+        "Counted ",
+        statistics.token_count(),
+        " tokens (",
+        len(statistics.terms),
+        " terms, ",
+        len(statistics.bigram_keys),
+        " bigrams) of ",
+        len(statistics.chapters),
+        " chapters in ",
+        round(time.perf_counter() - start, 3),
+        " seconds.",
+    )
+    print("Terms: ", statistics.top_terms(arguments.top))
+    print(
+        "Pali terms: ",
+        statistics.top_terms(arguments.top, pali_only=True, pali_terms=pali_terms),
+    )
+    print("Bigrams: ", statistics.top_bigrams(arguments.top))
+    if arguments.output is not None:
+        statistics.save(arguments.output)
+
+
+if __name__ == "__main__":
+    main()
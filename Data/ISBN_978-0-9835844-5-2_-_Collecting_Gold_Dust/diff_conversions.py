@@ -0,0 +1,54 @@
+"""
+Compares two conversions of a book (written with python main.py --format
+jsonl) and writes the change feed (refer to Diffing.py): one JSON line per
+added, removed, modified or moved paragraph, for the downstream consumers to
+only reindex these.
+"""
+import sys
+import gzip
+import time
+import argparse
+from Diffing import diff_documents, read_json_lines_document, write_change_feed
+from Writers import open_output
+
+
+def read_document(filename):
+    opener = gzip.open if filename.endswith(".gz") else open
+    with opener(filename, "rt", encoding="utf-8") as lines:
+        return read_json_lines_document(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("old", help="The previous conversion (JSON lines, maybe .gz)")
+    parser.add_argument("new", help="The current conversion (JSON lines, maybe .gz)")
+    parser.add_argument(
+        "--output",
+        default=None,
+        metavar="FILENAME",
+        help="Where to write the change feed (defaults to the standard output).",
+    )
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--modification-threshold", type=float, default=0.5)
+    arguments = parser.parse_args()
+
+    start = time.perf_counter()
+    old_document = read_document(arguments.old)
+    new_document = read_document(arguments.new)
+    changes = diff_documents(
+        old_document, new_document, arguments.modification_threshold
+    )
+    with open_output(arguments.output) as stream:
+        counts = write_change_feed(changes, stream, arguments.batch_size)
+    print(
+        "Changes: ",
+        dict(counts),
+        " in ",
+        round(time.perf_counter() - start, 3),
+        " seconds.",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Exports the structure of a library of books converted with python main.py
+--format jsonl as a Cytoscape.js compatible graph (refer to Graph.py). The
+books are read, and their elements written, one chapter at a time. Reports
+the number of nodes and edges, the duration and the peak memory (as traced
+by tracemalloc when --trace-memory is set) on the standard error, the graph
+being written onto the standard output unless --output is provided.
+"""
+import sys
+import gzip
+import time
+import argparse
+import tracemalloc
+from Diffing import book_name, read_json_lines_chapters
+from Graph import LEVELS_OF_DETAIL, GraphExporter
+from Writers import open_output
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "filenames", nargs="+", help="Converted books (JSON lines, maybe .gz)"
+    )
+    parser.add_argument(
+        "--level-of-detail", choices=LEVELS_OF_DETAIL, default="sentence"
+    )
+    parser.add_argument(
+        "--json-lines",
+        action="store_true",
+        help="Write the elements in batches (a JSON array per line) for the "
+        "browser to add them incrementally.",
+    )
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument(
+        "--output",
+        default=None,
+        metavar="FILENAME",
+        help="Where to write the graph (defaults to the standard output).",
+    )
+    parser.add_argument("--gzip", action="store_true")
+    parser.add_argument("--trace-memory", action="store_true")
+    arguments = parser.parse_args()
+
+    if arguments.trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    output = open_output(arguments.output, arguments.gzip)
+    try:
+        exporter = GraphExporter(
+            output,
+            arguments.level_of_detail,
+            json_lines=arguments.json_lines,
+            batch_size=arguments.batch_size,
+        )
+        for filename in arguments.filenames:
+            opener = gzip.open if filename.endswith(".gz") else open
+            with opener(filename, "rt", encoding="utf-8") as lines:
+                exporter.add_book(book_name(filename), read_json_lines_chapters(lines))
+        exporter.close()
+    finally:
+        output.close()
+    print(
+        "Exported ",
+        exporter.node_count,
+        " nodes and ",
+        exporter.edge_count,
+        " edges of ",
+        len(arguments.filenames),
+        " books in ",
+        round(time.perf_counter() - start, 3),
+        " seconds.",
+        file=sys.stderr,
+    )
+    if arguments.trace_memory:
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print("Peak memory: ", round(peak_memory / 1e6, 2), " MB", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
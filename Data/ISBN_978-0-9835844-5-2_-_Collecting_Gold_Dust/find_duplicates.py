@@ -0,0 +1,56 @@
+"""
+Reports the clusters of near duplicate paragraphs (refer to Deduplication.py)
+across books converted with python main.py --format jsonl.
+"""
+import gzip
+import json
+import time
+import argparse
+from Deduplication import NearDuplicateDetector
+from Diffing import book_name
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "filenames", nargs="+", help="Converted books (JSON lines, maybe .gz)"
+    )
+    parser.add_argument("--threshold", type=float, default=0.8)
+    parser.add_argument("--bands", type=int, default=32)
+    parser.add_argument("--rows-per-band", type=int, default=4)
+    arguments = parser.parse_args()
+
+    detector = NearDuplicateDetector(
+        arguments.bands, arguments.rows_per_band, arguments.threshold
+    )
+    start = time.perf_counter()
+    for filename in arguments.filenames:
+        book = book_name(filename)
+        opener = gzip.open if filename.endswith(".gz") else open
+        with opener(filename, "rt", encoding="utf-8") as lines:
+            for line in lines:
+                if not line.strip():
+                    continue
+                paragraph = json.loads(line)
+                detector.add_paragraph(
+                    book, paragraph["chapter"], paragraph["reference"], paragraph["text"]
+                )
+    clusters = detector.clusters()
+    print(
+        "Found ",
+        len(clusters),
+        " clusters of near duplicates among ",
+        len(detector.references),
+        " paragraphs in ",
+        round(time.perf_counter() - start, 3),
+        " seconds.",
+    )
+    for cluster in clusters:
+        print("##########################################################")
+        print(repr(cluster[0].text[:120]))
+        for reference in cluster:
+            print("   - ", reference.book, ": ", reference.reference)
+
+
+if __name__ == "__main__":
+    main()
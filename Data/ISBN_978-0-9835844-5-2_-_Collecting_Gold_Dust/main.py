@@ -1,35 +1,261 @@
+import argparse
 from Model import Document
 from Converter import Converter
+from Watch import StructureWatcher
+from Segmentation import SEGMENTERS, SegmentationCache, CachedSegmenter
+from Writers import WRITERS, open_output
+from Profiling import StageProfiler
 
-converter = Converter()
-document = Document()
-for chapter in converter.build_chapters():
-    document.add_chapter(chapter)
-
-for chapter in document.chapters:
-    print("###################################################################")
-    print("################## Chapter name: ", chapter.name)
-    print("###################################################################")
-    for page in chapter.pages:
-        print("##########################################################")
-        print(repr(page))
-        print("##########################################################")
-
-
-print("##########################################################")
-print("##########################################################")
-print("#################### OTHER ###############################")
-print("##########################################################")
-print("##########################################################")
-for chapter in document.chapters:
-    print("###################################################################")
-    print("################## Chapter name: ", chapter.name)
-    print("###################################################################")
-    for paragraph in chapter.paragraphs:
-        print(
-            "Paragraph (ref:",
-            paragraph.page_layout.reference_text,
-            "):\n",
-            paragraph.text,
-            "\n",
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Extract the semantic structure of Collecting Gold Dust."
+    )
+    parser.add_argument(
+        "--extraction-timeout",
+        type=float,
+        default=None,
+        help="Per page extraction time budget (in seconds). When provided, "
+        "pages are extracted by isolated worker processes.",
+    )
+    parser.add_argument(
+        "--extraction-workers",
+        type=int,
+        default=None,
+        help="Number of extraction worker processes (defaults to the number "
+        "of cpus). Only used together with --extraction-timeout.",
+    )
+    parser.add_argument(
+        "--extraction-threads",
+        type=int,
+        default=None,
+        help="Extract the pages ahead of time with that many threads, each "
+        "using its own pdf reader (ignored with --extraction-timeout). Only "
+        "faster than the serial extraction on free-threaded python builds.",
+    )
+    parser.add_argument(
+        "--shared-memory-extraction",
+        action="store_true",
+        help="Have the extraction worker processes hand the page texts off "
+        "through shared memory. Only used together with --extraction-timeout.",
+    )
+    parser.add_argument(
+        "--track-provenance",
+        action="store_true",
+        help="Map the paragraphs and sentences back to the character ranges of "
+        "the original page texts (written by the jsonl format).",
+    )
+    parser.add_argument(
+        "--skip-headless-illustrations",
+        action="store_true",
+        help="Do not extract the text of the illustration pages that have no "
+        "header (their text is not needed for paragraph continuation).",
+    )
+    parser.add_argument(
+        "--header-band-height",
+        type=float,
+        default=None,
+        help="Remove page headers by geometry: drop the text rendered within "
+        "that height (in pdf units) from the top of each page while extracting "
+        "it, instead of matching the expected header strings.",
+    )
+    parser.add_argument(
+        "--extraction-mode",
+        choices=("layout", "indented"),
+        default="layout",
+        help="How pages get extracted: pypdf's layout mode, or its (faster) "
+        "plain mode with the indentation restored out of the text positions "
+        "(falling back to layout mode on the pages where this is unreliable).",
+    )
+    parser.add_argument(
+        "--segmenter",
+        choices=sorted(SEGMENTERS),
+        default="punkt",
+        help="The engine breaking paragraphs into sentences: nltk's Punkt or "
+        "a (faster) rule based regular expression.",
+    )
+    parser.add_argument(
+        "--segmentation-cache",
+        default=None,
+        metavar="FILENAME",
+        help="File caching the sentence segmentations across runs (only the "
+        "paragraphs that changed since a previous run get segmented).",
+    )
+    parser.add_argument(
+        "--format",
+        choices=sorted(WRITERS),
+        default="debug",
+        help="Output format: the (historical) debug dump of the pages and "
+        "paragraphs, one JSON object per paragraph, Markdown or plain text.",
+    )
+    parser.add_argument(
+        "--output",
+        default=None,
+        metavar="FILENAME",
+        help="Write the converted book to that file instead of the standard "
+        "output.",
+    )
+    parser.add_argument(
+        "--gzip",
+        action="store_true",
+        help="Compress the output with gzip.",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and reconvert the book (printing the paragraphs "
+        "that changed) each time Structure.py is saved.",
+    )
+    parser.add_argument(
+        "--infer-headers",
+        action="store_true",
+        help="Infer the page headers from the first lines recurring across "
+        "pages (instead of the hand written header rules) and print a "
+        "confidence report compared with these rules.",
+    )
+    parser.add_argument(
+        "--detect-continuations",
+        action="store_true",
+        help="Detect the paragraphs continued on the next page (and where "
+        "they finish) from the extracted text, the hand annotations of "
+        "Structure.py only acting as overrides, and print an accuracy report "
+        "compared with these annotations.",
+    )
+    parser.add_argument(
+        "--fail-soft",
+        action="store_true",
+        help="Do not exit on the first structural problem (header mismatch, "
+        "missing delimiter...): record it, fall back and carry on, then report "
+        "all the problems at once.",
+    )
+    parser.add_argument(
+        "--diagnostics",
+        default=None,
+        metavar="FILENAME",
+        help="Write the problems encountered along the conversion (page, "
+        "expected and found text...) to that JSON file.",
+    )
+    parser.add_argument(
+        "--statistics",
+        default=None,
+        metavar="FILENAME",
+        help="Save the term, bigram and per chapter counts of the paragraphs "
+        "to that compressed numpy (.npz) file.",
+    )
+    parser.add_argument(
+        "--graph",
+        default=None,
+        metavar="FILENAME",
+        help="Export the structure of the book (chapters, paragraphs, "
+        "sentences and pages) to that Cytoscape.js compatible JSON file.",
+    )
+    parser.add_argument(
+        "--graph-level-of-detail",
+        choices=["sentence", "paragraph", "chapter"],
+        default="sentence",
+        help="Leave the sentences out (paragraph), or collapse the paragraphs "
+        "into their chapter (chapter), within the exported graph.",
+    )
+    parser.add_argument(
+        "--profile",
+        default=None,
+        metavar="DIRECTORY",
+        help="Profile the converter construction and the chapters building "
+        "separately: write their .pstats and (flamegraph) .collapsed files to "
+        "that directory and print their hottest functions.",
+    )
+    return parser.parse_args()
+
+
+def save_segmentation_cache(segmentation_cache):
+    if segmentation_cache is None:
+        return
+    segmentation_cache.save()
+    segmentation_cache.print_statistics()
+
+
+def run_stage(profiler, stage, function):
+    if profiler is None:
+        return function()
+    return profiler.run(stage, function)
+
+
+def main():
+    arguments = parse_arguments()
+    segmenter = SEGMENTERS[arguments.segmenter]()
+    segmentation_cache = None
+    if arguments.segmentation_cache is not None:
+        segmentation_cache = SegmentationCache(arguments.segmentation_cache)
+        segmenter = CachedSegmenter(segmenter, segmentation_cache)
+    profiler = None
+    if arguments.profile is not None:
+        profiler = StageProfiler(arguments.profile)
+    converter = run_stage(
+        profiler,
+        "init",
+        lambda: Converter(
+            extraction_timeout=arguments.extraction_timeout,
+            extraction_workers=arguments.extraction_workers,
+            extraction_threads=arguments.extraction_threads,
+            shared_memory_extraction=arguments.shared_memory_extraction,
+            track_provenance=arguments.track_provenance,
+            skip_headless_illustrations=arguments.skip_headless_illustrations,
+            header_band_height=arguments.header_band_height,
+            extraction_mode=arguments.extraction_mode,
+            segmenter=segmenter,
+            fail_soft=arguments.fail_soft,
+            infer_headers=arguments.infer_headers,
+            detect_continuations=arguments.detect_continuations,
+        ),
+    )
+    if arguments.watch:
+        StructureWatcher(converter).run()
+        save_segmentation_cache(segmentation_cache)
+        return
+    document = Document()
+    chapters = run_stage(
+        profiler, "build_chapters", lambda: list(converter.build_chapters())
+    )
+    for chapter in chapters:
+        document.add_chapter(chapter)
+    save_segmentation_cache(segmentation_cache)
+    if converter.inferred_headers is not None:
+        converter.header_inferrer.print_report(
+            converter.inferred_headers,
+            converter.hand_written_page_headers(converter.inferred_headers),
         )
+    if converter.continuation_report is not None:
+        converter.continuation_report.print_report()
+    if arguments.fail_soft:
+        converter.diagnostics.print_report()
+    if arguments.diagnostics is not None:
+        converter.diagnostics.write_json(arguments.diagnostics)
+    if arguments.statistics is not None:
+        # Note: numpy only gets imported when needed
+        from Statistics import CorpusStatistics
+
+        statistics = CorpusStatistics()
+        statistics.add_document("gold_dust", chapters)
+        statistics.save(arguments.statistics)
+    if arguments.graph is not None:
+        from Graph import GraphExporter
+
+        graph_output = open_output(arguments.graph)
+        try:
+            exporter = GraphExporter(graph_output, arguments.graph_level_of_detail)
+            exporter.add_book("gold_dust", chapters)
+            exporter.close()
+        finally:
+            graph_output.close()
+
+    output = open_output(arguments.output, arguments.gzip)
+    try:
+        WRITERS[arguments.format](output).write_document(document)
+    finally:
+        output.close()
+
+
+# The extraction worker processes (refer to Extraction.py) re-import this
+# module on platforms that spawn (rather than fork) them: guard the run.
+if __name__ == "__main__":
+    main()
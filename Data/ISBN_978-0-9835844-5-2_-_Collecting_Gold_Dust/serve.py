@@ -0,0 +1,34 @@
+"""
+Serves (read-only, on localhost) the paragraphs of books converted with
+python main.py --format jsonl (refer to Service.py for the endpoints).
+"""
+import argparse
+from Service import LookupService
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "filenames", nargs="+", help="Converted books (JSON lines, maybe .gz)"
+    )
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--cached-chapters",
+        type=int,
+        default=256,
+        help="Number of decoded chapters kept in memory.",
+    )
+    arguments = parser.parse_args()
+    service = LookupService(arguments.filenames, arguments.cached_chapters)
+    server = service.make_server(port=arguments.port)
+    print("Serving ", sorted(service.books), " on http://127.0.0.1:", arguments.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Stopped serving.")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()